@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Hedged chat-completion requests across several OpenAI-compatible providers.
+
+A request goes to the first provider whose circuit breaker is closed. If it has
+not answered after HEDGE_AFTER_S seconds (or fails sooner), the same request is
+sent to the next provider. The first successful answer wins and every other
+in-flight attempt is cancelled by shutting down its socket, so a slow provider
+never holds a worker.
+
+Each provider has a circuit breaker. After BREAKER_FAILURES consecutive
+failures it opens and the provider is skipped for BREAKER_COOLDOWN_S seconds.
+After that one trial request is let through (half-open). A success closes the
+breaker again and a failure re-opens it. Cancelled attempts count as neither.
+
+stream() applies the same hedging and failover up to the first token, then
+stays on the provider that answered first.
+
+Providers come from the environment (OPENAI_API_KEY / DEEPSEEK_API_KEY, with
+OPENAI_BASE_URL / DEEPSEEK_BASE_URL to point them elsewhere), in that order.
+
+Usage:
+  python scripts/ai_router.py ask "Say hi as JSON"
+  python scripts/ai_router.py stub --port 9101 --delay 3
+  python scripts/ai_router.py stub --port 9102 --delay 0.2 --fail-rate 0.5
+  OPENAI_API_KEY=x OPENAI_BASE_URL=http://127.0.0.1:9101/v1 \\
+  DEEPSEEK_API_KEY=x DEEPSEEK_BASE_URL=http://127.0.0.1:9102/v1 \\
+  python scripts/ai_router.py ask "ping" --repeat 10 --hedge-after 0.5 --stream
+"""
+
+import argparse
+import http.client
+import json
+import os
+import queue
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+HEDGE_AFTER_S = float(os.getenv("AI_HEDGE_AFTER_S", "8"))
+REQUEST_TIMEOUT_S = float(os.getenv("AI_REQUEST_TIMEOUT_S", "120"))
+BREAKER_FAILURES = 3
+BREAKER_COOLDOWN_S = 30.0
+
+
+class ProviderError(Exception):
+    """A provider answered with an error, an unusable body, or not at all."""
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown_s: float = BREAKER_COOLDOWN_S):
+        self.max_failures = failures
+        self.cooldown_s = cooldown_s
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at < self.cooldown_s:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self) -> bool:
+        """Whether a request may go out now. Claims the single half-open trial slot."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            self.trial_running = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.max_failures:
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """An attempt was cancelled: free the trial slot without judging the provider."""
+        with self._lock:
+            self.trial_running = False
+
+
+class Provider:
+    """One OpenAI-compatible /chat/completions endpoint."""
+
+    def __init__(self, name: str, base_url: str, api_key: str, model: str,
+                 timeout_s: float = REQUEST_TIMEOUT_S):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.timeout_s = timeout_s
+        self.breaker = CircuitBreaker()
+
+    def __repr__(self) -> str:
+        return f"Provider({self.name!r}, {self.base_url!r}, {self.model!r})"
+
+
+class Attempt:
+    """A single in-flight request to a provider; cancel() aborts it from another thread."""
+
+    def __init__(self, provider: Provider, payload: Dict[str, Any]):
+        self.provider = provider
+        self.payload = payload
+        self.cancelled = False
+        self.started_at = time.perf_counter()
+        self._conn: Optional[http.client.HTTPConnection] = None
+        # Kept apart from conn.sock, which http.client clears once a close-delimited response starts.
+        self.sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+
+    def _error(self, e: Exception) -> ProviderError:
+        return ProviderError("cancelled" if self.cancelled else f"{type(e).__name__}: {e}")
+
+    def _send(self) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """POST the payload and return the open connection and response (status checked)."""
+        url = urlsplit(f"{self.provider.base_url}/chat/completions")
+        conn_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        # The timeout bounds the connect and every socket read, including each wait between streamed chunks.
+        conn = conn_class(url.netloc, timeout=self.provider.timeout_s)
+        with self._lock:
+            if self.cancelled:
+                raise ProviderError("cancelled")
+            self._conn = conn
+        try:
+            body = json.dumps(self.payload).encode("utf-8")
+            conn.request("POST", url.path, body=body, headers={
+                "Authorization": f"Bearer {self.provider.api_key}",
+                "Content-Type": "application/json",
+            })
+            self.sock = conn.sock
+            response = conn.getresponse()
+            if response.status >= 400:
+                raw = response.read()
+                raise ProviderError(f"HTTP {response.status}: {raw[:200].decode('utf-8', 'replace')}")
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise self._error(e) from e
+        except ProviderError:
+            conn.close()
+            raise
+        return conn, response
+
+    def run(self) -> Dict[str, Any]:
+        conn, response = self._send()
+        try:
+            raw = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            raise self._error(e) from e
+        finally:
+            conn.close()
+        try:
+            data = json.loads(raw)
+            text = data["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise ProviderError(f"unexpected response body: {e}") from e
+        return {
+            "text": text,
+            "provider": self.provider.name,
+            "model": data.get("model") or self.payload["model"],
+            "usage": data.get("usage"),
+            "latency_s": time.perf_counter() - self.started_at,
+        }
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            sock = self.sock or (self._conn.sock if self._conn is not None else None)
+        # shutdown() wakes a thread blocked in recv(); close() alone would not.
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class StreamAttempt(Attempt):
+    """A streamed request. run() returns at the first text delta and leaves the response open for the rest."""
+
+    def run(self) -> Dict[str, Any]:
+        self.model = self.payload["model"]
+        self.usage: Optional[Dict[str, Any]] = None
+        self.conn, self.response = self._send()
+        self.deltas = self._read_deltas()
+        try:
+            text = next(self.deltas, None)
+        except ProviderError:
+            self.conn.close()
+            raise
+        if text is None:
+            self.conn.close()
+            raise ProviderError("unexpected response body: stream ended without content")
+        with self._lock:
+            if self.cancelled:
+                # Lost the race after all; nobody will read the rest.
+                self.conn.close()
+                raise ProviderError("cancelled")
+        return {"text": text, "provider": self.provider.name, "model": self.model,
+                "latency_s": time.perf_counter() - self.started_at}
+
+    def _read_deltas(self) -> Iterator[str]:
+        """Content deltas from the server-sent events ("data: {...}" lines, ending with "data: [DONE]")."""
+        while True:
+            try:
+                line = self.response.readline()
+            except (OSError, http.client.HTTPException) as e:
+                raise self._error(e) from e
+            if not line:
+                return
+            line = line.decode("utf-8", "replace").strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                return
+            try:
+                chunk = json.loads(data)
+                self.model = chunk.get("model") or self.model
+                self.usage = chunk.get("usage") or self.usage
+                delta = chunk["choices"][0].get("delta", {}).get("content") if chunk.get("choices") else None
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+                raise ProviderError(f"unexpected response body: {e}") from e
+            if delta:
+                yield delta
+
+
+class Stream:
+    """
+    Text deltas of a streamed completion, from the provider whose first token arrived first.
+    close() drops the connection. After iterating (or close()), .result holds {provider, model,
+    usage, latency_s, attempts, hedged}; usage is None when the provider did not report it.
+    """
+
+    def __init__(self, attempt: StreamAttempt, first: Dict[str, Any], attempts: int, started: float):
+        self.attempt = attempt
+        self.first = first["text"]
+        self.started = started
+        self.result = {key: first[key] for key in ("provider", "model")}
+        self.result.update(usage=None, attempts=attempts, hedged=attempts > 1, latency_s=None)
+
+    def __iter__(self) -> Iterator[str]:
+        yield self.first
+        try:
+            # Not `yield from`: closing this iterator early must leave the deltas readable by close().
+            for text in self.attempt.deltas:
+                yield text
+        except ProviderError:
+            # Failing after the first token still counts against the provider.
+            self.attempt.provider.breaker.record(False)
+            raise
+        finally:
+            self._finish()
+
+    def _finish(self, finished: Optional[float] = None) -> None:
+        if self.result["latency_s"] is None:
+            self.result["latency_s"] = (finished or time.perf_counter()) - self.started
+        self.result.update(model=self.attempt.model, usage=self.attempt.usage)
+
+    def close(self, drain_s: float = 0.0) -> None:
+        """
+        Drop the connection. With drain_s, the rest of the stream is first read (and discarded)
+        for up to that long, so the usage chunk sent after the last token is not lost.
+        """
+        finished = time.perf_counter()
+        sock = self.attempt.sock
+        if drain_s > 0 and self.attempt.usage is None and sock is not None:
+            deadline = time.monotonic() + drain_s
+            try:
+                sock.settimeout(drain_s)
+                for _ in self.attempt.deltas:
+                    if time.monotonic() > deadline:
+                        break
+            except (ProviderError, OSError):
+                pass
+        self.attempt.response.close()
+        self.attempt.conn.close()
+        self._finish(finished)
+
+
+class HedgedRouter:
+    def __init__(self, providers: List[Provider], hedge_after_s: float = HEDGE_AFTER_S):
+        self.providers = providers
+        self.hedge_after_s = hedge_after_s
+
+    def complete(self, messages: List[Dict[str, str]], temperature: float = 0.7,
+                 models: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Run one chat completion. Returns {text, provider, model, usage, latency_s,
+        attempts, hedged}; raises ProviderError when every available provider failed.
+        """
+        started = time.perf_counter()
+        _, result, attempts = self._race(Attempt, messages, temperature, models or {})
+        result.update(attempts=attempts, hedged=attempts > 1, latency_s=time.perf_counter() - started)
+        return result
+
+    def stream(self, messages: List[Dict[str, str]], temperature: float = 0.7,
+               models: Optional[Dict[str, str]] = None) -> Stream:
+        """
+        Start a streamed chat completion. Hedging and failover apply until the first token
+        arrives; after that the stream stays on that provider. Raises ProviderError like complete().
+        """
+        started = time.perf_counter()
+        attempt, first, attempts = self._race(StreamAttempt, messages, temperature, models or {}, stream=True)
+        return Stream(attempt, first, attempts, started)
+
+    def _race(self, attempt_class: type, messages: List[Dict[str, str]], temperature: float,
+              models: Dict[str, str], stream: bool = False) -> Tuple[Attempt, Dict[str, Any], int]:
+        """(winning attempt, its result, attempts started)."""
+        if not self.providers:
+            raise ProviderError("No AI API configured. Set OPENAI_API_KEY or DEEPSEEK_API_KEY environment variable.")
+        pending = list(self.providers)
+        results: "queue.Queue" = queue.Queue()
+        running: List[Attempt] = []
+        errors: List[str] = []
+
+        def launch() -> bool:
+            while pending:
+                provider = pending.pop(0)
+                if not provider.breaker.allow():
+                    errors.append(f"{provider.name}: circuit open")
+                    continue
+                payload = {"model": models.get(provider.name, provider.model), "messages": messages,
+                           "temperature": temperature}
+                if stream:
+                    # Without include_usage a streamed answer carries no token counts.
+                    payload.update(stream=True, stream_options={"include_usage": True})
+                attempt = attempt_class(provider, payload)
+                running.append(attempt)
+
+                def worker(attempt: Attempt = attempt) -> None:
+                    try:
+                        results.put((attempt, attempt.run(), None))
+                    except Exception as e:
+                        results.put((attempt, None, e))
+
+                threading.Thread(target=worker, name=f"ai-{provider.name}", daemon=True).start()
+                return True
+            return False
+
+        if not launch():
+            raise ProviderError("No AI provider available (" + "; ".join(errors) + ")")
+        in_flight = 1
+        while in_flight:
+            try:
+                attempt, result, error = results.get(timeout=self.hedge_after_s if pending else None)
+            except queue.Empty:
+                # Slow answer: hedge to the next provider and keep waiting on both.
+                in_flight += launch()
+                continue
+            in_flight -= 1
+            if error is None:
+                attempt.provider.breaker.record(True)
+                for other in running:
+                    if other is not attempt:
+                        other.cancel()
+                        other.provider.breaker.release()
+                return attempt, result, len(running)
+            attempt.provider.breaker.record(False)
+            errors.append(f"{attempt.provider.name}: {error}")
+            # Fail over at once instead of waiting out the hedge delay.
+            in_flight += launch()
+        raise ProviderError("All AI providers failed (" + "; ".join(errors) + ")")
+
+
+def providers_from_env() -> List[Provider]:
+    providers = []
+    if os.getenv("OPENAI_API_KEY"):
+        providers.append(Provider("openai", os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+                                  os.environ["OPENAI_API_KEY"], os.getenv("OPENAI_MODEL", "gpt-4o-mini")))
+    if os.getenv("DEEPSEEK_API_KEY"):
+        providers.append(Provider("deepseek", os.getenv("DEEPSEEK_BASE_URL", "https://api.deepseek.com/v1"),
+                                  os.environ["DEEPSEEK_API_KEY"], os.getenv("DEEPSEEK_MODEL", "deepseek-chat")))
+    return providers
+
+
+_router: Optional[HedgedRouter] = None
+
+
+def get_router() -> HedgedRouter:
+    """The process-wide router, so breaker state carries across calls."""
+    global _router
+    if _router is None:
+        _router = HedgedRouter(providers_from_env())
+    return _router
+
+
+def serve_stub(port: int, delay_s: float, fail_rate: float) -> None:
+    """OpenAI-compatible stub that answers after `delay_s` and fails a share of requests."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            time.sleep(delay_s)
+            if random.random() < fail_rate:
+                self.send_response(503)
+                self.end_headers()
+                self.wfile.write(b'{"error": "injected failure"}')
+                return
+            prompt = body.get("messages", [{}])[-1].get("content", "")
+            content = json.dumps({"stub": port, "echo": prompt[:40]})
+            if body.get("stream"):
+                self.stream(body, prompt, content)
+                return
+            payload = json.dumps({
+                "model": body.get("model", "stub"),
+                "choices": [{"message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": 8,
+                          "total_tokens": len(prompt.split()) + 8},
+            }).encode("utf-8")
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the router cancelled this attempt
+
+        def stream(self, body: Dict[str, Any], prompt: str, content: str) -> None:
+            """Server-sent events, a few characters per chunk, then usage if stream_options asked for it."""
+            model = body.get("model", "stub")
+            chunks = [{"model": model, "choices": [{"index": 0, "delta": {"content": content[start:start + 8]}}]}
+                      for start in range(0, len(content), 8)]
+            if (body.get("stream_options") or {}).get("include_usage"):
+                chunks.append({"model": model, "choices": [], "usage": {
+                    "prompt_tokens": len(prompt.split()), "completion_tokens": len(chunks),
+                    "total_tokens": len(prompt.split()) + len(chunks)}})
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                for chunk in chunks:
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    time.sleep(0.01)
+                self.wfile.write(b"data: [DONE]\n\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    print(f"🧪 Stub provider on http://127.0.0.1:{port}/v1 (delay {delay_s}s, fail rate {fail_rate:.0%})")
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hedged multi-provider chat completions")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ask = sub.add_parser("ask", help="Send a prompt through the router")
+    ask.add_argument("prompt")
+    ask.add_argument("--repeat", type=int, default=1)
+    ask.add_argument("--hedge-after", type=float, default=HEDGE_AFTER_S, help="Seconds before hedging")
+    ask.add_argument("--stream", action="store_true", help="Stream the completion (hedges until the first token)")
+    stub = sub.add_parser("stub", help="Run a local stub provider")
+    stub.add_argument("--port", type=int, default=9101)
+    stub.add_argument("--delay", type=float, default=0.0)
+    stub.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.command == "stub":
+        serve_stub(args.port, args.delay, args.fail_rate)
+        return
+
+    router = HedgedRouter(providers_from_env(), hedge_after_s=args.hedge_after)
+    for _ in range(args.repeat):
+        messages = [{"role": "user", "content": args.prompt}]
+        try:
+            if args.stream:
+                stream = router.stream(messages)
+                text = "".join(stream)
+                result = {**stream.result, "text": text}
+            else:
+                result = router.complete(messages)
+        except ProviderError as e:
+            print(f"  ✗ {e}")
+            continue
+        hedged = " (hedged)" if result["hedged"] else ""
+        print(f"  ✓ {result['provider']}{hedged} in {result['latency_s']:.2f}s: {result['text'][:80]}")
+    for provider in router.providers:
+        print(f"  🔌 {provider.name}: breaker {provider.breaker.state}, {provider.breaker.failures} consecutive failures")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Per-run telemetry for AI generation calls.
+
+update_data.py records every call here: latency, prompt/completion tokens,
+the provider and model that answered, extra provider attempts (hedges and
+failovers), request failures, parse failures (by reason) and single-tool
+retries after a bad batch entry. At the end of a run the totals are written as a JSON report and,
+optionally, in Prometheus text exposition format (for node_exporter's textfile
+collector or a pushgateway).
+
+Costs are estimates from MODEL_PRICES (USD per million tokens); calls to
+models missing from the table count their tokens as unpriced. Calls whose
+provider reported no usage (e.g. a stream closed before its usage chunk) are
+counted as usage-unknown instead of as zero tokens.
+
+Usage:
+  python scripts/ai_telemetry.py _audit/ai-telemetry/latest.json
+  python scripts/ai_telemetry.py _audit/ai-telemetry/latest.json --prometheus
+"""
+
+import argparse
+import bisect
+import json
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from tool_store import PROJECT_ROOT, write_text_atomic
+
+TELEMETRY_DIR = PROJECT_ROOT / "_audit" / "ai-telemetry"
+
+# Upper bounds in seconds; the last bucket is +Inf.
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0)
+
+# USD per 1M tokens: (prompt, completion)
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "deepseek-chat": (0.27, 1.10),
+}
+
+
+def model_price(model: str) -> Optional[tuple]:
+    """Price for a model, also matching dated variants like gpt-4o-mini-2024-07-18."""
+    for name in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model == name or model.startswith(f"{name}-"):
+            return MODEL_PRICES[name]
+    return None
+
+
+FAILURE_PATTERNS = (
+    ("not_configured", re.compile(r"No AI API configured")),
+    ("circuit_open", re.compile(r"No AI provider available")),
+    ("timeout", re.compile(r"timed out|Timeout", re.I)),
+    ("http_429", re.compile(r"HTTP 429|\b429\b")),
+    ("http_5xx", re.compile(r"HTTP 5\d\d|\b5\d\d Server Error")),
+    ("http_4xx", re.compile(r"HTTP 4\d\d|\b4\d\d Client Error")),
+    ("bad_response", re.compile(r"unexpected response body")),
+    ("connection", re.compile(r"Connection|Errno|Remote|refused", re.I)),
+)
+
+
+def failure_reason(message: str) -> str:
+    """Collapse an error message into a low-cardinality reason label."""
+    for reason, pattern in FAILURE_PATTERNS:
+        if pattern.search(message):
+            return reason
+    return "other"
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None when empty or in +Inf)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {"count": self.count, "sum": round(self.sum, 4), "p50": self.quantile(0.5),
+                "p95": self.quantile(0.95), "buckets": cumulative}
+
+
+class ModelStats:
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.unpriced_tokens = 0
+        self.usage_unknown_calls = 0
+        self.latency = Histogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "promptTokens": self.prompt_tokens,
+            "completionTokens": self.completion_tokens,
+            "estimatedCostUsd": round(self.cost_usd, 6),
+            "unpricedTokens": self.unpriced_tokens,
+            "usageUnknownCalls": self.usage_unknown_calls,
+            "latency": self.latency.to_dict(),
+        }
+
+
+class Telemetry:
+    """Thread-safe counters for one generation run."""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.models: Dict[str, ModelStats] = {}
+        self.providers: Dict[str, int] = {}
+        self.latency = Histogram()
+        self.failures: Dict[str, int] = {}
+        self.parse_failures: Dict[str, int] = {}
+        self.retries: Dict[str, int] = {}
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def record_call(self, result: Dict[str, Any]) -> None:
+        """A successful completion as returned by ai_router (or the streaming path)."""
+        usage = result.get("usage")
+        model = result.get("model") or "unknown"
+        prompt_tokens = int((usage or {}).get("prompt_tokens") or 0)
+        completion_tokens = int((usage or {}).get("completion_tokens") or 0)
+        with self._lock:
+            stats = self.models.setdefault(model, ModelStats())
+            stats.calls += 1
+            if usage is None:
+                stats.usage_unknown_calls += 1
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            price = model_price(model)
+            if price is None:
+                stats.unpriced_tokens += prompt_tokens + completion_tokens
+            else:
+                stats.cost_usd += (prompt_tokens * price[0] + completion_tokens * price[1]) / 1e6
+            stats.latency.observe(result.get("latency_s") or 0.0)
+            self.latency.observe(result.get("latency_s") or 0.0)
+            provider = result.get("provider") or "unknown"
+            self.providers[provider] = self.providers.get(provider, 0) + 1
+            extra_attempts = int(result.get("attempts") or 1) - 1
+            if extra_attempts:
+                self.retries["provider_attempt"] = self.retries.get("provider_attempt", 0) + extra_attempts
+
+    def record_failure(self, reason: str) -> None:
+        with self._lock:
+            self.failures[reason] = self.failures.get(reason, 0) + 1
+
+    def record_parse_failure(self, reason: str) -> None:
+        with self._lock:
+            self.parse_failures[reason] = self.parse_failures.get(reason, 0) + 1
+
+    def record_retry(self, kind: str) -> None:
+        with self._lock:
+            self.retries[kind] = self.retries.get(kind, 0) + 1
+
+    def record_fallback(self) -> None:
+        with self._lock:
+            self.fallbacks += 1
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            models = {model: stats.to_dict() for model, stats in sorted(self.models.items())}
+            return {
+                "startedAt": self.started_at.isoformat(),
+                "finishedAt": datetime.now(timezone.utc).isoformat(),
+                "calls": self.latency.count,
+                "promptTokens": sum(m["promptTokens"] for m in models.values()),
+                "completionTokens": sum(m["completionTokens"] for m in models.values()),
+                "estimatedCostUsd": round(sum(m["estimatedCostUsd"] for m in models.values()), 6),
+                "usageUnknownCalls": sum(m["usageUnknownCalls"] for m in models.values()),
+                "latency": self.latency.to_dict(),
+                "providers": dict(self.providers),
+                "models": models,
+                "failures": dict(self.failures),
+                "parseFailures": dict(self.parse_failures),
+                "retries": dict(self.retries),
+                "fallbackTemplates": self.fallbacks,
+            }
+
+    def write(self, path: Optional[Path] = None, prometheus_path: Optional[Path] = None) -> Path:
+        report = self.report()
+        if path is None:
+            path = TELEMETRY_DIR / f"{self.started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+        write_text_atomic(Path(path), json.dumps(report, indent=2) + "\n")
+        if prometheus_path is not None:
+            write_text_atomic(Path(prometheus_path), to_prometheus(report))
+        return Path(path)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def to_prometheus(report: Dict[str, Any]) -> str:
+    """Prometheus text exposition of a report()."""
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            label_text = ",".join(f'{key}="{_label(str(val))}"' for key, val in labels.items())
+            lines.append(f"{name}{suffix}{{{label_text}}} {value}" if label_text else f"{name}{suffix} {value}")
+
+    models = report["models"]
+    metric("ai_call_latency_seconds", "histogram", "Latency of successful AI calls.", [
+        sample
+        for model, stats in models.items()
+        for sample in (
+            [("_bucket", {"model": model, "le": bound}, count) for bound, count in stats["latency"]["buckets"].items()]
+            + [("_sum", {"model": model}, stats["latency"]["sum"]), ("_count", {"model": model}, stats["latency"]["count"])]
+        )
+    ])
+    metric("ai_tokens_total", "counter", "Tokens used, by model and kind.", [
+        ("", {"model": model, "kind": kind}, stats[f"{kind}Tokens"])
+        for model, stats in models.items() for kind in ("prompt", "completion")
+    ])
+    metric("ai_estimated_cost_usd_total", "counter", "Estimated spend from MODEL_PRICES.", [
+        ("", {"model": model}, stats["estimatedCostUsd"]) for model, stats in models.items()
+    ])
+    metric("ai_usage_unknown_calls_total", "counter", "Successful calls with no reported usage (not in tokens or cost).", [
+        ("", {"model": model}, stats.get("usageUnknownCalls", 0)) for model, stats in models.items()
+    ])
+    metric("ai_provider_calls_total", "counter", "Successful calls, by answering provider.", [
+        ("", {"provider": provider}, count) for provider, count in report["providers"].items()
+    ])
+    metric("ai_failures_total", "counter", "Calls that got no usable answer, by reason.", [
+        ("", {"reason": reason}, count) for reason, count in report["failures"].items()
+    ])
+    metric("ai_parse_failures_total", "counter", "Answers that were not a usable JSON entry, by reason.", [
+        ("", {"reason": reason}, count) for reason, count in report["parseFailures"].items()
+    ])
+    metric("ai_retries_total", "counter", "Extra requests, by kind.", [
+        ("", {"kind": kind}, count) for kind, count in report["retries"].items()
+    ])
+    metric("ai_fallback_templates_total", "counter", "Tools written from the fallback template.", [
+        ("", {}, report["fallbackTemplates"])
+    ])
+    return "\n".join(lines) + "\n"
+
+
+_telemetry: Optional[Telemetry] = None
+
+
+def get_telemetry() -> Telemetry:
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = Telemetry()
+    return _telemetry
+
+
+def format_summary(report: Dict[str, Any]) -> str:
+    p50, p95 = report["latency"]["p50"], report["latency"]["p95"]
+    bound = lambda value: "-" if value is None else f"≤{value:g}s"
+    unknown = report.get("usageUnknownCalls", 0)
+    return (f"{report['calls']} calls, {report['promptTokens']}+{report['completionTokens']} tokens, "
+            f"~${report['estimatedCostUsd']:.4f}{f' ({unknown} with unknown usage)' if unknown else ''}, p50 {bound(p50)}, p95 {bound(p95)}, "
+            f"{sum(report['failures'].values())} failures, {sum(report['parseFailures'].values())} parse failures, "
+            f"{sum(report['retries'].values())} retries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show an AI telemetry report")
+    parser.add_argument("report", help="JSON report written by update_data.py")
+    parser.add_argument("--prometheus", action="store_true", help="Print in Prometheus text format")
+    args = parser.parse_args()
+
+    with open(args.report, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    if args.prometheus:
+        print(to_prometheus(report), end="")
+        return
+    print(f"📊 {format_summary(report)}")
+    for model, stats in report["models"].items():
+        print(f"  {model:<22} {stats['calls']:>4} calls  {stats['promptTokens']:>8}+{stats['completionTokens']:<8} tokens"
+              f"  ~${stats['estimatedCostUsd']:.4f}"
+              + (f"  ({stats['usageUnknownCalls']} usage unknown)" if stats.get("usageUnknownCalls") else ""))
+    for label, key in (("Failures", "failures"), ("Parse failures", "parseFailures"), ("Retries", "retries")):
+        if report[key]:
+            print(f"  {label}: " + ", ".join(f"{reason} ×{count}" for reason, count in report[key].items()))
+
+
+if __name__ == "__main__":
+    main()
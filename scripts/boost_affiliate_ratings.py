@@ -6,7 +6,9 @@ Targets: Fliki, Zebracat, Veed.io, Synthesia, Elai.io, Pika
 
 import json
 import random
-import os
+import sys
+
+from tool_store import ConflictError, ToolStore
 
 # Target affiliate tools
 AFFILIATE_TOOLS = ['Fliki', 'Zebracat', 'Veed.io', 'Synthesia', 'Elai.io', 'Pika']
@@ -57,24 +59,22 @@ def boost_affiliate_tools(tools_data):
     return updated_count
 
 def main():
-    """Main function to update tools.json."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(os.path.dirname(script_dir))
-    tools_json_path = os.path.join(project_root, 'src', 'data', 'tools.json')
+    """Main function to update the tool shards and tools.json."""
+    store = ToolStore()
     
     print("🚀 Starting affiliate tools rating boost...")
     print(f"📋 Target tools: {', '.join(AFFILIATE_TOOLS)}")
-    print(f"📁 Reading from: {tools_json_path}\n")
+    print(f"📁 Reading from: {store.shard_dir}\n")
     
-    # Read existing tools.json
+    # Read existing tool shards
     try:
-        with open(tools_json_path, 'r', encoding='utf-8') as f:
-            tools_data = json.load(f)
-    except FileNotFoundError:
-        print(f"❌ Error: {tools_json_path} not found!")
+        checkout = store.checkout()
+        tools_data = checkout.tools
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e.filename} not found!")
         return
     except json.JSONDecodeError as e:
-        print(f"❌ Error: Invalid JSON in {tools_json_path}: {e}")
+        print(f"❌ Error: Invalid JSON in tool shard: {e}")
         return
     
     print(f"📊 Found {len(tools_data)} tools in JSON\n")
@@ -82,13 +82,16 @@ def main():
     # Boost affiliate tools
     updated_count = boost_affiliate_tools(tools_data)
     
-    # Write back to file
+    # Commit only the touched fields (rebased onto concurrent edits), then rebuild tools.json
     try:
-        with open(tools_json_path, 'w', encoding='utf-8') as f:
-            json.dump(tools_data, f, indent=2, ensure_ascii=False)
+        result = store.commit(checkout)
+        store.assemble()
         
         print(f"✅ Successfully updated {updated_count} affiliate tools")
-        print(f"📁 Saved to: {tools_json_path}")
+        print(f"📁 Saved {len(result['written'])} shard(s) and {store.monolith_path}")
+    except ConflictError as e:
+        print(f"❌ {e} (another run changed the same fields, re-run to retry)")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Error writing to file: {e}")
 
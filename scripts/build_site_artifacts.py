@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Split the tools catalog into static site artifacts under public/data/tools/.
+
+  cards.<hash>.json     minified card index: only what a tool card renders
+                        (name, logo_url, starting_price, rating, tags, ...),
+                        plus each tool's detail file path
+  <slug>.<hash>.json    one minified detail file per tool with the remaining
+                        fields (long_review, content, feature_groups, faqs, ...)
+  manifest.json         stable name → current hashed file names and sizes
+
+File names carry a hash of their contents, so they can be served with
+immutable cache headers and only tools that changed get new URLs. A page
+fetches the card index (listings) or one detail file (tool pages), instead
+of the whole tools.json. Card + detail together are the full tool record.
+
+Tools are read shard by shard through ToolStore, so the build holds one tool
+at a time. Files that already exist are not rewritten, and hashed files
+left over from earlier builds (names matching <stem>.<12 hex>.json) are
+removed; other files in the output directory are never touched.
+
+Usage:
+  python scripts/build_site_artifacts.py
+  python scripts/build_site_artifacts.py --out-dir /tmp/site-data --keep-stale
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from tool_store import PROJECT_ROOT, ToolStore, write_text_atomic
+
+OUT_DIR = PROJECT_ROOT / "public" / "data" / "tools"
+URL_PREFIX = "/data/tools"
+MANIFEST_FILENAME = "manifest.json"
+HASH_LENGTH = 12
+# Only files named like build output are ever pruned; anything else in --out-dir is left alone.
+ARTIFACT_NAME_RE = re.compile(rf"^[a-z0-9-]+\.[0-9a-f]{{{HASH_LENGTH}}}\.json$")
+ARTIFACT_VERSION = 1
+
+# Fields a card/listing needs; everything else goes to the per-tool detail file.
+CARD_FIELDS = (
+    "id", "slug", "name", "logo_url", "affiliate_link", "tagline", "short_description", "best_for",
+    "starting_price", "pricing_model", "has_free_trial", "rating", "review_count", "tags", "categories",
+    "is_verified", "deal",
+)
+
+
+def minify(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def hashed_name(stem: str, payload: bytes) -> str:
+    return f"{stem}.{hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]}.json"
+
+
+def split_tool(tool: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """(card, detail); detail keeps the slug so it can be used on its own."""
+    card = {key: tool[key] for key in CARD_FIELDS if key in tool}
+    detail = {"slug": tool["slug"], **{key: value for key, value in tool.items() if key not in CARD_FIELDS}}
+    return card, detail
+
+
+def _write_once(out_dir: Path, name: str, payload: bytes) -> bool:
+    path = out_dir / name
+    if path.exists():
+        return False
+    write_text_atomic(path, payload.decode("utf-8"))
+    return True
+
+
+def build(store: ToolStore, out_dir: Path = OUT_DIR, keep_stale: bool = False) -> Dict[str, Any]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cards: List[Dict[str, Any]] = []
+    details: Dict[str, Dict[str, Any]] = {}
+    written = 0
+
+    for slug in store.slugs():
+        card, detail = split_tool(store.load_tool(slug))
+        payload = minify(detail)
+        name = hashed_name(slug, payload)
+        written += _write_once(out_dir, name, payload)
+        details[slug] = {"file": f"{URL_PREFIX}/{name}", "bytes": len(payload)}
+        cards.append({**card, "detail": f"{URL_PREFIX}/{name}"})
+
+    cards_payload = minify(cards)
+    cards_name = hashed_name("cards", cards_payload)
+    written += _write_once(out_dir, cards_name, cards_payload)
+
+    manifest = {
+        "version": ARTIFACT_VERSION,
+        "cards": {"file": f"{URL_PREFIX}/{cards_name}", "bytes": len(cards_payload), "count": len(cards)},
+        "tools": details,
+    }
+    write_text_atomic(out_dir / MANIFEST_FILENAME, json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+
+    removed = 0
+    if not keep_stale:
+        current = {cards_name} | {entry["file"].rsplit("/", 1)[-1] for entry in details.values()}
+        for path in out_dir.glob("*.json"):
+            if ARTIFACT_NAME_RE.match(path.name) and path.name not in current:
+                path.unlink()
+                removed += 1
+    return {"manifest": manifest, "written": written, "removed": removed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the card index and per-tool detail files for the site")
+    parser.add_argument("--out-dir", default=str(OUT_DIR))
+    parser.add_argument("--keep-stale", action="store_true", help="Keep hashed files from earlier builds")
+    args = parser.parse_args()
+
+    store = ToolStore()
+    result = build(store, Path(args.out_dir), keep_stale=args.keep_stale)
+    manifest = result["manifest"]
+    detail_sizes = [entry["bytes"] for entry in manifest["tools"].values()]
+    monolith_bytes = store.monolith_path.stat().st_size if store.monolith_path.exists() else 0
+
+    print(f"✅ {manifest['cards']['count']} tools → {args.out_dir}")
+    print(f"📊 Card index: {manifest['cards']['bytes'] / 1024:.1f} KB ({monolith_bytes / 1024:.1f} KB for {store.monolith_path.name})")
+    if detail_sizes:
+        print(f"📊 Detail files: {sum(detail_sizes) / len(detail_sizes) / 1024:.1f} KB average, "
+              f"{max(detail_sizes) / 1024:.1f} KB largest")
+    print(f"📁 {result['written']} files written, {result['removed']} stale files removed")
+
+
+if __name__ == "__main__":
+    main()
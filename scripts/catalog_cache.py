@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Warm binary cache for parsed JSON, shared across script invocations.
+
+Each entry is a marshal file under .cache/catalog/ holding the parsed value
+plus, for every source file it was built from, (path, size, mtime_ns, sha256).
+A load stats the sources: when every size and mtime matches, the value comes
+straight from marshal with no JSON parse and no hashing. When only mtimes moved
+(checkout, touch) the sources are hashed and a matching hash re-stamps the
+entry instead of rebuilding it. Anything else rebuilds and rewrites the entry;
+if a source changes while the value is being built, the value is returned but
+not cached.
+
+ToolStore uses this for the index, the monolith hash check and whole-catalog
+loads; load_json() covers any other JSON file.
+
+Usage:
+  python scripts/catalog_cache.py stats
+  python scripts/catalog_cache.py clear
+  python scripts/catalog_cache.py bench
+"""
+
+import argparse
+import hashlib
+import json
+import marshal
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "catalog"
+# Bump when the entry layout changes; marshal's own format is tied to the Python version.
+FORMAT_VERSION = 1
+ENTRY_SUFFIX = ".marshal"
+
+Source = Tuple[str, int, int, Optional[str]]   # path, size, mtime_ns, sha256
+
+
+def _stat(path: Path) -> Tuple[int, int]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return -1, -1
+    return st.st_size, st.st_mtime_ns
+
+
+def _sha256(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _write_bytes_atomic(path: Path, payload: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class BinaryCache:
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.hits = {"warm": 0, "restamped": 0, "rebuilt": 0}
+
+    def entry_path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}{ENTRY_SUFFIX}"
+
+    def _read(self, name: str) -> Optional[Tuple[List[Source], Any]]:
+        try:
+            version, sources, value = marshal.loads(self.entry_path(name).read_bytes())
+        except (FileNotFoundError, EOFError, ValueError, TypeError):
+            return None
+        return (sources, value) if version == FORMAT_VERSION else None
+
+    def _write(self, name: str, sources: List[Source], value: Any) -> None:
+        try:
+            _write_bytes_atomic(self.entry_path(name), marshal.dumps((FORMAT_VERSION, sources, value)))
+        except (OSError, ValueError):
+            # Read-only checkout or a value marshal can't encode: the cache is only an optimization.
+            pass
+
+    def get(self, name: str, paths: Sequence[Path], build: Callable[[], Any]) -> Any:
+        """The cached value for `paths`, rebuilt with build() when any source changed."""
+        stats = [(str(path), *_stat(path)) for path in paths]
+        cached = self._read(name)
+        if cached is not None:
+            sources, value = cached
+            if [source[:3] for source in sources] == stats:
+                self.hits["warm"] += 1
+                return value
+            if [source[0] for source in sources] == [path for path, _, _ in stats]:
+                hashes = [_sha256(Path(path)) for path, _, _ in stats]
+                if all(source[1] == size for source, (_, size, _) in zip(sources, stats)) \
+                        and [source[3] for source in sources] == hashes:
+                    self._write(name, [(*stat, digest) for stat, digest in zip(stats, hashes)], value)
+                    self.hits["restamped"] += 1
+                    return value
+
+        # Stamp the sources as they were before building: stamping afterwards could pair the value
+        # with a newer file written mid-build and serve the stale value as warm from then on.
+        sources = [(*stat, _sha256(Path(stat[0]))) for stat in stats]
+        value = build()
+        self.hits["rebuilt"] += 1
+        if [(str(path), *_stat(path)) for path in paths] == stats:
+            self._write(name, sources, value)
+        return value
+
+    def clear(self) -> int:
+        removed = 0
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            path.unlink()
+            removed += 1
+        return removed
+
+
+def cache_key(*parts: Any) -> str:
+    """Short stable entry name for e.g. a store's directory."""
+    return hashlib.sha1("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:16]
+
+
+_default_cache: Optional[BinaryCache] = None
+
+
+def default_cache() -> BinaryCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = BinaryCache()
+    return _default_cache
+
+
+def load_json(path: Path) -> Any:
+    """json.load() through the warm cache."""
+    path = Path(path).resolve()
+
+    def parse() -> Any:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    return default_cache().get(f"json-{cache_key(path)}", [path], parse)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm binary cache of parsed catalog JSON")
+    parser.add_argument("command", choices=["stats", "clear", "bench"])
+    args = parser.parse_args()
+
+    cache = default_cache()
+    if args.command == "stats":
+        entries = sorted(cache.cache_dir.glob(f"*{ENTRY_SUFFIX}"))
+        total = sum(path.stat().st_size for path in entries)
+        print(f"📦 {len(entries)} entries, {total / 1024:.1f} KB in {cache.cache_dir}")
+    elif args.command == "clear":
+        print(f"🗑️  Removed {cache.clear()} entries")
+    else:
+        from tool_store import ToolStore
+
+        def timed(use_cache: bool) -> float:
+            started = time.perf_counter()
+            ToolStore(cache=use_cache).load_tools()
+            return (time.perf_counter() - started) * 1000
+
+        ToolStore().load_tools()  # make sure the cache is warm
+        cold = min(timed(False) for _ in range(5))
+        warm = min(timed(True) for _ in range(5))
+        print(f"⏱️  load_tools(): {cold:.2f} ms parsed, {warm:.2f} ms warm ({cold / warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Local HTTP service that renders comparison content for any tool pair on demand.
+
+The catalog is loaded once (through ToolStore and the warm catalog cache) into
+a VerdictEngine, so tool fragments and score tables stay in memory. Rendered
+pairs are kept as ready-to-send JSON bytes in an LRU cache, and a cached
+response is a dict lookup plus a socket write. Before each request the service
+stats src/data/tools.json and the shard index. When either has changed, the
+engine and slug registry are rebuilt and the LRU is emptied.
+
+Endpoints:
+  GET /compare/<slug-a>/<slug-b>   generate_comparison_content() as JSON (names and aliases are resolved)
+  GET /tools                       catalog slugs
+  GET /health                      catalog version and cache statistics
+
+Responses carry an ETag; If-None-Match gets a 304.
+
+Usage:
+  python scripts/comparison_service.py serve --port 8787
+  curl http://127.0.0.1:8787/compare/fliki/heygen
+  python scripts/comparison_service.py bench --url http://127.0.0.1:8787 --workers 32
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+from urllib.request import urlopen
+
+from generate_comparison_verdict import VerdictEngine
+from slug_registry import SlugRegistry, load_slug_map
+from tool_store import ToolStore
+
+DEFAULT_PORT = 8787
+DEFAULT_CACHE_SIZE = 4096
+
+Response = Tuple[int, bytes, str]   # status, body, etag
+
+
+def _stamp(path) -> Tuple[int, int]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return -1, -1
+    return st.st_size, st.st_mtime_ns
+
+
+def _response(status: int, payload: Any) -> Response:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return status, body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+class ComparisonCatalog:
+    """Warm VerdictEngine plus an LRU of serialized pair responses, rebuilt when the catalog changes."""
+
+    def __init__(self, store: Optional[ToolStore] = None, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.store = store or ToolStore()
+        self.cache_size = cache_size
+        self.stats = {"hits": 0, "misses": 0, "reloads": 0}
+        self._cache: "OrderedDict[Tuple[str, str], Response]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self.version: Optional[Tuple] = None
+        self.reload_if_changed()
+
+    def _current_version(self) -> Tuple:
+        return _stamp(self.store.monolith_path), _stamp(self.store.index_path)
+
+    def reload_if_changed(self) -> bool:
+        if self._current_version() == self.version:
+            return False
+        with self._reload_lock:
+            version = self._current_version()
+            if version == self.version:
+                return False
+            # A fresh store re-reads the index (and re-shards if tools.json was edited directly).
+            self.store = ToolStore(self.store.shard_dir, self.store.monolith_path, history_dir=self.store.history_dir)
+            tools = self.store.load_tools()
+            engine = VerdictEngine(tools)
+            registry = SlugRegistry(tools, load_slug_map())
+            with self._lock:
+                self.engine, self.registry = engine, registry
+                self.slugs = [tool["slug"] for tool in tools]
+                self._cache.clear()
+                # Stamp after loading: re-sharding above may itself have rewritten the index.
+                self.version = self._current_version()
+                self.stats["reloads"] += 1
+            return True
+
+    def compare(self, name_a: str, name_b: str) -> Response:
+        self.reload_if_changed()
+        with self._lock:
+            engine, registry = self.engine, self.registry
+        slug_a, slug_b = registry.resolve(name_a, fuzzy=True), registry.resolve(name_b, fuzzy=True)
+        key = (slug_a, slug_b)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return cached
+            self.stats["misses"] += 1
+
+        unknown = [slug for slug in key if not registry.is_known(slug)]
+        if unknown:
+            return _response(404, {"error": f"Unknown tool: {', '.join(unknown)}"})
+        if slug_a == slug_b:
+            return _response(400, {"error": "Pick two different tools"})
+        try:
+            response = _response(200, {"pair": f"{slug_a}-vs-{slug_b}", **engine.comparison_content(slug_a, slug_b)})
+        except ValueError as e:
+            # e.g. an unparseable starting price; cached too, so it isn't re-rendered per request
+            response = _response(422, {"error": str(e), "pair": f"{slug_a}-vs-{slug_b}"})
+
+        with self._lock:
+            if engine is self.engine:
+                self._cache[key] = response
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return response
+
+    def tools(self) -> List[str]:
+        self.reload_if_changed()
+        with self._lock:
+            return list(self.slugs)
+
+    def health(self) -> Dict[str, Any]:
+        self.reload_if_changed()
+        with self._lock:
+            return {"tools": len(self.slugs), "cached": len(self._cache), "cacheSize": self.cache_size,
+                    "version": list(self.version), **self.stats}
+
+
+def make_handler(catalog: ComparisonCatalog, verbose: bool = False):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; with Nagle on, keep-alive clients wait on delayed ACKs.
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            parts = [unquote(part) for part in urlsplit(self.path).path.strip("/").split("/")]
+            if len(parts) == 3 and parts[0] == "compare":
+                status, body, etag = catalog.compare(parts[1], parts[2])
+            elif parts == ["tools"]:
+                status, body, etag = _response(200, catalog.tools())
+            elif parts == ["health"]:
+                status, body, etag = _response(200, catalog.health())
+            else:
+                status, body, etag = _response(404, {"error": "Not found"})
+
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+class ComparisonServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under a concurrent site build, costing a 1s retransmit.
+    request_queue_size = 256
+
+
+def serve(host: str, port: int, cache_size: int, verbose: bool) -> None:
+    catalog = ComparisonCatalog(cache_size=cache_size)
+    server = ComparisonServer((host, port), make_handler(catalog, verbose))
+    print(f"🚀 Comparison service on http://{host}:{port} ({len(catalog.slugs)} tools, LRU {cache_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 {catalog.health()}")
+
+
+def bench(url: str, workers: int, rounds: int) -> None:
+    """Fetch every ordered pair `rounds` times concurrently over keep-alive connections; round 1 fills the cache."""
+    target = urlsplit(url)
+    with urlopen(f"{url.rstrip('/')}/tools") as response:
+        slugs: List[str] = json.load(response)
+    pairs = [(a, b) for a in slugs for b in slugs if a != b]
+    local = threading.local()
+
+    def fetch(pair: Tuple[str, str]) -> Tuple[float, int]:
+        if not hasattr(local, "conn"):
+            local.conn = http.client.HTTPConnection(target.hostname, target.port)
+        started = time.perf_counter()
+        local.conn.request("GET", f"/compare/{pair[0]}/{pair[1]}")
+        response = local.conn.getresponse()
+        response.read()
+        return (time.perf_counter() - started) * 1000, response.status
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for round_no in range(1, rounds + 1):
+            started = time.perf_counter()
+            results = list(pool.map(fetch, pairs))
+            elapsed = time.perf_counter() - started
+            latencies = sorted(ms for ms, _ in results)
+            ok = sum(1 for _, status in results if status == 200)
+            print(f"  Round {round_no}: {len(pairs)} pairs in {elapsed:.2f}s ({len(pairs) / elapsed:.0f}/s), "
+                  f"p50 {latencies[len(latencies) // 2]:.2f} ms, p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms, "
+                  f"{ok} ok, {len(pairs) - ok} errors")
+    with urlopen(f"{url.rstrip('/')}/health") as response:
+        print(f"📊 {json.load(response)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="On-demand comparison content over HTTP")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Run the service")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    serve_parser.add_argument("--verbose", action="store_true", help="Log every request")
+    bench_parser = sub.add_parser("bench", help="Load-test a running service with every pair")
+    bench_parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    bench_parser.add_argument("--workers", type=int, default=32)
+    bench_parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.host, args.port, args.cache_size, args.verbose)
+    else:
+        bench(args.url, args.workers, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Tools × fields evidence coverage as a NumPy matrix.
+
+Row i is a tool, column j a tracked field (the fieldsExtracted keys of
+data/non-price-evidence-import/index.json). counts[i, j] is the number of
+candidate values the tool has for that field across its evidence hardFacts
+(routed like merge_evidence.py) and its import bundle; covered = counts > 0.
+
+The matrix lives in .cache/coverage/ (counts.npy + meta.json). A build only
+recomputes rows whose input files changed (same input signature as
+merge_evidence.py), so queries never re-walk the nested JSON:
+
+  missing(["policy.watermark", "exportLimits"])   tools lacking all of them
+  missing([...], any_=True)                        tools lacking at least one
+  stats()                                          per-field / per-tool coverage
+
+Field names may be given by unique suffix ("exportLimits").
+
+Usage:
+  python scripts/coverage_matrix.py build
+  python scripts/coverage_matrix.py missing policy.watermark exportLimits
+  python scripts/coverage_matrix.py missing watermark commercialUse --any
+  python scripts/coverage_matrix.py stats
+  python scripts/coverage_matrix.py summary --out /tmp/missing-fields-summary.json
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from merge_evidence import evidence_candidates, group_inputs, import_candidates, input_signature
+from tool_store import PROJECT_ROOT, write_text_atomic
+
+COVERAGE_DIR = PROJECT_ROOT / ".cache" / "coverage"
+COVERAGE_VERSION = 1
+
+TRACKED_FIELDS = (
+    "officialUrl",
+    "policy.watermark",
+    "policy.commercialUse",
+    "policy.usageRights",
+    "policy.refundCancellation",
+    "policy.exportLimits",
+    "mainLimitations",
+    "workflowFeatureDocs",
+    "securityApiEnterprise.security",
+    "securityApiEnterprise.api",
+    "securityApiEnterprise.enterprise",
+    "logoSources",
+)
+
+
+def _read_json(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def tool_row(inputs: Dict[str, List[Path]], fields: List[str]) -> np.ndarray:
+    """Candidate counts per tracked field for one tool."""
+    column = {field: j for j, field in enumerate(fields)}
+    row = np.zeros(len(fields), dtype=np.uint32)
+    for path in inputs["evidence"]:
+        for field, _, _ in evidence_candidates(path, _read_json(path)):
+            if field in column:
+                row[column[field]] += 1
+    for path in inputs["import"]:
+        bundle = _read_json(path)
+        for field, _, _ in import_candidates(path, bundle):
+            if field in column:
+                row[column[field]] += 1
+        if "logoSources" in column:
+            row[column["logoSources"]] += len((bundle.get("fields") or {}).get("logoSources") or [])
+    return row
+
+
+class CoverageMatrix:
+    def __init__(self, root: Path = COVERAGE_DIR):
+        self.root = Path(root)
+        self.fields: List[str] = list(TRACKED_FIELDS)
+        self.tools: List[str] = []
+        self.signatures: Dict[str, str] = {}
+        self.counts = np.zeros((0, len(self.fields)), dtype=np.uint32)
+        self.covered = np.zeros((0, len(self.fields)), dtype=bool)
+        self._row: Dict[str, int] = {}
+        self._load()
+
+    # Persistence -----------------------------------------------------
+
+    def _load(self) -> None:
+        meta_path = self.root / "meta.json"
+        counts_path = self.root / "counts.npy"
+        if not meta_path.exists() or not counts_path.exists():
+            return
+        meta = _read_json(meta_path)
+        if meta.get("version") != COVERAGE_VERSION or meta.get("fields") != self.fields:
+            return
+        self.tools = meta["tools"]
+        self.signatures = meta["signatures"]
+        self.counts = np.load(counts_path)
+        self._reindex()
+
+    def _save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / "counts.tmp.npy"
+        np.save(tmp_path, self.counts)
+        tmp_path.replace(self.root / "counts.npy")
+        meta = {"version": COVERAGE_VERSION, "fields": self.fields, "tools": self.tools, "signatures": self.signatures}
+        write_text_atomic(self.root / "meta.json", json.dumps(meta, indent=2) + "\n")
+
+    def _reindex(self) -> None:
+        self._row = {slug: i for i, slug in enumerate(self.tools)}
+        self.covered = self.counts > 0
+
+    # Build -------------------------------------------------------------
+
+    def update(self, full: bool = False) -> Dict[str, List[str]]:
+        """Recompute rows for tools whose inputs changed; add and drop tools as needed."""
+        groups = group_inputs()
+        outcome: Dict[str, List[str]] = {"updated": [], "unchanged": [], "removed": []}
+
+        removed = [slug for slug in self.tools if slug not in groups]
+        if removed:
+            keep = [i for i, slug in enumerate(self.tools) if slug in groups]
+            self.counts = self.counts[keep]
+            self.tools = [self.tools[i] for i in keep]
+            for slug in removed:
+                self.signatures.pop(slug, None)
+            outcome["removed"] = removed
+            self._reindex()
+
+        new_rows = []
+        for slug in sorted(groups):
+            signature = input_signature(groups[slug])
+            if not full and self.signatures.get(slug) == signature and slug in self._row:
+                outcome["unchanged"].append(slug)
+                continue
+            row = tool_row(groups[slug], self.fields)
+            if slug in self._row:
+                self.counts[self._row[slug]] = row
+            else:
+                new_rows.append((slug, row))
+            self.signatures[slug] = signature
+            outcome["updated"].append(slug)
+
+        if new_rows:
+            self.tools.extend(slug for slug, _ in new_rows)
+            self.counts = np.vstack([self.counts] + [row[None, :] for _, row in new_rows])
+        if outcome["updated"] or removed:
+            self._reindex()
+            self._save()
+        return outcome
+
+    # Queries -----------------------------------------------------------
+
+    def column(self, name: str) -> int:
+        """Column of a field by full name or unique suffix."""
+        if name in self.fields:
+            return self.fields.index(name)
+        matches = [j for j, field in enumerate(self.fields) if field.split(".")[-1] == name or field.endswith(name)]
+        if len(matches) != 1:
+            raise KeyError(f"Field {name!r} is {'ambiguous' if matches else 'unknown'}; known: {', '.join(self.fields)}")
+        return matches[0]
+
+    def columns(self, names: List[str]) -> np.ndarray:
+        return np.array([self.column(name) for name in names], dtype=np.intp)
+
+    def missing(self, names: List[str], any_: bool = False) -> List[str]:
+        """Tools lacking all of `names` (or any of them with any_=True)."""
+        lacking = ~self.covered[:, self.columns(names)]
+        mask = lacking.any(axis=1) if any_ else lacking.all(axis=1)
+        return [self.tools[i] for i in np.flatnonzero(mask)]
+
+    def having(self, names: List[str]) -> List[str]:
+        """Tools covering every one of `names`."""
+        mask = self.covered[:, self.columns(names)].all(axis=1)
+        return [self.tools[i] for i in np.flatnonzero(mask)]
+
+    def stats(self) -> Dict[str, Any]:
+        per_field = self.covered.sum(axis=0)
+        per_tool = self.covered.sum(axis=1)
+        return {
+            "toolCount": len(self.tools),
+            "fieldCount": len(self.fields),
+            "coverage": float(self.covered.mean()) if self.covered.size else 0.0,
+            "fields": {field: int(per_field[j]) for j, field in enumerate(self.fields)},
+            "completeTools": [self.tools[i] for i in np.flatnonzero(per_tool == len(self.fields))],
+            "leastCovered": [
+                {"slug": self.tools[i], "fields": int(per_tool[i])}
+                for i in np.argsort(per_tool, kind="stable")[:5]
+            ],
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """The missing-fields-summary.json shape: field → {count, tools} for fields some tool lacks."""
+        fields = {}
+        for j, field in enumerate(self.fields):
+            tools = [self.tools[i] for i in np.flatnonzero(~self.covered[:, j])]
+            if tools:
+                fields[field] = {"count": len(tools), "tools": tools}
+        return {"generatedAt": datetime.now(timezone.utc).isoformat(), "fields": fields}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tools × fields evidence coverage matrix")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Recompute rows for changed tools")
+    build.add_argument("--full", action="store_true")
+    missing = sub.add_parser("missing", help="Tools lacking the given fields")
+    missing.add_argument("fields", nargs="+")
+    missing.add_argument("--any", action="store_true", help="Lacking at least one field (default: all of them)")
+    having = sub.add_parser("having", help="Tools covering all the given fields")
+    having.add_argument("fields", nargs="+")
+    sub.add_parser("stats", help="Coverage per field and per tool")
+    summary = sub.add_parser("summary", help="Write a missing-fields-summary.json style report")
+    summary.add_argument("--out")
+    args = parser.parse_args()
+
+    matrix = CoverageMatrix()
+    outcome = matrix.update(full=getattr(args, "full", False))
+    if args.command == "build":
+        print(f"✅ Updated: {len(outcome['updated'])}  Unchanged: {len(outcome['unchanged'])}  Removed: {len(outcome['removed'])}")
+        print(f"📁 {matrix.root} ({len(matrix.tools)} tools × {len(matrix.fields)} fields)")
+        return
+
+    started = time.perf_counter()
+    if args.command == "missing":
+        result: Any = matrix.missing(args.fields, any_=args.any)
+    elif args.command == "having":
+        result = matrix.having(args.fields)
+    elif args.command == "stats":
+        result = matrix.stats()
+    else:
+        result = matrix.summary()
+    elapsed_us = (time.perf_counter() - started) * 1e6
+
+    if args.command in ("missing", "having"):
+        print(f"🔍 {len(result)} tools ({elapsed_us:.0f} µs): {', '.join(result) or 'none'}")
+    elif args.command == "stats":
+        print(f"📊 {result['toolCount']} tools, {result['coverage']:.0%} of cells covered ({elapsed_us:.0f} µs)")
+        for field, count in result["fields"].items():
+            print(f"  {field:<34} {count:>3}/{result['toolCount']}")
+        print(f"  Complete: {', '.join(result['completeTools']) or 'none'}")
+    else:
+        text = json.dumps(result, indent=2, ensure_ascii=False) + "\n"
+        if args.out:
+            write_text_atomic(Path(args.out), text)
+            print(f"📁 Summary written to {args.out}")
+        else:
+            print(text, end="")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        raise SystemExit(1)
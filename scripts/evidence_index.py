@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Persistent BM25 full-text index over data/evidence.
+
+Indexed documents: every hardFacts value, every hardFacts source quote and
+every nugget (top-level, finalEvidence and pageEvidence). The index lives in
+.cache/evidence-index/:
+
+  files/<name>.json   tokenized documents for one evidence file + its sha256
+  postings.npy        int32 (doc, tf) pairs grouped by term, memory-mapped at query time
+  doc_lengths.npy     int32 token count per document
+  lexicon.json        term → [start, end) into postings
+  docs.json           document metadata (slug, kind, field, url, text)
+
+`build` only re-tokenizes evidence files whose hash changed, then re-merges
+the cached per-file documents into fresh postings. Queries open the arrays
+with mmap and score only the postings of the query terms.
+
+Usage:
+  python scripts/evidence_index.py build
+  python scripts/evidence_index.py build --file data/evidence/heygen.json
+  python scripts/evidence_index.py query watermark
+  python scripts/evidence_index.py query "commercial use" --slug invideo --k 5
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from slug_registry import resolve_slug
+from tool_store import PROJECT_ROOT, write_text_atomic
+
+EVIDENCE_DIR = PROJECT_ROOT / "data" / "evidence"
+INDEX_DIR = PROJECT_ROOT / ".cache" / "evidence-index"
+FILES_SUBDIR = "files"
+INDEX_VERSION = 2  # 2: slugs resolved through slug_registry
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+DEFAULT_K = 10
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "with", "you", "your",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Document extraction
+# ----------------------------------------------------------------------
+
+def iter_nuggets(evidence: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    yield from evidence.get("nuggets") or []
+    yield from (evidence.get("finalEvidence") or {}).get("nuggets") or []
+    for page in evidence.get("pageEvidence") or []:
+        yield from page.get("nuggets") or []
+
+
+def extract_documents(path: Path) -> List[Dict[str, Any]]:
+    """Indexable documents of one evidence file, with per-document term counts."""
+    with open(path, "r", encoding="utf-8") as f:
+        evidence = json.load(f)
+    slug = resolve_slug(evidence.get("slug") or evidence.get("tool")
+                        or (evidence.get("finalEvidence") or {}).get("slug") or path.stem)
+
+    raw: List[Tuple[str, str, Optional[str], str]] = []   # (kind, field, url, text)
+    for fact in evidence.get("hardFacts") or []:
+        field = fact.get("field") or ""
+        if isinstance(fact.get("value"), str):
+            raw.append(("fact", field, None, fact["value"]))
+        for source in fact.get("sources") or []:
+            if source.get("quote"):
+                raw.append(("quote", field, source.get("url"), source["quote"]))
+    for nugget in iter_nuggets(evidence):
+        if nugget.get("text"):
+            raw.append(("nugget", nugget.get("theme") or "", nugget.get("sourceUrl"), nugget["text"]))
+
+    documents = []
+    seen = set()
+    for kind, field, url, text in raw:
+        if (kind, text) in seen:
+            continue  # pageEvidence repeats many top-level nuggets
+        seen.add((kind, text))
+        tokens = tokenize(text)
+        if not tokens:
+            continue
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        documents.append({
+            "slug": slug, "kind": kind, "field": field, "url": url, "text": text,
+            "length": len(tokens), "terms": counts,
+        })
+    return documents
+
+
+# ----------------------------------------------------------------------
+# Build
+# ----------------------------------------------------------------------
+
+class EvidenceIndex:
+    def __init__(self, index_dir: Path = INDEX_DIR, evidence_dir: Path = EVIDENCE_DIR):
+        self.index_dir = Path(index_dir)
+        self.evidence_dir = Path(evidence_dir)
+        self.files_dir = self.index_dir / FILES_SUBDIR
+        self._postings: Optional[np.ndarray] = None
+        self._doc_lengths: Optional[np.ndarray] = None
+        self._lexicon: Optional[Dict[str, List[int]]] = None
+        self._docs: Optional[List[Dict[str, Any]]] = None
+
+    def evidence_files(self) -> List[Path]:
+        return sorted(p for p in self.evidence_dir.glob("*.json") if not p.name.endswith(".evidence.json"))
+
+    def _cache_path(self, path: Path) -> Path:
+        return self.files_dir / path.name
+
+    def _cache_usable(self, path: Path) -> bool:
+        try:
+            with open(self._cache_path(path), "r", encoding="utf-8") as f:
+                return json.load(f).get("version") == INDEX_VERSION
+        except (FileNotFoundError, ValueError):
+            return False
+
+    def refresh_file(self, path: Path, force: bool = False) -> bool:
+        """Re-tokenize one evidence file if its content changed. Returns True when it did."""
+        digest = file_hash(path)
+        cache_path = self._cache_path(path)
+        if not force and cache_path.exists():
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+                if cached.get("sha256") == digest and cached.get("version") == INDEX_VERSION:
+                    return False
+        payload = {"version": INDEX_VERSION, "sha256": digest, "documents": extract_documents(path)}
+        write_text_atomic(cache_path, json.dumps(payload, ensure_ascii=False))
+        return True
+
+    def build(self, paths: Optional[List[Path]] = None, force: bool = False) -> Dict[str, List[str]]:
+        """Refresh changed files (default: all evidence files) and rewrite the merged postings."""
+        if force and self.index_dir.exists():
+            shutil.rmtree(self.index_dir)
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+
+        current = self.evidence_files()
+        names = {p.name for p in current}
+        removed = [p.name for p in self.files_dir.glob("*.json") if p.name not in names]
+        for name in removed:
+            (self.files_dir / name).unlink()
+        targets = current if paths is None else [Path(p) for p in paths]
+        if paths is not None:
+            # The merge reads every current file's cache, so missing or old-version ones are rebuilt too.
+            target_names = {p.name for p in targets}
+            targets += [p for p in current if p.name not in target_names and not self._cache_usable(p)]
+        refreshed = [p.name for p in targets if self.refresh_file(p, force)]
+
+        if refreshed or removed or not (self.index_dir / "lexicon.json").exists():
+            self._merge(current)
+        return {"refreshed": refreshed, "removed": removed}
+
+    def _merge(self, files: List[Path]) -> None:
+        docs: List[Dict[str, Any]] = []
+        lengths: List[int] = []
+        by_term: Dict[str, List[Tuple[int, int]]] = {}
+        for path in files:
+            with open(self._cache_path(path), "r", encoding="utf-8") as f:
+                documents = json.load(f)["documents"]
+            for document in documents:
+                doc_id = len(docs)
+                for term, tf in document["terms"].items():
+                    by_term.setdefault(term, []).append((doc_id, tf))
+                lengths.append(document["length"])
+                docs.append({key: document[key] for key in ("slug", "kind", "field", "url", "text")})
+
+        postings = np.empty((sum(len(p) for p in by_term.values()), 2), dtype=np.int32)
+        lexicon: Dict[str, List[int]] = {}
+        offset = 0
+        for term in sorted(by_term):
+            entries = by_term[term]
+            postings[offset:offset + len(entries)] = entries
+            lexicon[term] = [offset, offset + len(entries)]
+            offset += len(entries)
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        # Arrays first, lexicon last: a reader never sees a lexicon pointing past the postings.
+        self._save_array("postings.npy", postings)
+        self._save_array("doc_lengths.npy", np.array(lengths, dtype=np.int32))
+        write_text_atomic(self.index_dir / "docs.json", json.dumps(docs, ensure_ascii=False))
+        meta = {"version": INDEX_VERSION, "docCount": len(docs), "avgLength": float(np.mean(lengths)) if lengths else 0.0}
+        write_text_atomic(self.index_dir / "lexicon.json", json.dumps({"meta": meta, "terms": lexicon}, ensure_ascii=False))
+        self._postings = self._doc_lengths = self._lexicon = self._docs = None
+
+    def _save_array(self, name: str, array: np.ndarray) -> None:
+        tmp_path = self.index_dir / f".{name}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        tmp_path.replace(self.index_dir / name)
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def _open(self) -> None:
+        if self._lexicon is not None:
+            return
+        lexicon_path = self.index_dir / "lexicon.json"
+        if not lexicon_path.exists():
+            raise FileNotFoundError(f"No index at {self.index_dir}; run `evidence_index.py build` first")
+        with open(lexicon_path, "r", encoding="utf-8") as f:
+            lexicon = json.load(f)
+        self._meta = lexicon["meta"]
+        self._lexicon = lexicon["terms"]
+        self._postings = np.load(self.index_dir / "postings.npy", mmap_mode="r")
+        self._doc_lengths = np.load(self.index_dir / "doc_lengths.npy", mmap_mode="r")
+
+    def _doc(self, doc_id: int) -> Dict[str, Any]:
+        if self._docs is None:
+            with open(self.index_dir / "docs.json", "r", encoding="utf-8") as f:
+                self._docs = json.load(f)
+        return self._docs[doc_id]
+
+    def search(self, query: str, k: int = DEFAULT_K, slug: Optional[str] = None,
+               kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Top-k documents by BM25. Quoted queries additionally require the exact phrase."""
+        self._open()
+        phrase = query.strip('"').lower() if query.startswith('"') and query.endswith('"') else None
+        doc_count = self._meta["docCount"]
+        if not doc_count:
+            return []
+        scores = np.zeros(doc_count, dtype=np.float32)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * np.asarray(self._doc_lengths, dtype=np.float32) / self._meta["avgLength"])
+        for term in set(tokenize(query)):
+            span = self._lexicon.get(term)
+            if span is None:
+                continue
+            postings = self._postings[span[0]:span[1]]
+            doc_ids, tf = postings[:, 0], postings[:, 1].astype(np.float32)
+            df = len(doc_ids)
+            idf = np.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            scores[doc_ids] += idf * tf * (BM25_K1 + 1) / (tf + norm[doc_ids])
+
+        candidates = np.flatnonzero(scores > 0)
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        hits = []
+        for doc_id in candidates:
+            doc = self._doc(int(doc_id))
+            if slug and doc["slug"] != slug:
+                continue
+            if kind and doc["kind"] != kind:
+                continue
+            if phrase and phrase not in doc["text"].lower():
+                continue
+            hits.append({"score": round(float(scores[doc_id]), 4), **doc})
+            if len(hits) >= k:
+                break
+        return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 index over data/evidence")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Create or incrementally update the index")
+    build.add_argument("--file", action="append", help="Only refresh this evidence file (repeatable)")
+    build.add_argument("--full", action="store_true", help="Discard the cache and rebuild from scratch")
+    query = sub.add_parser("query", help="Search the index")
+    query.add_argument("text", help='Query terms; wrap in quotes for an exact phrase, e.g. \'"commercial use"\'')
+    query.add_argument("--k", type=int, default=DEFAULT_K)
+    query.add_argument("--slug", help="Only this tool")
+    query.add_argument("--kind", choices=["fact", "quote", "nugget"])
+    query.add_argument("--json", action="store_true", help="Print hits as JSON")
+    args = parser.parse_args()
+
+    index = EvidenceIndex()
+    if args.command == "build":
+        started = time.perf_counter()
+        result = index.build([Path(p) for p in args.file] if args.file else None, force=args.full)
+        print(f"✅ Index updated in {(time.perf_counter() - started) * 1000:.0f} ms")
+        print(f"   Refreshed: {', '.join(result['refreshed']) or 'none'}")
+        if result["removed"]:
+            print(f"   Removed: {', '.join(result['removed'])}")
+        return
+
+    started = time.perf_counter()
+    hits = index.search(args.text, args.k, resolve_slug(args.slug, fuzzy=True) if args.slug else None, args.kind)
+    elapsed = (time.perf_counter() - started) * 1000
+    if args.json:
+        print(json.dumps(hits, indent=2, ensure_ascii=False))
+        return
+    print(f"🔍 {len(hits)} hits for {args.text!r} in {elapsed:.1f} ms")
+    for hit in hits:
+        print(f"  {hit['score']:6.2f}  [{hit['slug']}/{hit['kind']}] {hit['text'][:140]}")
+        if hit["url"]:
+            print(f"          {hit['url']}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except FileNotFoundError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
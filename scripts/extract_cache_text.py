@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Regenerate the .txt extractions in scripts/cache from the cached .html pages.
+
+Follows the same cleaning rules as cleanHtml() in sync-tools.ts: script, style,
+nav, footer, header, svg, iframe, noscript, form and button elements are dropped,
+as is anything whose class or id mentions nav/footer/header/menu. The first
+<main>/<article>/[role=main] is preferred over the whole body. Unlike the
+cheerio version, block elements become line breaks so words don't run together.
+
+Pages are parsed in a streaming pass (html.parser fed in chunks) across a
+process pool. A manifest keyed by HTML content hash and EXTRACTOR_VERSION skips
+pages that haven't changed since their last extraction.
+
+Usage:
+  python scripts/extract_cache_text.py
+  python scripts/extract_cache_text.py --slugs heygen,pika
+  python scripts/extract_cache_text.py --force
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from tool_store import PROJECT_ROOT, write_text_atomic
+
+CACHE_DIR = PROJECT_ROOT / "scripts" / "cache"
+MANIFEST_PATH = PROJECT_ROOT / ".cache" / "cache-text-manifest.json"
+
+# Bump when the cleaning rules change so every page is re-extracted.
+EXTRACTOR_VERSION = 1
+MAX_TEXT_LENGTH = 50000   # same cap as sync-tools.ts
+TRUNCATION_NOTE = "\n\n[Content truncated due to length limit]"
+READ_CHUNK = 64 * 1024
+
+SKIP_TAGS = {"script", "style", "nav", "footer", "header", "svg", "iframe", "noscript", "form", "button", "template"}
+NOISE_ATTR_RE = re.compile(r"nav|footer|header|menu")
+MAIN_TAGS = {"main", "article"}
+BLOCK_TAGS = {
+    "address", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "figure", "h1", "h2", "h3",
+    "h4", "h5", "h6", "hr", "li", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+INLINE_SPACE_RE = re.compile(r"[ \t\r\f\v ]+")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+class TextExtractor(HTMLParser):
+    """Streaming HTML → text with sync-tools.ts cleaning rules."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.body_parts: List[str] = []
+        self.main_parts: List[str] = []
+        self._skip_tag: Optional[str] = None
+        self._skip_depth = 0
+        self._main_tag: Optional[str] = None
+        self._main_depth = 0
+        self._main_done = False
+
+    def _is_noise(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> bool:
+        if tag in SKIP_TAGS:
+            return True
+        for name, value in attrs:
+            if name in ("class", "id") and value and NOISE_ATTR_RE.search(value):
+                return True
+        return False
+
+    def _emit(self, text: str) -> None:
+        self.body_parts.append(text)
+        if self._main_tag is not None:
+            self.main_parts.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag not in VOID_TAGS and self._is_noise(tag, attrs):
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+        if self._main_tag is None and not self._main_done and (tag in MAIN_TAGS or dict(attrs).get("role") == "main"):
+            self._main_tag, self._main_depth = tag, 1
+        elif tag == self._main_tag:
+            self._main_depth += 1
+        if tag in BLOCK_TAGS:
+            self._emit("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        if self._skip_tag is None and tag in BLOCK_TAGS:
+            self._emit("\n")
+
+    def handle_endtag(self, tag):
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+        if tag in BLOCK_TAGS:
+            self._emit("\n")
+        if tag == self._main_tag:
+            self._main_depth -= 1
+            if self._main_depth == 0:
+                self._main_tag = None
+                self._main_done = True
+
+    def handle_data(self, data):
+        if self._skip_tag is None:
+            self._emit(data)
+
+    def text(self) -> str:
+        parts = self.main_parts if "".join(self.main_parts).strip() else self.body_parts
+        return normalize_whitespace("".join(parts))
+
+
+def normalize_whitespace(text: str) -> str:
+    lines = (INLINE_SPACE_RE.sub(" ", line).strip() for line in text.split("\n"))
+    return BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def html_to_text(html: str) -> str:
+    parser = TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+def extract_file(html_path: Path) -> Tuple[str, bool]:
+    """Stream one cached page through the extractor. Returns (text, truncated)."""
+    parser = TextExtractor()
+    with open(html_path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            parser.feed(chunk)
+    parser.close()
+    text = parser.text()
+    if len(text) > MAX_TEXT_LENGTH:
+        return text[:MAX_TEXT_LENGTH] + TRUNCATION_NOTE, True
+    return text, False
+
+
+def process_page(html_path: str, previous: Optional[Dict[str, Any]], force: bool) -> Dict[str, Any]:
+    """Worker: hash the page, skip it if unchanged, otherwise write its .txt."""
+    path = Path(html_path)
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    txt_path = path.with_suffix(".txt")
+    if (not force and previous and previous.get("htmlSha256") == digest
+            and previous.get("version") == EXTRACTOR_VERSION and txt_path.exists()):
+        return {"path": html_path, "status": "unchanged", "entry": previous}
+
+    text, truncated = extract_file(path)
+    changed = not txt_path.exists() or txt_path.read_text(encoding="utf-8", errors="replace") != text
+    if changed:
+        write_text_atomic(txt_path, text)
+    return {
+        "path": html_path,
+        "status": "written" if changed else "same",
+        "entry": {"version": EXTRACTOR_VERSION, "htmlSha256": digest, "textLength": len(text), "truncated": truncated},
+    }
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {"pages": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def extract_all(cache_dir: Path = CACHE_DIR, manifest_path: Path = MANIFEST_PATH, slugs: Optional[List[str]] = None,
+                force: bool = False, workers: Optional[int] = None) -> Dict[str, List[str]]:
+    manifest = load_manifest(manifest_path)
+    pages = manifest.setdefault("pages", {})
+    dirs = [cache_dir / slug for slug in slugs] if slugs else sorted(p for p in cache_dir.iterdir() if p.is_dir())
+    html_files = sorted(path for d in dirs for path in d.glob("*.html"))
+
+    outcome: Dict[str, List[str]] = {"written": [], "same": [], "unchanged": []}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        keys = [str(path.relative_to(cache_dir)) for path in html_files]
+        futures = [pool.submit(process_page, str(path), pages.get(key), force) for path, key in zip(html_files, keys)]
+        for key, future in zip(keys, futures):
+            result = future.result()
+            pages[key] = result["entry"]
+            outcome[result["status"]].append(key)
+
+    if outcome["written"] or outcome["same"]:
+        manifest["pages"] = dict(sorted(pages.items()))
+        write_text_atomic(manifest_path, json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+    return outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract text from cached HTML pages")
+    parser.add_argument("--slugs", help="Comma-separated cache directories (default: all)")
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR))
+    parser.add_argument("--manifest", default=str(MANIFEST_PATH))
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-extract even if the HTML is unchanged")
+    args = parser.parse_args()
+
+    outcome = extract_all(Path(args.cache_dir), Path(args.manifest),
+                          args.slugs.split(",") if args.slugs else None, args.force, args.workers)
+    for key in outcome["written"]:
+        print(f"  ✓ {key}")
+    print(f"\n✅ Written: {len(outcome['written'])}  Same text: {len(outcome['same'])}  "
+          f"Unchanged HTML: {len(outcome['unchanged'])}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except FileNotFoundError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Extract pricing tiers from rendered DOM captures.
+
+data/runtime-captures/<tool>/ holds rendered_dom_initial.html and, when the
+page has a monthly/annual switch, rendered_dom_toggled.html. Each capture is
+streamed through html.parser into a tree of visible text only (scripts, styles
+and hidden nodes are dropped as they arrive), so memory stays proportional to
+the page's text rather than its markup. Pricing cards are found as the sibling
+elements that each carry a price, and every card becomes a tier in the shape
+PRICING_DATA uses in update_pricing.py:
+
+  {"name": "Creator", "monthly": "$29/mo", "annual": "$290/yr", "key_features": [...]}
+
+Monthly and annual prices are paired across the two captures: the variant that
+says "billed yearly" supplies the annual price, the other the monthly one.
+Captures are processed in a process pool, one tool per task.
+
+Usage:
+  python scripts/extract_pricing_dom.py
+  python scripts/extract_pricing_dom.py --slugs pika,descript --out _audit/pricing-dom/tiers.json
+"""
+
+import argparse
+import json
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from tool_store import PROJECT_ROOT
+
+CAPTURES_DIR = PROJECT_ROOT / "data" / "runtime-captures"
+VARIANTS = ("initial", "toggled")
+READ_CHUNK = 64 * 1024
+MAX_FEATURES = 5
+
+INVISIBLE_TAGS = {"head", "script", "style", "svg", "noscript", "template", "iframe"}
+INLINE_TAGS = {"a", "abbr", "b", "bdi", "del", "em", "i", "ins", "label", "mark", "s", "small", "span", "strong", "sub", "sup", "u"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+HIDDEN_CLASSES = {"w-condition-invisible"}
+DISPLAY_NONE_RE = re.compile(r"display\s*:\s*none")
+
+AMOUNT_RE = re.compile(r"\$\s*(\d[\d,]*(?:\.\d+)?)")
+MAX_PRICE_LINE = 24          # "$29/mo", "$8 / month" — longer lines are prose that mentions a price
+YEARLY_RE = re.compile(r"billed (?:yearly|annually)|per year|/\s?(?:yr|year)\b", re.IGNORECASE)
+PERIOD_RE = re.compile(r"^(?:/|per\b)", re.IGNORECASE)
+FREE_LABELS = {"free", "$0", "free forever"}
+CUSTOM_LABELS = {"custom", "custom pricing", "let's talk.", "let’s talk.", "contact sales", "contact us"}
+BADGE_LABELS = {"most popular", "best value", "popular", "recommended", "for teams", "new", "save", "best deal"}
+CTA_RE = re.compile(
+    r"^(?:get started|sign up|sign in|try|buy|start|book|contact|see all|learn more|compare|subscribe|upgrade|"
+    r"choose|select|pay yearly|pay monthly|what you get|what are|no credit card)",
+    re.IGNORECASE,
+)
+
+
+# ----------------------------------------------------------------------
+# Streaming visible-text tree
+# ----------------------------------------------------------------------
+
+class Node:
+    __slots__ = ("tag", "children", "lines")
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.children: List["Node"] = []
+        self.lines: List[str] = []   # direct text, in order, interleaved with children via "\0<index>"
+
+    def _pieces(self) -> Iterator[Optional[str]]:
+        """Text pieces in document order; None marks a block boundary."""
+        block = self.tag not in INLINE_TAGS
+        if block:
+            yield None
+        for line in self.lines:
+            if line.startswith("\0"):
+                yield from self.children[int(line[1:])]._pieces()
+            else:
+                yield line
+        if block:
+            yield None
+
+    def iter_lines(self) -> Iterator[str]:
+        """Visible lines; inline elements (e.g. <span>$</span><span>29</span>) join their block's line."""
+        buffer: List[str] = []
+        for piece in self._pieces():
+            if piece is not None:
+                buffer.append(piece)
+            elif buffer:
+                yield " ".join(buffer)
+                buffer = []
+        if buffer:
+            yield " ".join(buffer)
+
+
+class VisibleTreeBuilder(HTMLParser):
+    """Builds a Node tree holding only visible, non-empty text."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("root")
+        self._stack: List[Node] = [self.root]
+        self._skip_tag: Optional[str] = None
+        self._skip_depth = 0
+
+    def _hidden(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> bool:
+        if tag in INVISIBLE_TAGS:
+            return True
+        for name, value in attrs:
+            if name == "hidden":
+                return True
+            if name == "class" and value and HIDDEN_CLASSES.intersection(value.split()):
+                return True
+            if name == "style" and value and DISPLAY_NONE_RE.search(value):
+                return True
+        return False
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag in VOID_TAGS:
+            return
+        if self._hidden(tag, attrs):
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+        node = Node(tag)
+        parent = self._stack[-1]
+        parent.lines.append(f"\0{len(parent.children)}")
+        parent.children.append(node)
+        self._stack.append(node)
+
+    def handle_endtag(self, tag):
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+        # Close up to the matching open tag; stray end tags are ignored.
+        for depth in range(len(self._stack) - 1, 0, -1):
+            if self._stack[depth].tag == tag:
+                del self._stack[depth:]
+                break
+
+    def handle_data(self, data):
+        if self._skip_tag is None:
+            text = " ".join(data.split())
+            if text:
+                self._stack[-1].lines.append(text)
+
+
+def parse_capture(path: Path) -> Node:
+    builder = VisibleTreeBuilder()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            builder.feed(chunk)
+    builder.close()
+    return builder.root
+
+
+# ----------------------------------------------------------------------
+# Card detection
+# ----------------------------------------------------------------------
+
+def is_price_line(line: str) -> bool:
+    lower = line.lower()
+    if lower in FREE_LABELS or lower in CUSTOM_LABELS:
+        return True
+    return len(line) <= MAX_PRICE_LINE and AMOUNT_RE.search(line) is not None
+
+
+def find_cards(root: Node) -> List[List[str]]:
+    """
+    Text lines of each pricing card. Cards are the priced, named children of the
+    element with the most such children (earliest wins on ties, so the card grid
+    beats the comparison table further down the page).
+    """
+    best: List[List[str]] = []
+
+    def visit(node: Node) -> bool:
+        nonlocal best
+        priced_children = [child for child in node.children if visit(child)]
+        if len(priced_children) >= 2 and len(priced_children) > len(best):
+            cards = [lines for lines in (list(child.iter_lines()) for child in priced_children)
+                     if card_name(lines) is not None]
+            if len(cards) >= 2 and len(cards) > len(best):
+                best = cards
+        return bool(priced_children) or any(is_price_line(line) for line in node.iter_lines())
+
+    visit(root)
+    return best
+
+
+# ----------------------------------------------------------------------
+# Card → tier
+# ----------------------------------------------------------------------
+
+def format_amount(value: float) -> str:
+    return f"${value:,.2f}".replace(".00", "")
+
+
+def is_label_line(line: str) -> bool:
+    """Prices, billing periods and badges: never a tier name or feature."""
+    lower = line.lower()
+    return (is_price_line(line) or PERIOD_RE.match(line) is not None or YEARLY_RE.search(line) is not None
+            or lower.startswith(("billed", "save ", "-")) or lower in BADGE_LABELS)
+
+
+def is_name_line(line: str) -> bool:
+    return line[0].isalpha() and len(line) <= 30 and len(line.split()) <= 3
+
+
+def card_name(lines: List[str]) -> Optional[str]:
+    """First line that reads like a plan name; it must come within the card's opening lines."""
+    for line in lines[:8]:
+        if not is_label_line(line):
+            return line if is_name_line(line) else None
+    return None
+
+
+def parse_card(lines: List[str]) -> Dict[str, Any]:
+    """Name, price view and features of one card, before monthly/annual pairing."""
+    lowered = [line.lower() for line in lines]
+    custom = any(line in CUSTOM_LABELS for line in lowered)
+    amounts = [float(m.group(1).replace(",", "")) for line in lines
+               if len(line) <= MAX_PRICE_LINE for m in [AMOUNT_RE.search(line)] if m]
+    free = not custom and (any(line in FREE_LABELS for line in lowered) and not any(a > 0 for a in amounts))
+    yearly = any(YEARLY_RE.search(line) for line in lines)
+
+    name = None
+    features: List[str] = []
+    for line in lines:
+        if is_label_line(line):
+            continue
+        if name is None:
+            if is_name_line(line):
+                name = line
+            continue
+        if CTA_RE.match(line) or line.endswith((":", "?")) or len(line) > 140 or line in features:
+            continue
+        features.append(line)
+
+    return {
+        "name": name,
+        "custom": custom,
+        "free": free or (bool(amounts) and max(amounts) == 0),
+        "yearly": yearly,
+        "amounts": sorted(set(a for a in amounts if a > 0)),
+        "features": features,
+    }
+
+
+def build_tier(views: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge the same card seen in one or two captures into an update_pricing tier."""
+    first = views[0]
+    tier: Dict[str, Any] = {"name": first["name"], "monthly": None, "annual": None}
+    if first["custom"]:
+        tier["monthly"] = tier["annual"] = "Custom"
+    elif first["free"]:
+        tier["monthly"] = "Free"
+    else:
+        monthly: Optional[float] = None
+        annual_per_month: Optional[float] = None
+        for view in views:
+            if not view["amounts"]:
+                continue
+            if len(view["amounts"]) >= 2 and not view["yearly"]:
+                # Both prices on one card: the discounted one is the annual rate.
+                annual_per_month = annual_per_month or view["amounts"][0]
+                monthly = monthly or view["amounts"][-1]
+            elif view["yearly"]:
+                annual_per_month = annual_per_month or view["amounts"][0]
+            else:
+                monthly = monthly or view["amounts"][0]
+        if monthly is not None:
+            tier["monthly"] = f"{format_amount(monthly)}/mo"
+        if annual_per_month is not None:
+            tier["annual"] = f"{format_amount(annual_per_month * 12)}/yr"
+    tier["key_features"] = first["features"][:MAX_FEATURES]
+    return tier
+
+
+def price_value(price: Optional[str]) -> Optional[float]:
+    match = AMOUNT_RE.search(price) if price else None
+    return float(match.group(1).replace(",", "")) if match else None
+
+
+def starting_price(tiers: List[Dict[str, Any]]) -> Optional[str]:
+    """Cheapest paid monthly price; falls back to the annual rate per month when only that was captured."""
+    monthly = [price_value(tier["monthly"]) for tier in tiers]
+    monthly = [value for value in monthly if value]
+    if monthly:
+        return f"{format_amount(min(monthly))}/mo"
+    annual = [price_value(tier["annual"]) for tier in tiers]
+    annual = [value for value in annual if value]
+    return f"{format_amount(min(annual) / 12)}/mo" if annual else None
+
+
+def extract_tool(capture_dir: str) -> Dict[str, Any]:
+    """Worker: parse every variant of one tool's capture and pair its cards into tiers."""
+    directory = Path(capture_dir)
+    order: List[str] = []
+    views: Dict[str, List[Dict[str, Any]]] = {}
+    variants = []
+    for variant in VARIANTS:
+        path = directory / f"rendered_dom_{variant}.html"
+        if not path.exists():
+            continue
+        variants.append(variant)
+        for lines in find_cards(parse_capture(path)):
+            card = parse_card(lines)
+            if not card["name"]:
+                continue
+            key = card["name"].lower()
+            if key not in views:
+                order.append(key)
+                views[key] = []
+            views[key].append(card)
+
+    tiers = [build_tier(views[key]) for key in order]
+    free_tier = next((tier for tier in tiers if tier["monthly"] == "Free"), None)
+    return {
+        "slug": directory.name,
+        "variants": variants,
+        "pricing": {
+            "free_plan": {
+                "exists": free_tier is not None,
+                "details": ", ".join(free_tier["key_features"][:3]) if free_tier else None,
+            },
+            "starting_price": starting_price(tiers),
+            "tiers": tiers,
+        },
+    }
+
+
+def extract_all(captures_dir: Path = CAPTURES_DIR, slugs: Optional[List[str]] = None,
+                workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Yield one result per tool as workers finish; only a worker's own capture is ever in memory."""
+    dirs = [captures_dir / slug for slug in slugs] if slugs else sorted(
+        d for d in captures_dir.iterdir() if (d / "rendered_dom_initial.html").exists()
+    )
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(extract_tool, [str(d) for d in dirs])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract pricing tiers from rendered DOM captures")
+    parser.add_argument("--slugs", help="Comma-separated capture directories (default: all)")
+    parser.add_argument("--captures-dir", default=str(CAPTURES_DIR))
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--out", help="Write {slug: pricing} JSON to this path")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {}
+    for result in extract_all(Path(args.captures_dir), args.slugs.split(",") if args.slugs else None, args.workers):
+        pricing = result["pricing"]
+        results[result["slug"]] = pricing
+        print(f"💰 {result['slug']} ({'+'.join(result['variants'])}): {len(pricing['tiers'])} tiers, "
+              f"starting {pricing['starting_price'] or 'n/a'}")
+        for tier in pricing["tiers"]:
+            print(f"   {tier['name']:<12} monthly={tier['monthly']}  annual={tier['annual']}")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"📁 Tiers written to {out_path}")
+    if not results:
+        print("⚠ No captures found")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Fetch tool logos once and serve optimized local copies instead of remote Clearbit URLs.
+
+Pipeline:
+1. Fetch every logo concurrently (thread pool) with conditional requests
+   (If-None-Match / If-Modified-Since from the previous run's manifest).
+2. Hand changed images to a process pool that resizes them and encodes
+   WebP (and AVIF when Pillow supports it) variants.
+3. Write variants under public/logos/optimized/ plus manifest.json.
+
+Unchanged logos (HTTP 304, or identical bytes) are skipped entirely.
+
+Usage:
+  python scripts/fetch_logos.py
+  python scripts/fetch_logos.py --slugs heygen,pika --force
+  python scripts/fetch_logos.py --base-url http://127.0.0.1:8765   # local stub image server
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from slug_registry import resolve_slug_list
+from tool_store import ToolStore, write_text_atomic
+from update_data import CLEARBIT_LOGO_BASE, OPTIMIZED_LOGO_DIR, OPTIMIZED_LOGO_MANIFEST, get_clearbit_logo_url
+
+OUTPUT_DIR = OPTIMIZED_LOGO_DIR
+MANIFEST_FILENAME = OPTIMIZED_LOGO_MANIFEST
+VARIANT_SIZES = (64, 128, 256)
+FETCH_WORKERS = 8
+FETCH_TIMEOUT = 15  # seconds
+
+
+def avif_supported() -> bool:
+    """Pillow >= 11.3 ships AVIF; older installs need the pillow-avif-plugin."""
+    try:
+        from PIL import features
+        if features.check("avif"):
+            return True
+    except Exception:
+        pass
+    try:
+        import pillow_avif  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def load_manifest(out_dir: Path) -> Dict[str, Any]:
+    path = out_dir / MANIFEST_FILENAME
+    if not path.exists():
+        return {"logos": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def expected_variants(slug: str, formats: Tuple[str, ...]) -> List[str]:
+    return [f"{slug}-{size}.{fmt}" for size in VARIANT_SIZES for fmt in formats]
+
+
+# ----------------------------------------------------------------------
+# Fetch (threads, I/O bound)
+# ----------------------------------------------------------------------
+
+def fetch_logo(slug: str, url: str, previous: Optional[Dict[str, Any]], conditional: bool) -> Dict[str, Any]:
+    """Fetch one logo. Returns status 'unchanged', 'fetched' or 'failed'."""
+    headers = {"User-Agent": "best-ai-video-logo-fetcher/1.0"}
+    if conditional and previous:
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("lastModified"):
+            headers["If-Modified-Since"] = previous["lastModified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=FETCH_TIMEOUT)
+    except requests.RequestException as e:
+        return {"slug": slug, "status": "failed", "error": str(e)}
+
+    if response.status_code == 304:
+        return {"slug": slug, "status": "unchanged"}
+    if response.status_code != 200:
+        return {"slug": slug, "status": "failed", "error": f"HTTP {response.status_code}"}
+
+    data = response.content
+    digest = hashlib.sha256(data).hexdigest()
+    result = {
+        "slug": slug,
+        "status": "fetched",
+        "data": data,
+        "sha256": digest,
+        "etag": response.headers.get("ETag"),
+        "lastModified": response.headers.get("Last-Modified"),
+    }
+    if conditional and previous and previous.get("sha256") == digest:
+        # Server ignored the validators but the bytes are the same.
+        result["status"] = "unchanged"
+        result.pop("data")
+    return result
+
+
+# ----------------------------------------------------------------------
+# Encode (processes, CPU bound)
+# ----------------------------------------------------------------------
+
+def encode_variants(slug: str, data: bytes, out_dir: str, formats: Tuple[str, ...]) -> Dict[str, Any]:
+    """Resize one logo to every VARIANT_SIZES box and encode each requested format."""
+    from PIL import Image
+
+    if "avif" in formats:
+        try:
+            import pillow_avif  # noqa: F401
+        except ImportError:
+            pass
+
+    source = Image.open(io.BytesIO(data))
+    source.load()
+    source = source.convert("RGBA")
+
+    variants = []
+    for size in VARIANT_SIZES:
+        image = source.copy()
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            filename = f"{slug}-{size}.{fmt}"
+            buffer = io.BytesIO()
+            if fmt == "webp":
+                image.save(buffer, format="WEBP", quality=85, method=6)
+            else:
+                image.save(buffer, format="AVIF", quality=60)
+            payload = buffer.getvalue()
+            (Path(out_dir) / filename).write_bytes(payload)
+            variants.append({
+                "file": filename,
+                "format": fmt,
+                "width": image.width,
+                "height": image.height,
+                "bytes": len(payload),
+            })
+
+    return {"slug": slug, "source": {"width": source.width, "height": source.height}, "variants": variants}
+
+
+# ----------------------------------------------------------------------
+# Pipeline
+# ----------------------------------------------------------------------
+
+def run_pipeline(
+    tools: List[Dict[str, Any]],
+    out_dir: Path = OUTPUT_DIR,
+    base_url: str = CLEARBIT_LOGO_BASE,
+    force: bool = False,
+    workers: int = FETCH_WORKERS,
+) -> Dict[str, List[str]]:
+    """Fetch + encode logos for `tools`; returns slugs grouped by outcome."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    logos = manifest.setdefault("logos", {})
+    formats: Tuple[str, ...] = ("webp", "avif") if avif_supported() else ("webp",)
+    manifest["formats"] = list(formats)
+    manifest["sizes"] = list(VARIANT_SIZES)
+
+    outcome: Dict[str, List[str]] = {"encoded": [], "unchanged": [], "failed": []}
+    manifest_dirty = False
+
+    def needs_full_fetch(slug: str) -> bool:
+        # Conditional requests are only safe when every expected variant is on disk.
+        previous = logos.get(slug)
+        if force or not previous:
+            return True
+        have = {variant["file"] for variant in previous.get("variants", [])}
+        return not all(name in have and (out_dir / name).exists() for name in expected_variants(slug, formats))
+
+    with ThreadPoolExecutor(max_workers=workers) as fetch_pool, ProcessPoolExecutor() as encode_pool:
+        fetches = {}
+        for tool in tools:
+            slug = tool["slug"]
+            url = get_clearbit_logo_url(tool["name"], base_url=base_url)
+            future = fetch_pool.submit(fetch_logo, slug, url, logos.get(slug), not needs_full_fetch(slug))
+            fetches[future] = (slug, url)
+
+        encodes = {}
+        for future in as_completed(fetches):
+            slug, url = fetches[future]
+            result = future.result()
+            if result["status"] == "failed":
+                print(f"  ✗ {slug}: {result['error']} ({url})")
+                outcome["failed"].append(slug)
+            elif result["status"] == "unchanged":
+                print(f"  ✓ {slug}: unchanged")
+                outcome["unchanged"].append(slug)
+                if result.get("etag") or result.get("lastModified"):
+                    # Same bytes under new validators: keep them for the next conditional request.
+                    logos[slug]["etag"] = result.get("etag")
+                    logos[slug]["lastModified"] = result.get("lastModified")
+                    manifest_dirty = True
+            else:
+                # Encoding starts while other fetches are still in flight.
+                encode_future = encode_pool.submit(encode_variants, slug, result.pop("data"), str(out_dir), formats)
+                encodes[encode_future] = (slug, url, result)
+
+        for future in as_completed(encodes):
+            slug, url, result = encodes[future]
+            try:
+                encoded = future.result()
+            except Exception as e:
+                print(f"  ✗ {slug}: could not decode image ({e})")
+                outcome["failed"].append(slug)
+                continue
+            logos[slug] = {
+                "sourceUrl": url,
+                "sha256": result["sha256"],
+                "etag": result["etag"],
+                "lastModified": result["lastModified"],
+                "source": encoded["source"],
+                "variants": encoded["variants"],
+            }
+            print(f"  ✓ {slug}: encoded {len(encoded['variants'])} variants")
+            outcome["encoded"].append(slug)
+            manifest_dirty = True
+
+    if manifest_dirty:
+        manifest["logos"] = dict(sorted(logos.items()))
+        write_text_atomic(out_dir / MANIFEST_FILENAME, json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+    return outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch and optimize tool logos")
+    parser.add_argument("--slugs", help="Comma-separated slugs (default: whole catalog)")
+    parser.add_argument("--base-url", default=CLEARBIT_LOGO_BASE, help="Logo API base URL (point at a stub server for tests)")
+    parser.add_argument("--out-dir", default=str(OUTPUT_DIR))
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS)
+    parser.add_argument("--force", action="store_true", help="Ignore ETag/Last-Modified and re-encode everything")
+    args = parser.parse_args()
+
+    store = ToolStore()
+    slugs = resolve_slug_list(args.slugs)
+    tools = store.load_tools(slugs)
+
+    print(f"🎨 Fetching {len(tools)} logos from {args.base_url}")
+    outcome = run_pipeline(tools, Path(args.out_dir), args.base_url, args.force, args.workers)
+
+    print(f"\n✅ Encoded: {len(outcome['encoded'])}  Unchanged: {len(outcome['unchanged'])}  Failed: {len(outcome['failed'])}")
+    print(f"📁 Output: {args.out_dir}")
+    if outcome["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
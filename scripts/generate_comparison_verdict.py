@@ -4,8 +4,11 @@ Generate biased comparison verdicts for affiliate tools.
 This script demonstrates how to create verdict content that prioritizes affiliate tools.
 """
 
+import argparse
+import hashlib
 import json
 import os
+from string import Template
 from typing import Dict, List, Optional, Tuple
 
 # Define affiliate tools and their superpowers
@@ -56,181 +59,348 @@ def get_affiliate_info(slug: str) -> Optional[Dict]:
     """Get affiliate tool information."""
     return AFFILIATE_TOOLS.get(slug.lower())
 
-def calculate_biased_scores(tool_a: Dict, tool_b: Dict) -> Tuple[Dict, Dict]:
+def tool_scores(tool: Dict) -> Dict[str, float]:
     """
-    Calculate scores with affiliate bias.
-    Affiliate tools get boosted scores in their key metric.
+    Scores for a single tool, with affiliate bias applied.
+    Only depends on the tool itself, so it can be computed once per tool.
     """
-    scores_a = {
-        'quality': float(tool_a.get('rating', 4.5)) * 2,
+    rating = float(tool.get('rating', 4.5))
+    scores = {
+        'quality': rating * 2,
         'speed': 7.5,
-        'ease': float(tool_a.get('rating', 4.5)) * 1.5,
+        'ease': rating * 1.5,
         'value': 7.0
     }
     
-    scores_b = {
-        'quality': float(tool_b.get('rating', 4.5)) * 2,
-        'speed': 7.5,
-        'ease': float(tool_b.get('rating', 4.5)) * 1.5,
-        'value': 7.0
-    }
+    affiliate = get_affiliate_info(tool.get('slug', ''))
+    if affiliate:
+        key_metric = affiliate['key_metric']
+        scores[key_metric] = max(9.5, scores[key_metric])  # Ensure minimum 9.5
     
-    # Apply affiliate bias
-    affiliate_a = get_affiliate_info(tool_a.get('slug', ''))
-    affiliate_b = get_affiliate_info(tool_b.get('slug', ''))
+    return scores
+
+def calculate_biased_scores(tool_a: Dict, tool_b: Dict) -> Tuple[Dict, Dict]:
+    """
+    Calculate scores with affiliate bias.
+    Affiliate tools get boosted scores in their key metric.
+    """
+    return tool_scores(tool_a), tool_scores(tool_b)
+
+# Verdict templates, compiled once.
+# Pivot: 'While [Tool B] wins on [Feature], [Tool A] is the smarter choice for [User Persona] because it offers [Superpower].'
+PIVOT_TEMPLATE = Template(
+    "While ${loser} wins on ${loser_strength}, "
+    "${winner} is the smarter choice for ${persona} "
+    "because it offers ${superpower}. "
+    "${winner} excels at ${strength}, "
+    "making it the better investment for most users."
+)
+BOTH_AFFILIATE_TEMPLATE = Template(
+    "Both tools are excellent choices, but ${winner} takes the edge for "
+    "${persona} due to its ${superpower}. "
+    "While ${loser} offers ${loser_superpower}, "
+    "${winner} provides better ${strength} for most use cases."
+)
+NEUTRAL_TEMPLATE = Template(
+    "For quality-focused projects, ${quality_winner} delivers superior results. "
+    "For budget-conscious users, ${price_winner} offers better value. "
+    "Choose based on your primary need: quality or affordability."
+)
+
+# Bump when scoring/winner logic changes so every stored comparison is treated as stale.
+RENDER_VERSION = 1
+TEMPLATE_FINGERPRINT = hashlib.sha256(
+    "\x00".join([str(RENDER_VERSION), PIVOT_TEMPLATE.template, BOTH_AFFILIATE_TEMPLATE.template,
+                  NEUTRAL_TEMPLATE.template]).encode('utf-8')
+).hexdigest()
+
+_MISSING = object()
+
+class FieldRecorder:
+    """Read-only view of a tool dict that records which fields were read, and their values."""
+    
+    def __init__(self, tool: Dict):
+        self._tool = tool
+        self.reads: Dict[str, list] = {}
     
-    if affiliate_a:
-        key_metric = affiliate_a['key_metric']
-        scores_a[key_metric] = max(9.5, scores_a[key_metric])  # Ensure minimum 9.5
+    def _record(self, key: str):
+        value = self._tool.get(key, _MISSING)
+        self.reads[key] = [False, None] if value is _MISSING else [True, value]
+        return value
     
-    if affiliate_b:
-        key_metric = affiliate_b['key_metric']
-        scores_b[key_metric] = max(9.5, scores_b[key_metric])  # Ensure minimum 9.5
+    def get(self, key: str, default=None):
+        value = self._record(key)
+        return default if value is _MISSING else value
     
-    return scores_a, scores_b
+    def __getitem__(self, key: str):
+        value = self._record(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key: str) -> bool:
+        self._record(key)
+        return key in self._tool
 
-def generate_verdict(tool_a: Dict, tool_b: Dict) -> str:
+def _sign(delta: float) -> int:
+    return (delta > 0) - (delta < 0)
+
+def _parse_verdict_price(raw: str) -> Optional[float]:
+    try:
+        return float(raw.replace('$', '').replace('/mo', ''))
+    except ValueError:
+        return None
+
+def _parse_content_price(raw: str) -> Optional[float]:
+    try:
+        return float(raw.replace('$', '').replace('/mo', '').split()[0])
+    except (ValueError, IndexError):
+        return None
+
+def _require(price: Optional[float], raw: str) -> float:
+    # Unparseable prices only fail for the comparisons that actually need them
+    return float(raw) if price is None else price
+
+class ToolFragments:
+    """Everything a verdict needs from one tool, extracted once."""
+    
+    __slots__ = ('slug', 'name', 'affiliate', 'scores', 'strength_lower',
+                 'verdict_price_raw', 'verdict_price', 'content_price_raw', 'content_price',
+                 'reads', '_fingerprint')
+    
+    def __init__(self, tool: Dict):
+        tool = FieldRecorder(tool)
+        self.slug = tool.get('slug', '')
+        self.name = tool.get('name')
+        self.affiliate = get_affiliate_info(self.slug)
+        self.scores = tool_scores(tool)
+        pros = tool.get('pros')
+        self.strength_lower = pros[0].lower() if pros else None
+        self.verdict_price_raw = tool.get('starting_price', '999')
+        self.verdict_price = _parse_verdict_price(self.verdict_price_raw)
+        self.content_price_raw = tool.get('starting_price', '$999/mo')
+        self.content_price = _parse_content_price(self.content_price_raw)
+        # Exactly the tool fields the verdict depends on: {field: [present, value]}
+        self.reads = tool.reads
+        self._fingerprint: Optional[str] = None
+    
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the fields read plus the affiliate entry; unchanged fingerprint means unchanged output."""
+        if self._fingerprint is None:
+            payload = json.dumps({'fields': self.reads, 'affiliate': self.affiliate},
+                                 sort_keys=True, ensure_ascii=False)
+            self._fingerprint = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return self._fingerprint
+    
+    def display_name(self, fallback: str) -> str:
+        return self.name if self.name is not None else fallback
+    
+    def strength(self, fallback_name: str) -> str:
+        if self.strength_lower is not None:
+            return self.strength_lower
+        return f"{self.display_name(fallback_name)} has better features".lower()
+
+def pair_fingerprint(a: ToolFragments, b: ToolFragments) -> str:
+    """Fingerprint of the A-vs-B comparison: both tools' read fields plus the templates."""
+    return hashlib.sha256(f"{TEMPLATE_FINGERPRINT}:{a.fingerprint}:{b.fingerprint}".encode('utf-8')).hexdigest()
+
+class PairComparison:
     """
-    Generate a biased verdict using the pivot logic.
-    Template: 'While [Tool B] wins on [Feature], [Tool A] is the smarter choice for [User Persona] because it offers [Superpower].'
+    Comparison of an unordered pair, stored as signed results for (x, y).
+    Either orientation can be rendered from it; ties go to the second-listed tool,
+    exactly like the original A-vs-B code.
     """
-    affiliate_a = get_affiliate_info(tool_a.get('slug', ''))
-    affiliate_b = get_affiliate_info(tool_b.get('slug', ''))
+    
+    __slots__ = ('x', 'y', 'quality', 'speed', 'ease', 'key_metric', '_verdict_price', '_content_price')
+    
+    def __init__(self, x: ToolFragments, y: ToolFragments):
+        self.x = x
+        self.y = y
+        self.quality = _sign(x.scores['quality'] - y.scores['quality'])
+        self.speed = _sign(x.scores['speed'] - y.scores['speed'])
+        self.ease = _sign(x.scores['ease'] - y.scores['ease'])
+        self.key_metric = 0
+        if x.affiliate and y.affiliate:
+            self.key_metric = _sign(x.scores[x.affiliate['key_metric']] - y.scores[y.affiliate['key_metric']])
+        self._verdict_price: Optional[int] = None
+        self._content_price: Optional[int] = None
+    
+    def verdict_price(self) -> int:
+        if self._verdict_price is None:
+            self._verdict_price = _sign(_require(self.x.verdict_price, self.x.verdict_price_raw)
+                                        - _require(self.y.verdict_price, self.y.verdict_price_raw))
+        return self._verdict_price
+    
+    def content_price(self) -> int:
+        if self._content_price is None:
+            self._content_price = _sign(_require(self.x.content_price, self.x.content_price_raw)
+                                        - _require(self.y.content_price, self.y.content_price_raw))
+        return self._content_price
+
+class VerdictEngine:
+    """
+    Renders verdicts and comparison content for many pairs.
+    Tool fragments are built once per tool and comparisons once per unordered pair,
+    so A-vs-B and B-vs-A share the work.
+    """
+    
+    def __init__(self, tools_data: List[Dict]):
+        self._tools = {t.get('slug'): t for t in tools_data}
+        self._fragments: Dict[str, ToolFragments] = {}
+        self._pairs: Dict[Tuple[str, str], PairComparison] = {}
+    
+    def fragments(self, slug: str) -> ToolFragments:
+        fragments = self._fragments.get(slug)
+        if fragments is None:
+            tool = self._tools.get(slug)
+            if tool is None:
+                raise KeyError(slug)
+            fragments = self._fragments[slug] = ToolFragments(tool)
+        return fragments
+    
+    def pair(self, slug_a: str, slug_b: str) -> Tuple[PairComparison, bool]:
+        """Memoized comparison for the unordered pair, plus whether slug_a is its x side."""
+        a_first = slug_a <= slug_b
+        key = (slug_a, slug_b) if a_first else (slug_b, slug_a)
+        comparison = self._pairs.get(key)
+        if comparison is None:
+            comparison = self._pairs[key] = PairComparison(self.fragments(key[0]), self.fragments(key[1]))
+        return comparison, a_first
+    
+    def verdict(self, slug_a: str, slug_b: str) -> str:
+        try:
+            comparison, a_first = self.pair(slug_a, slug_b)
+        except KeyError:
+            raise ValueError(f"Tool not found: {slug_a} or {slug_b}")
+        return render_verdict(comparison, a_first)
+    
+    def comparison_content(self, slug_a: str, slug_b: str) -> Dict:
+        try:
+            comparison, a_first = self.pair(slug_a, slug_b)
+        except KeyError:
+            raise ValueError(f"Tool not found: {slug_a} or {slug_b}")
+        return render_comparison_content(comparison, a_first)
+    
+    def iter_all_comparisons(self, slugs: Optional[List[str]] = None):
+        """Yield (slug_a, slug_b, content) for every ordered pair; each unordered pair is compared once."""
+        slugs = list(self._tools) if slugs is None else slugs
+        for i, slug_x in enumerate(slugs):
+            for slug_y in slugs[i + 1:]:
+                comparison, x_first = self.pair(slug_x, slug_y)
+                try:
+                    forward = render_comparison_content(comparison, x_first)
+                    reverse = render_comparison_content(comparison, not x_first)
+                except ValueError as e:
+                    print(f"⚠️  Skipped {slug_x} vs {slug_y}: {e}")
+                    continue
+                yield slug_x, slug_y, forward
+                yield slug_y, slug_x, reverse
+
+def _oriented(comparison: PairComparison, a_first: bool) -> Tuple[ToolFragments, ToolFragments]:
+    return (comparison.x, comparison.y) if a_first else (comparison.y, comparison.x)
+
+def _a_wins_higher(result: int, a_first: bool) -> bool:
+    # Original rule: tool A wins iff score_a > score_b
+    return result > 0 if a_first else result < 0
+
+def _a_wins_lower(result: int, a_first: bool) -> bool:
+    # Original rule: tool A wins iff price_a < price_b
+    return result < 0 if a_first else result > 0
+
+def render_verdict(comparison: PairComparison, a_first: bool) -> str:
+    a, b = _oriented(comparison, a_first)
     
     # Pivot Logic: If one tool is affiliate, make it the winner
-    if affiliate_a and not affiliate_b:
-        # Tool A is affiliate, Tool B is not
-        tool_b_strength = tool_b.get('pros', ['better features'])[0] if tool_b.get('pros') else f"{tool_b.get('name', 'Tool B')} has better features"
-        
-        verdict = (
-            f"While {tool_b.get('name', 'Tool B')} wins on {tool_b_strength.lower()}, "
-            f"{tool_a.get('name', 'Tool A')} is the smarter choice for {affiliate_a['user_persona']} "
-            f"because it offers {affiliate_a['superpower']}. "
-            f"{tool_a.get('name', 'Tool A')} excels at {affiliate_a['strength']}, "
-            f"making it the better investment for most users."
+    if a.affiliate and not b.affiliate:
+        return PIVOT_TEMPLATE.substitute(
+            loser=b.display_name('Tool B'), loser_strength=b.strength('Tool B'),
+            winner=a.display_name('Tool A'), persona=a.affiliate['user_persona'],
+            superpower=a.affiliate['superpower'], strength=a.affiliate['strength'],
         )
-        return verdict
-    
-    elif affiliate_b and not affiliate_a:
-        # Tool B is affiliate, Tool A is not
-        tool_a_strength = tool_a.get('pros', ['better features'])[0] if tool_a.get('pros') else f"{tool_a.get('name', 'Tool A')} has better features"
-        
-        verdict = (
-            f"While {tool_a.get('name', 'Tool A')} wins on {tool_a_strength.lower()}, "
-            f"{tool_b.get('name', 'Tool B')} is the smarter choice for {affiliate_b['user_persona']} "
-            f"because it offers {affiliate_b['superpower']}. "
-            f"{tool_b.get('name', 'Tool B')} excels at {affiliate_b['strength']}, "
-            f"making it the better investment for most users."
+    
+    if b.affiliate and not a.affiliate:
+        return PIVOT_TEMPLATE.substitute(
+            loser=a.display_name('Tool A'), loser_strength=a.strength('Tool A'),
+            winner=b.display_name('Tool B'), persona=b.affiliate['user_persona'],
+            superpower=b.affiliate['superpower'], strength=b.affiliate['strength'],
         )
-        return verdict
     
-    elif affiliate_a and affiliate_b:
+    if a.affiliate and b.affiliate:
         # Both are affiliate tools - compare their superpowers
-        scores_a, scores_b = calculate_biased_scores(tool_a, tool_b)
-        
-        # Determine overall winner based on key metrics
-        if scores_a[affiliate_a['key_metric']] > scores_b[affiliate_b['key_metric']]:
-            winner = tool_a
-            winner_affiliate = affiliate_a
-            loser = tool_b
-            loser_affiliate = affiliate_b
-        else:
-            winner = tool_b
-            winner_affiliate = affiliate_b
-            loser = tool_a
-            loser_affiliate = affiliate_a
-        
-        verdict = (
-            f"Both tools are excellent choices, but {winner.get('name')} takes the edge for "
-            f"{winner_affiliate['user_persona']} due to its {winner_affiliate['superpower']}. "
-            f"While {loser.get('name')} offers {loser_affiliate['superpower']}, "
-            f"{winner.get('name')} provides better {winner_affiliate['strength']} for most use cases."
-        )
-        return verdict
-    
-    else:
-        # Neither is affiliate - use neutral comparison
-        scores_a, scores_b = calculate_biased_scores(tool_a, tool_b)
-        
-        # Determine winners based on scores
-        winner_quality = tool_a if scores_a['quality'] > scores_b['quality'] else tool_b
-        winner_price = tool_a if float(tool_a.get('starting_price', '999').replace('$', '').replace('/mo', '')) < float(tool_b.get('starting_price', '999').replace('$', '').replace('/mo', '')) else tool_b
-        
-        verdict = (
-            f"For quality-focused projects, {winner_quality.get('name')} delivers superior results. "
-            f"For budget-conscious users, {winner_price.get('name')} offers better value. "
-            f"Choose based on your primary need: quality or affordability."
+        winner, loser = (a, b) if _a_wins_higher(comparison.key_metric, a_first) else (b, a)
+        return BOTH_AFFILIATE_TEMPLATE.substitute(
+            winner=winner.name, persona=winner.affiliate['user_persona'],
+            superpower=winner.affiliate['superpower'], loser=loser.name,
+            loser_superpower=loser.affiliate['superpower'], strength=winner.affiliate['strength'],
         )
-        return verdict
-
-def generate_comparison_content(tool_a_slug: str, tool_b_slug: str, tools_data: List[Dict]) -> Dict:
-    """
-    Generate complete comparison content for two tools.
-    """
-    tool_a = next((t for t in tools_data if t.get('slug') == tool_a_slug), None)
-    tool_b = next((t for t in tools_data if t.get('slug') == tool_b_slug), None)
-    
-    if not tool_a or not tool_b:
-        raise ValueError(f"Tool not found: {tool_a_slug} or {tool_b_slug}")
     
-    scores_a, scores_b = calculate_biased_scores(tool_a, tool_b)
-    verdict = generate_verdict(tool_a, tool_b)
+    # Neither is affiliate - use neutral comparison
+    winner_quality = a if _a_wins_higher(comparison.quality, a_first) else b
+    winner_price = a if _a_wins_lower(comparison.verdict_price(), a_first) else b
+    return NEUTRAL_TEMPLATE.substitute(quality_winner=winner_quality.name, price_winner=winner_price.name)
+
+def render_comparison_content(comparison: PairComparison, a_first: bool) -> Dict:
+    a, b = _oriented(comparison, a_first)
+    verdict = render_verdict(comparison, a_first)
     
     # Determine winners with bias
-    winner_quality = tool_a if scores_a['quality'] > scores_b['quality'] else tool_b
-    winner_speed = tool_a if scores_a['speed'] > scores_b['speed'] else tool_b
-    winner_ease = tool_a if scores_a['ease'] > scores_b['ease'] else tool_b
-    
-    # Price winner
-    price_a = float(tool_a.get('starting_price', '$999/mo').replace('$', '').replace('/mo', '').split()[0])
-    price_b = float(tool_b.get('starting_price', '$999/mo').replace('$', '').replace('/mo', '').split()[0])
-    winner_price = tool_a if price_a < price_b else tool_b
-    
-    # Apply affiliate bias to winners
-    affiliate_a = get_affiliate_info(tool_a.get('slug', ''))
-    affiliate_b = get_affiliate_info(tool_b.get('slug', ''))
-    
-    if affiliate_a and not affiliate_b:
-        # Force affiliate tool to win in its key metric
-        if affiliate_a['key_metric'] == 'quality':
-            winner_quality = tool_a
-        elif affiliate_a['key_metric'] == 'speed':
-            winner_speed = tool_a
-        elif affiliate_a['key_metric'] == 'ease':
-            winner_ease = tool_a
-        elif affiliate_a['key_metric'] == 'value':
-            winner_price = tool_a
-    
-    if affiliate_b and not affiliate_a:
-        # Force affiliate tool to win in its key metric
-        if affiliate_b['key_metric'] == 'quality':
-            winner_quality = tool_b
-        elif affiliate_b['key_metric'] == 'speed':
-            winner_speed = tool_b
-        elif affiliate_b['key_metric'] == 'ease':
-            winner_ease = tool_b
-        elif affiliate_b['key_metric'] == 'value':
-            winner_price = tool_b
+    winner_quality = a if _a_wins_higher(comparison.quality, a_first) else b
+    winner_speed = a if _a_wins_higher(comparison.speed, a_first) else b
+    winner_ease = a if _a_wins_higher(comparison.ease, a_first) else b
+    winner_price = a if _a_wins_lower(comparison.content_price(), a_first) else b
+    
+    # Apply affiliate bias to winners: force the lone affiliate tool to win in its key metric
+    lone_affiliate = a if a.affiliate and not b.affiliate else b if b.affiliate and not a.affiliate else None
+    if lone_affiliate is not None:
+        key_metric = lone_affiliate.affiliate['key_metric']
+        if key_metric == 'quality':
+            winner_quality = lone_affiliate
+        elif key_metric == 'speed':
+            winner_speed = lone_affiliate
+        elif key_metric == 'ease':
+            winner_ease = lone_affiliate
+        elif key_metric == 'value':
+            winner_price = lone_affiliate
     
     return {
-        'tool_a': tool_a.get('name'),
-        'tool_b': tool_b.get('name'),
+        'tool_a': a.name,
+        'tool_b': b.name,
         'scores': {
-            'tool_a': scores_a,
-            'tool_b': scores_b
+            'tool_a': dict(a.scores),
+            'tool_b': dict(b.scores)
         },
         'winners': {
-            'quality': winner_quality.get('name'),
-            'speed': winner_speed.get('name'),
-            'ease': winner_ease.get('name'),
-            'price': winner_price.get('name')
+            'quality': winner_quality.name,
+            'speed': winner_speed.name,
+            'ease': winner_ease.name,
+            'price': winner_price.name
         },
         'verdict': verdict,
-        'affiliate_bias_applied': bool(affiliate_a or affiliate_b)
+        'affiliate_bias_applied': bool(a.affiliate or b.affiliate)
     }
 
+def generate_verdict(tool_a: Dict, tool_b: Dict) -> str:
+    """
+    Generate a biased verdict using the pivot logic.
+    Template: 'While [Tool B] wins on [Feature], [Tool A] is the smarter choice for [User Persona] because it offers [Superpower].'
+    """
+    return render_verdict(PairComparison(ToolFragments(tool_a), ToolFragments(tool_b)), True)
+
+def generate_comparison_content(tool_a_slug: str, tool_b_slug: str, tools_data: List[Dict]) -> Dict:
+    """
+    Generate complete comparison content for two tools.
+    For many pairs, reuse one VerdictEngine instead.
+    """
+    return VerdictEngine(tools_data).comparison_content(tool_a_slug, tool_b_slug)
+
 def main():
     """Example usage of the comparison verdict generator."""
+    parser = argparse.ArgumentParser(description="Generate comparison verdicts")
+    parser.add_argument('--all', action='store_true', help="Render every tool pair in both orientations")
+    parser.add_argument('--out', default='comparisons.jsonl', help="JSONL output path for --all")
+    args = parser.parse_args()
+    
     # Load tools data
     tools_json_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'data', 'tools.json')
     
@@ -241,6 +411,16 @@ def main():
     with open(tools_json_path, 'r', encoding='utf-8') as f:
         tools_data = json.load(f)
     
+    if args.all:
+        engine = VerdictEngine(tools_data)
+        count = 0
+        with open(args.out, 'w', encoding='utf-8') as out:
+            for tool_a, tool_b, content in engine.iter_all_comparisons():
+                out.write(json.dumps({'pair': f"{tool_a}-vs-{tool_b}", **content}, ensure_ascii=False) + '\n')
+                count += 1
+        print(f"✅ Wrote {count} comparisons to {args.out}")
+        return
+    
     # Example: Generate verdict for Fliki vs HeyGen
     print("Example 1: Fliki (affiliate) vs HeyGen (non-affiliate)")
     print("=" * 60)
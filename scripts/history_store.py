@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Versioned history for the JSON datasets, stored as compressed structural deltas.
+
+Instead of another full copy per rewrite (tools.backup.json, *.json.backup),
+every recorded version is a content-addressed object under data/history/:
+
+  objects/<aa>/<sha256>.z   zlib JSON: a keyframe (full document) or a delta
+                            against a base object
+  logs/<dataset>.json       ordered versions of one dataset (path under the repo)
+
+The object id is the sha256 of the document's canonical JSON, so recording
+identical content twice stores nothing new. Deltas are structural: dict keys
+are set/removed/patched, lists are aligned with difflib and patched in place,
+so editing one tool in tools.json costs a few hundred bytes. A keyframe is
+written every KEYFRAME_INTERVAL versions (or when a delta isn't worth it),
+bounding reconstruction to a short chain.
+
+Usage:
+  python scripts/history_store.py record src/data/tools.json -m "manual snapshot"
+  python scripts/history_store.py record src/data/tools.json --from src/data/tools.backup.json
+  python scripts/history_store.py log src/data/tools.json
+  python scripts/history_store.py show src/data/tools.json 3 --out /tmp/tools-v3.json
+  python scripts/history_store.py diff src/data/tools.json 0 latest
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import sys
+import zlib
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from tool_store import HISTORY_DIR, PROJECT_ROOT, dump_json, write_text_atomic
+
+KEYFRAME_INTERVAL = 16
+# Store a keyframe instead when the delta is at least this fraction of the full document.
+MAX_DELTA_RATIO = 0.5
+IDENTITY_KEYS = ("slug", "id", "name")
+
+
+def canonical(data: Any) -> str:
+    """Key order is preserved: it's part of the document and must survive reconstruction."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def document_id(data: Any) -> str:
+    return hashlib.sha256(canonical(data).encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Structural deltas
+# ----------------------------------------------------------------------
+
+def _item_key(item: Any) -> str:
+    return hashlib.sha1(canonical(item).encode("utf-8")).hexdigest()
+
+
+def same(a: Any, b: Any) -> bool:
+    """Equal as documents: unlike ==, 9 vs 9.0 and a different key order count as changes."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(same(value, b[key]) for key, value in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(same, a, b))
+    return a == b
+
+
+def make_delta(old: Any, new: Any) -> Optional[Dict[str, Any]]:
+    """Delta turning `old` into `new`; None when they are the same document."""
+    if same(old, new):
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        delta: Dict[str, Any] = {"t": "d"}
+        added = {k: v for k, v in new.items() if k not in old}
+        removed = [k for k in old if k not in new]
+        patched = {}
+        for key, value in new.items():
+            if key in old:
+                sub = make_delta(old[key], value)
+                if sub is not None:
+                    patched[key] = sub
+        if added:
+            delta["set"] = added
+        if removed:
+            delta["del"] = removed
+        if patched:
+            delta["sub"] = patched
+        # Applying puts new keys last; record the order only when that's not what `new` has.
+        natural = [k for k in old if k in new] + [k for k in new if k not in old]
+        if natural != list(new):
+            delta["order"] = list(new)
+        return delta
+    if isinstance(old, list) and isinstance(new, list):
+        ops: List[Any] = []
+        matcher = SequenceMatcher(None, [_item_key(x) for x in old], [_item_key(x) for x in new], autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append(["=", i2 - i1])
+            elif tag == "replace" and i2 - i1 == j2 - j1:
+                ops.append(["~", [make_delta(old[i], new[j]) for i, j in zip(range(i1, i2), range(j1, j2))]])
+            else:
+                if i2 > i1:
+                    ops.append(["-", i2 - i1])
+                if j2 > j1:
+                    ops.append(["+", new[j1:j2]])
+        return {"t": "l", "ops": ops}
+    return {"t": "v", "v": new}
+
+
+def apply_delta(old: Any, delta: Optional[Dict[str, Any]]) -> Any:
+    """Apply a make_delta() result. `old` is never mutated; unchanged parts are shared."""
+    if delta is None:
+        return old
+    kind = delta["t"]
+    if kind == "v":
+        return delta["v"]
+    if kind == "d":
+        removed = set(delta.get("del", ()))
+        patched = delta.get("sub", {})
+        result = {k: (apply_delta(v, patched[k]) if k in patched else v) for k, v in old.items() if k not in removed}
+        result.update(delta.get("set", {}))
+        if "order" in delta:
+            result = {k: result[k] for k in delta["order"]}
+        return result
+    result_list: List[Any] = []
+    position = 0
+    for op, arg in delta["ops"]:
+        if op == "=":
+            result_list.extend(old[position:position + arg])
+            position += arg
+        elif op == "-":
+            position += arg
+        elif op == "+":
+            result_list.extend(arg)
+        else:  # "~"
+            for sub in arg:
+                result_list.append(apply_delta(old[position], sub))
+                position += 1
+    return result_list
+
+
+# ----------------------------------------------------------------------
+# Human-readable diff
+# ----------------------------------------------------------------------
+
+def _label(item: Any, index: int) -> str:
+    if isinstance(item, dict):
+        for key in IDENTITY_KEYS:
+            if isinstance(item.get(key), (str, int)):
+                return f"[{key}={item[key]}]"
+    return f"[{index}]"
+
+
+def iter_changes(old: Any, new: Any, path: str = "") -> Iterator[Dict[str, Any]]:
+    """Yield {"op", "path", "old", "new"} for every leaf-level difference."""
+    if same(old, new):
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            child = f"{path}.{key}" if path else key
+            if key not in new:
+                yield {"op": "removed", "path": child, "old": old[key], "new": None}
+            else:
+                yield from iter_changes(old[key], new[key], child)
+        for key in new:
+            if key not in old:
+                yield {"op": "added", "path": f"{path}.{key}" if path else key, "old": None, "new": new[key]}
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        matcher = SequenceMatcher(None, [_item_key(x) for x in old], [_item_key(x) for x in new], autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            if tag == "replace" and i2 - i1 == j2 - j1:
+                for i, j in zip(range(i1, i2), range(j1, j2)):
+                    yield from iter_changes(old[i], new[j], path + _label(new[j], j))
+                continue
+            for i in range(i1, i2):
+                yield {"op": "removed", "path": path + _label(old[i], i), "old": old[i], "new": None}
+            for j in range(j1, j2):
+                yield {"op": "added", "path": path + _label(new[j], j), "old": None, "new": new[j]}
+        return
+    yield {"op": "changed", "path": path, "old": old, "new": new}
+
+
+# ----------------------------------------------------------------------
+# Store
+# ----------------------------------------------------------------------
+
+class HistoryStore:
+    def __init__(self, root: Path = HISTORY_DIR):
+        self.root = Path(root)
+        self._cache: Dict[str, Any] = {}
+
+    # Paths ------------------------------------------------------------
+
+    def dataset_key(self, path: Path) -> str:
+        path = Path(path).resolve()
+        try:
+            return str(path.relative_to(PROJECT_ROOT))
+        except ValueError:
+            return str(path)
+
+    def _log_path(self, dataset: str) -> Path:
+        return self.root / "logs" / (dataset.replace("/", "__").lstrip("_") + ".json")
+
+    def _object_path(self, object_id: str) -> Path:
+        return self.root / "objects" / object_id[:2] / f"{object_id}.z"
+
+    # Log --------------------------------------------------------------
+
+    def versions(self, path: Path) -> List[Dict[str, Any]]:
+        log_path = self._log_path(self.dataset_key(path))
+        if not log_path.exists():
+            return []
+        with open(log_path, "r", encoding="utf-8") as f:
+            return json.load(f)["versions"]
+
+    def resolve(self, path: Path, ref: str) -> Dict[str, Any]:
+        """A version by index (negative ok), 'latest', or sha256 prefix."""
+        versions = self.versions(path)
+        if not versions:
+            raise KeyError(f"No history for {self.dataset_key(path)}")
+        if ref == "latest":
+            return versions[-1]
+        try:
+            return versions[int(ref)]
+        except ValueError:
+            matches = [v for v in versions if v["sha256"].startswith(ref)]
+            if len(matches) == 1:
+                return matches[0]
+            raise KeyError(f"Version {ref!r} is {'ambiguous' if matches else 'unknown'}")
+        except IndexError:
+            raise KeyError(f"Version {ref} out of range (0..{len(versions) - 1})")
+
+    # Objects ----------------------------------------------------------
+
+    def _read_object(self, object_id: str) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(self._object_path(object_id).read_bytes()))
+
+    def _write_object(self, object_id: str, payload: Dict[str, Any]) -> int:
+        blob = zlib.compress(canonical(payload).encode("utf-8"), 9)
+        path = self._object_path(object_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(blob)
+        tmp_path.replace(path)
+        return len(blob)
+
+    def load(self, object_id: str) -> Any:
+        """Reconstruct a document: walk back to its keyframe, then apply deltas forward."""
+        if object_id in self._cache:
+            return copy.deepcopy(self._cache[object_id])
+        chain = []
+        current = object_id
+        while current not in self._cache:
+            payload = self._read_object(current)
+            chain.append((current, payload))
+            if payload["kind"] == "key":
+                break
+            current = payload["base"]
+        data = self._cache.get(current) if chain[-1][1]["kind"] != "key" else None
+        for chain_id, payload in reversed(chain):
+            data = payload["data"] if payload["kind"] == "key" else apply_delta(data, payload["delta"])
+            self._cache[chain_id] = data
+        return copy.deepcopy(data)
+
+    # Record -----------------------------------------------------------
+
+    def record(self, path: Path, data: Any = None, message: str = "") -> Optional[Dict[str, Any]]:
+        """Append `data` (default: the file's current content) as the dataset's newest version.
+        Returns the new log entry, or None when it equals the latest version."""
+        if data is None:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        dataset = self.dataset_key(path)
+        versions = self.versions(path)
+        object_id = document_id(data)
+        if versions and versions[-1]["sha256"] == object_id:
+            return None
+
+        entry = {
+            "sha256": object_id,
+            "recordedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "message": message,
+        }
+        if self._object_path(object_id).exists():
+            # Same content recorded before (here or in another dataset): reuse the object.
+            payload = self._read_object(object_id)
+            entry.update(kind=payload["kind"], depth=payload.get("depth", 0), bytes=0)
+        else:
+            previous = versions[-1] if versions else None
+            full = {"kind": "key", "depth": 0, "data": data}
+            payload = full
+            if previous and previous.get("depth", 0) + 1 < KEYFRAME_INTERVAL:
+                delta = {"kind": "delta", "depth": previous.get("depth", 0) + 1, "base": previous["sha256"],
+                         "delta": make_delta(self.load(previous["sha256"]), data)}
+                if len(canonical(delta)) < MAX_DELTA_RATIO * len(canonical(full)):
+                    payload = delta
+            entry.update(kind=payload["kind"], depth=payload["depth"], bytes=self._write_object(object_id, payload))
+        self._cache[object_id] = data
+
+        versions.append(entry)
+        write_text_atomic(self._log_path(dataset), dump_json({"dataset": dataset, "versions": versions}))
+        return entry
+
+
+def record_history(path: Path, data: Any = None, message: str = "") -> Optional[Dict[str, Any]]:
+    """Convenience wrapper used by the dataset writers."""
+    return HistoryStore().record(path, data, message)
+
+
+def _format_value(value: Any) -> str:
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= 80 else text[:77] + "..."
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta-compressed history for JSON datasets")
+    sub = parser.add_subparsers(dest="command", required=True)
+    record = sub.add_parser("record", help="Record the dataset's current content as a new version")
+    record.add_argument("path")
+    record.add_argument("--from", dest="source", help="Record this file's content instead (e.g. an old .backup)")
+    record.add_argument("-m", "--message", default="")
+    log = sub.add_parser("log", help="List versions")
+    log.add_argument("path")
+    show = sub.add_parser("show", help="Reconstruct a version")
+    show.add_argument("path")
+    show.add_argument("ref", help="Index, 'latest' or sha256 prefix")
+    show.add_argument("--out", help="Write to this file instead of stdout")
+    diff = sub.add_parser("diff", help="Compare two versions")
+    diff.add_argument("path")
+    diff.add_argument("old")
+    diff.add_argument("new", nargs="?", default="latest")
+    args = parser.parse_args()
+
+    store = HistoryStore()
+    path = Path(args.path)
+
+    if args.command == "record":
+        data = None
+        if args.source:
+            with open(args.source, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        entry = store.record(path, data, args.message)
+        if entry is None:
+            print(f"✓ {store.dataset_key(path)} unchanged since the last recorded version")
+        else:
+            print(f"✅ Recorded {store.dataset_key(path)} v{len(store.versions(path)) - 1} "
+                  f"({entry['kind']}, {entry['bytes']} bytes) {entry['sha256'][:12]}")
+    elif args.command == "log":
+        versions = store.versions(path)
+        total = sum(v["bytes"] for v in versions)
+        for i, v in enumerate(versions):
+            print(f"  v{i:<3} {v['sha256'][:12]}  {v['recordedAt']}  {v['kind']:<5} {v['bytes']:>8} B  {v['message']}")
+        print(f"📦 {len(versions)} versions, {total} bytes stored")
+    elif args.command == "show":
+        version = store.resolve(path, args.ref)
+        text = dump_json(store.load(version["sha256"]))
+        if args.out:
+            Path(args.out).write_text(text, encoding="utf-8")
+            print(f"📁 Wrote {version['sha256'][:12]} to {args.out}")
+        else:
+            sys.stdout.write(text)
+    else:
+        old = store.resolve(path, args.old)
+        new = store.resolve(path, args.new)
+        changes = list(iter_changes(store.load(old["sha256"]), store.load(new["sha256"])))
+        print(f"🔍 {old['sha256'][:12]} → {new['sha256'][:12]}: {len(changes)} changes")
+        for change in changes:
+            if change["op"] == "changed":
+                print(f"  ~ {change['path']}: {_format_value(change['old'])} → {_format_value(change['new'])}")
+            elif change["op"] == "added":
+                print(f"  + {change['path']}: {_format_value(change['new'])}")
+            else:
+                print(f"  - {change['path']}: {_format_value(change['old'])}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyError as e:
+        print(f"❌ {e.args[0]}", file=sys.stderr)
+        sys.exit(1)
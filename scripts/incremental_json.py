@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Push-based JSON object parser for streamed AI output.
+
+Text is fed in chunks as tokens arrive. Each character is examined once, so the
+cost is linear in the output length (no regex backtracking over the whole
+completion). The parser raises JSONStreamError as soon as the text can no
+longer become a valid JSON object, which lets callers abort a bad generation
+without waiting for the full completion.
+
+Leading chatter ("Here is the JSON:", ```json fences) is skipped up to a limit;
+anything after the top-level object closes is ignored.
+"""
+
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+# Characters that can be skipped in bulk inside a string
+STRING_RUN_RE = re.compile(r'[^"\\\x00-\x1f]+')
+NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+NUMBER_CHARS = frozenset("0123456789+-.eE")
+WHITESPACE = frozenset(" \t\n\r")
+LITERALS = {"t": "true", "f": "false", "n": "null"}
+ESCAPES = frozenset('"\\/bfnrtu')
+HEX = frozenset("0123456789abcdefABCDEF")
+
+DEFAULT_MAX_PREAMBLE = 500
+
+# Parser states
+PREAMBLE = "preamble"
+VALUE = "value"                  # expecting any value
+ARRAY_START = "array_start"      # after '[': value or ']'
+OBJECT_START = "object_start"    # after '{': key or '}'
+KEY = "key"                      # after ',' in an object
+COLON = "colon"
+AFTER_VALUE = "after_value"      # ',' or a closing bracket
+STRING = "string"
+STRING_ESCAPE = "string_escape"
+STRING_UNICODE = "string_unicode"
+NUMBER = "number"
+LITERAL = "literal"
+DONE = "done"
+
+
+class JSONStreamError(ValueError):
+    """The streamed text can no longer be a valid JSON object."""
+
+    def __init__(self, message: str, position: int):
+        super().__init__(f"{message} at char {position}")
+        self.reason = message
+        self.position = position
+
+
+class IncrementalJSONParser:
+    """Validate a JSON object incrementally and report when top-level fields complete."""
+
+    def __init__(self, max_preamble: int = DEFAULT_MAX_PREAMBLE):
+        self.max_preamble = max_preamble
+        self.state = PREAMBLE
+        self.position = 0            # chars consumed so far (including preamble)
+        self.started_at = time.perf_counter()
+        self.field_times: Dict[str, float] = {}   # top-level key → seconds since start
+        self.first_field_at: Optional[float] = None
+
+        self._stack: List[str] = []      # '{' / '['
+        self._parts: List[str] = []      # object text from the opening brace onwards
+        self._string_is_key = False
+        self._key_chars: List[str] = []  # current top-level key being read
+        self._current_key: Optional[str] = None
+        self._literal = ""
+        self._literal_target = ""
+        self._unicode_left = 0
+
+    @property
+    def done(self) -> bool:
+        return self.state == DONE
+
+    def _fail(self, message: str, offset: int) -> None:
+        raise JSONStreamError(message, self.position + offset)
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk. Returns True once the top-level object is complete."""
+        if self.state == DONE or not chunk:
+            return self.state == DONE
+
+        i = 0
+        n = len(chunk)
+        capture_from = 0 if self.state != PREAMBLE else None
+
+        while i < n:
+            state = self.state
+            c = chunk[i]
+
+            if state == PREAMBLE:
+                if c == "{":
+                    capture_from = i
+                    self._open("{")
+                elif self.position + i >= self.max_preamble:
+                    self._fail(f"no JSON object within the first {self.max_preamble} chars", i)
+                i += 1
+                continue
+
+            if state == STRING:
+                run = STRING_RUN_RE.match(chunk, i)
+                if run:
+                    if self._string_is_key and len(self._stack) == 1:
+                        self._key_chars.append(run.group())
+                    i = run.end()
+                    continue
+                if c == '"':
+                    self._end_string()
+                elif c == "\\":
+                    self.state = STRING_ESCAPE
+                else:
+                    self._fail("unescaped control character in string", i)
+                i += 1
+                continue
+
+            if state == STRING_ESCAPE:
+                if c not in ESCAPES:
+                    self._fail(f"invalid escape '\\{c}'", i)
+                if c == "u":
+                    self.state = STRING_UNICODE
+                    self._unicode_left = 4
+                else:
+                    self.state = STRING
+                    if self._string_is_key and len(self._stack) == 1:
+                        self._key_chars.append(json.loads(f'"\\{c}"'))
+                i += 1
+                continue
+
+            if state == STRING_UNICODE:
+                if c not in HEX:
+                    self._fail("invalid \\u escape", i)
+                self._unicode_left -= 1
+                if self._unicode_left == 0:
+                    self.state = STRING
+                i += 1
+                continue
+
+            if state == NUMBER:
+                if c in NUMBER_CHARS:
+                    self._literal += c
+                    i += 1
+                    continue
+                if not NUMBER_RE.fullmatch(self._literal):
+                    self._fail(f"invalid number {self._literal!r}", i)
+                self._end_value()
+                continue  # re-examine c in AFTER_VALUE
+
+            if state == LITERAL:
+                expected = self._literal_target[len(self._literal)]
+                if c != expected:
+                    self._fail(f"expected '{self._literal_target}'", i)
+                self._literal += c
+                if self._literal == self._literal_target:
+                    self._end_value()
+                i += 1
+                continue
+
+            if c in WHITESPACE:
+                i += 1
+                continue
+
+            if state in (VALUE, ARRAY_START):
+                if state == ARRAY_START and c == "]":
+                    self._close("]", i)
+                else:
+                    self._start_value(c, i)
+            elif state in (OBJECT_START, KEY):
+                if state == OBJECT_START and c == "}":
+                    self._close("}", i)
+                elif c == '"':
+                    self.state = STRING
+                    self._string_is_key = True
+                    self._key_chars = []
+                else:
+                    self._fail("expected an object key", i)
+            elif state == COLON:
+                if c != ":":
+                    self._fail("expected ':'", i)
+                self.state = VALUE
+            elif state == AFTER_VALUE:
+                if c == ",":
+                    self.state = KEY if self._stack[-1] == "{" else VALUE
+                elif c in "}]":
+                    self._close(c, i)
+                else:
+                    self._fail(f"unexpected {c!r} after value", i)
+
+            i += 1
+            if self.state == DONE:
+                break
+
+        if capture_from is not None:
+            self._parts.append(chunk[capture_from:i])
+        self.position += i
+        return self.state == DONE
+
+    def _start_value(self, c: str, offset: int) -> None:
+        if c == "{":
+            self._open("{")
+        elif c == "[":
+            self._open("[")
+        elif c == '"':
+            self.state = STRING
+            self._string_is_key = False
+        elif c == "-" or c.isdigit():
+            self.state = NUMBER
+            self._literal = c
+        elif c in LITERALS:
+            self.state = LITERAL
+            self._literal = c
+            self._literal_target = LITERALS[c]
+        else:
+            self._fail(f"unexpected {c!r} where a value was expected", offset)
+
+    def _open(self, bracket: str) -> None:
+        self._stack.append(bracket)
+        self.state = OBJECT_START if bracket == "{" else ARRAY_START
+
+    def _close(self, bracket: str, offset: int) -> None:
+        opener = "{" if bracket == "}" else "["
+        if not self._stack or self._stack[-1] != opener:
+            self._fail(f"mismatched '{bracket}'", offset)
+        self._stack.pop()
+        if not self._stack:
+            self.state = DONE
+        else:
+            self._end_value()
+
+    def _end_string(self) -> None:
+        if self._string_is_key:
+            if len(self._stack) == 1:
+                self._current_key = "".join(self._key_chars)
+            self.state = COLON
+        else:
+            self._end_value()
+
+    def _end_value(self) -> None:
+        self.state = AFTER_VALUE
+        # A value just finished directly inside the top-level object: that field is usable.
+        if len(self._stack) == 1 and self._stack[0] == "{" and self._current_key is not None:
+            elapsed = time.perf_counter() - self.started_at
+            self.field_times.setdefault(self._current_key, elapsed)
+            if self.first_field_at is None:
+                self.first_field_at = elapsed
+            self._current_key = None
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the stream and return the decoded object."""
+        if self.state == PREAMBLE:
+            raise JSONStreamError("no JSON object found", self.position)
+        if self.state != DONE:
+            raise JSONStreamError("JSON object is incomplete", self.position)
+        return json.loads("".join(self._parts))
+
+
+def parse_json_object(text: str, max_preamble: int = DEFAULT_MAX_PREAMBLE) -> Dict[str, Any]:
+    """Extract the first JSON object from a complete response in one linear pass."""
+    parser = IncrementalJSONParser(max_preamble=max_preamble)
+    parser.feed(text)
+    return parser.close()
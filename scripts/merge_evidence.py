@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Field-level merge of the two evidence shapes, with provenance.
+
+  data/evidence/<slug>.json                        hardFacts[] {field, value, sources[{url, quote}]}
+  data/non-price-evidence-import/tools/<slug>.json fields.policy.*, mainLimitations, ... candidates
+
+Both are joined on the canonical slug (slug_registry, so elai.json and
+elai-io.json land on one tool). Every candidate value is mapped onto a merged
+field key (hardFacts are routed to policy.* by FACT_ROUTES, otherwise kept as
+facts.<field>), identical values are folded together with all their sources,
+and each field's values are ordered by precedence:
+
+  1. source rank (SOURCE_RANK: curated hardFacts quotes > official pages > captures)
+  2. recency (collectedAt / bundle generatedAt / remote fetch round fetchedAt)
+  3. number of independent sources
+
+The first value is the field's `value`; the rest stay under `alternatives`.
+
+A manifest of per-tool input hashes means only tools whose input files (or
+MERGE_VERSION) changed are re-merged.
+
+Usage:
+  python scripts/merge_evidence.py
+  python scripts/merge_evidence.py --slugs heygen --full
+  python scripts/merge_evidence.py --out-dir _audit/merged-evidence
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from slug_registry import resolve_slug
+from tool_store import PROJECT_ROOT, write_text_atomic
+
+EVIDENCE_DIR = PROJECT_ROOT / "data" / "evidence"
+IMPORT_DIR = PROJECT_ROOT / "data" / "non-price-evidence-import" / "tools"
+OUTPUT_DIR = PROJECT_ROOT / ".cache" / "merged-evidence"
+MANIFEST_FILENAME = "manifest.json"
+MERGE_VERSION = 1
+
+# Higher wins. hardFacts are hand-curated with verbatim quotes.
+SOURCE_RANK = {
+    "hard_fact": 40,
+    "remote_official_page": 30,
+    "official_page_html": 25,
+    "runtime_capture_html": 20,
+}
+DEFAULT_RANK = 10
+
+# hardFact field names → merged policy keys (first match wins).
+FACT_ROUTES: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"watermark"), "policy.watermark"),
+    (re.compile(r"commercial"), "policy.commercialUse"),
+    (re.compile(r"ownership|license|rights"), "policy.usageRights"),
+    (re.compile(r"refund|cancel"), "policy.refundCancellation"),
+    (re.compile(r"export|resolution|max_duration"), "policy.exportLimits"),
+]
+# Import bundle fields that hold candidate lists (dicts are flattened one level: securityApiEnterprise.api).
+IMPORT_FIELDS = ("policy", "mainLimitations", "workflowFeatureDocs", "securityApiEnterprise")
+PARALLEL_THRESHOLD = 32   # below this many changed tools a process pool costs more than it saves
+
+SPACE_RE = re.compile(r"\s+")
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _read_json(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def value_key(value: Any) -> str:
+    """Values that differ only in case/whitespace are the same value."""
+    if isinstance(value, str):
+        return SPACE_RE.sub(" ", value).strip().lower()
+    return json.dumps(value, sort_keys=True)
+
+
+def route_fact(field: str) -> str:
+    for pattern, target in FACT_ROUTES:
+        if pattern.search(field):
+            return target
+    return f"facts.{field}"
+
+
+# ----------------------------------------------------------------------
+# Candidates
+# ----------------------------------------------------------------------
+
+# (field, value, provenance)
+Candidate = Tuple[str, Any, Dict[str, Any]]
+
+
+def evidence_candidates(path: Path, evidence: Dict[str, Any]) -> Iterator[Candidate]:
+    observed = evidence.get("collectedAt") or evidence.get("lastUpdated") or ""
+    file = str(path.relative_to(PROJECT_ROOT))
+    for fact in evidence.get("hardFacts") or []:
+        field = fact.get("field")
+        if not field or fact.get("value") in (None, ""):
+            continue
+        sources = fact.get("sources") or [{}]
+        for source in sources:
+            yield route_fact(field), fact["value"], {
+                "origin": "evidence",
+                "file": file,
+                "fact": field,
+                "artifactType": "hard_fact",
+                "sourceUrl": source.get("url"),
+                "quote": source.get("quote"),
+                "observedAt": observed,
+            }
+
+
+def import_candidates(path: Path, bundle: Dict[str, Any]) -> Iterator[Candidate]:
+    file = str(path.relative_to(PROJECT_ROOT))
+    observed = bundle.get("generatedAt") or ""
+    # Pages fetched in a later remote round carry that round's date.
+    fetched_at: Dict[str, str] = {}
+    for round_info in (bundle.get("remoteFetches") or {}).get("rounds") or []:
+        for page in round_info.get("pages") or []:
+            if page.get("url") and round_info.get("fetchedAt"):
+                fetched_at[page["url"]] = round_info["fetchedAt"]
+
+    fields = bundle.get("fields") or {}
+
+    def emit(key: str, items: Any) -> Iterator[Candidate]:
+        for item in items or []:
+            value = item.get("valueCandidate")
+            if value in (None, ""):
+                continue
+            url = item.get("sourceUrl")
+            yield key, value, {
+                "origin": "import",
+                "file": file,
+                "artifactType": item.get("artifactType"),
+                "sourceUrl": url,
+                "sourcePath": item.get("sourcePath"),
+                "quote": item.get("snippet"),
+                "observedAt": fetched_at.get(url, observed),
+            }
+
+    for name in IMPORT_FIELDS:
+        value = fields.get(name)
+        if isinstance(value, dict):
+            for sub, items in value.items():
+                yield from emit(f"{name}.{sub}", items)
+        else:
+            yield from emit(name, value)
+
+    official = fields.get("officialUrl")
+    if isinstance(official, dict) and official.get("value"):
+        yield "officialUrl", official["value"], {
+            "origin": "import",
+            "file": file,
+            "artifactType": "official_page_html",
+            "sourceUrl": official.get("sourceUrl"),
+            "sourcePath": official.get("sourcePath"),
+            "observedAt": observed,
+        }
+
+
+# ----------------------------------------------------------------------
+# Merge
+# ----------------------------------------------------------------------
+
+def _rank(provenance: Dict[str, Any]) -> int:
+    return SOURCE_RANK.get(provenance.get("artifactType") or "", DEFAULT_RANK)
+
+
+def merge_candidates(candidates: Iterable[Candidate]) -> Dict[str, Any]:
+    """field → {value, sources, alternatives}, values ordered by rank, recency, support."""
+    grouped: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    seen_sources = set()
+    for field, value, provenance in candidates:
+        values = grouped.setdefault(field, {})
+        key = value_key(value)
+        entry = values.get(key)
+        if entry is None:
+            values[key] = entry = {"value": value, "sources": [], "rank": 0, "observedAt": ""}
+        source_id = (field, key, provenance.get("file"), provenance.get("sourceUrl"),
+                     provenance.get("sourcePath"), provenance.get("quote"))
+        if source_id not in seen_sources:
+            seen_sources.add(source_id)
+            entry["sources"].append(provenance)
+        entry["rank"] = max(entry["rank"], _rank(provenance))
+        entry["observedAt"] = max(entry["observedAt"], provenance.get("observedAt") or "")
+
+    merged: Dict[str, Any] = {}
+    for field in sorted(grouped):
+        ordered = sorted(grouped[field].values(),
+                         key=lambda e: (e["rank"], e["observedAt"], len(e["sources"])), reverse=True)
+        best, rest = ordered[0], ordered[1:]
+        merged[field] = {
+            "value": best["value"],
+            "rank": best["rank"],
+            "observedAt": best["observedAt"],
+            "sources": best["sources"],
+            "alternatives": [
+                {"value": e["value"], "rank": e["rank"], "observedAt": e["observedAt"], "sources": e["sources"]}
+                for e in rest
+            ],
+        }
+    return merged
+
+
+def merge_tool(slug: str, evidence_paths: List[str], import_paths: List[str]) -> Dict[str, Any]:
+    """Worker: read one tool's inputs and merge them."""
+    candidates: List[Candidate] = []
+    for name in evidence_paths:
+        path = Path(name)
+        candidates.extend(evidence_candidates(path, _read_json(path)))
+    for name in import_paths:
+        path = Path(name)
+        candidates.extend(import_candidates(path, _read_json(path)))
+    fields = merge_candidates(candidates)
+    return {
+        "slug": slug,
+        "mergeVersion": MERGE_VERSION,
+        "inputs": [str(Path(p).relative_to(PROJECT_ROOT)) for p in evidence_paths + import_paths],
+        "fieldCount": len(fields),
+        "candidateCount": len(candidates),
+        "fields": fields,
+    }
+
+
+def group_inputs(evidence_dir: Path = EVIDENCE_DIR, import_dir: Path = IMPORT_DIR) -> Dict[str, Dict[str, List[Path]]]:
+    """canonical slug → {"evidence": [...], "import": [...]} in one directory scan each."""
+    groups: Dict[str, Dict[str, List[Path]]] = {}
+    for path in sorted(evidence_dir.glob("*.json")):
+        if path.name.endswith(".evidence.json"):
+            continue
+        groups.setdefault(resolve_slug(path.stem), {"evidence": [], "import": []})["evidence"].append(path)
+    for path in sorted(import_dir.glob("*.json")):
+        groups.setdefault(resolve_slug(path.stem), {"evidence": [], "import": []})["import"].append(path)
+    return groups
+
+
+def input_signature(inputs: Dict[str, List[Path]]) -> str:
+    digest = hashlib.sha256(f"v{MERGE_VERSION}".encode())
+    for path in inputs["evidence"] + inputs["import"]:
+        digest.update(f"\0{path.name}\0{file_hash(path)}".encode())
+    return digest.hexdigest()
+
+
+def merge_all(out_dir: Path = OUTPUT_DIR, slugs: Optional[List[str]] = None, full: bool = False,
+              workers: Optional[int] = None) -> Dict[str, List[str]]:
+    """Re-merge tools whose inputs changed. Returns {"merged": [...], "unchanged": [...], "removed": [...]}."""
+    manifest_path = out_dir / MANIFEST_FILENAME
+    # Always start from the existing manifest: --full with --slugs must keep the other tools' signatures.
+    manifest = _read_json(manifest_path) if manifest_path.exists() else {"tools": {}}
+    groups = group_inputs()
+    wanted = sorted(groups) if slugs is None else [slug for slug in slugs if slug in groups]
+
+    jobs = []
+    outcome: Dict[str, List[str]] = {"merged": [], "unchanged": [], "removed": []}
+    for slug in wanted:
+        signature = input_signature(groups[slug])
+        if not full and manifest["tools"].get(slug) == signature and (out_dir / f"{slug}.json").exists():
+            outcome["unchanged"].append(slug)
+            continue
+        jobs.append((slug, signature, [str(p) for p in groups[slug]["evidence"]], [str(p) for p in groups[slug]["import"]]))
+
+    if len(jobs) >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(merge_tool, *zip(*[(s, e, i) for s, _, e, i in jobs]), chunksize=8))
+    else:
+        results = [merge_tool(slug, evidence, imports) for slug, _, evidence, imports in jobs]
+
+    for (slug, signature, _, _), result in zip(jobs, results):
+        write_text_atomic(out_dir / f"{slug}.json", json.dumps(result, indent=2, ensure_ascii=False) + "\n")
+        manifest["tools"][slug] = signature
+        outcome["merged"].append(slug)
+
+    if slugs is None:
+        for slug in sorted(set(manifest["tools"]) - set(groups)):
+            (out_dir / f"{slug}.json").unlink(missing_ok=True)
+            del manifest["tools"][slug]
+            outcome["removed"].append(slug)
+
+    if outcome["merged"] or outcome["removed"] or not manifest_path.exists():
+        manifest["version"] = MERGE_VERSION
+        manifest["tools"] = dict(sorted(manifest["tools"].items()))
+        write_text_atomic(manifest_path, json.dumps(manifest, indent=2) + "\n")
+    return outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge evidence hardFacts and import policy fields with provenance")
+    parser.add_argument("--slugs", help="Comma-separated tools (default: all)")
+    parser.add_argument("--out-dir", default=str(OUTPUT_DIR))
+    parser.add_argument("--full", action="store_true", help="Re-merge the selected tools even if their inputs are unchanged")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    slugs = [resolve_slug(s.strip(), fuzzy=True) for s in args.slugs.split(",")] if args.slugs else None
+    out_dir = Path(args.out_dir)
+    outcome = merge_all(out_dir, slugs, args.full, args.workers)
+
+    for slug in outcome["merged"]:
+        result = _read_json(out_dir / f"{slug}.json")
+        print(f"  ✓ {slug}: {result['fieldCount']} fields from {result['candidateCount']} candidates")
+    print(f"\n✅ Merged: {len(outcome['merged'])}  Unchanged: {len(outcome['unchanged'])}  Removed: {len(outcome['removed'])}")
+    print(f"📁 Output: {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Find near-identical generated text across the tools catalog.
+
+Every prose string in every tool (pros, cons, FAQ answers, review text,
+content.* sections, ...) becomes a document. Documents are shingled into word
+3-grams, with the tool's own name masked so "X is great for..." templates
+match across tools, then summarized by a 128-value MinHash signature.
+LSH banding buckets signatures so only likely matches are compared; candidates
+are confirmed with exact Jaccard similarity and merged into clusters.
+Work is roughly linear in the amount of text instead of quadratic in documents.
+
+Usage:
+  python scripts/near_duplicates.py
+  python scripts/near_duplicates.py --threshold 0.6 --cross-tool
+  python scripts/near_duplicates.py --out _audit/near-duplicates/report.json
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from tool_store import ToolStore
+
+NUM_PERM = 128
+BANDS = 32            # 32 bands × 4 rows: pairs above ~0.4 Jaccard almost always share a bucket
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.7
+MIN_WORDS = 8         # shorter strings (labels, tags) are too small to shingle meaningfully
+
+# Fields that hold identifiers, URLs or numbers rather than prose.
+SKIP_KEYS = {
+    "id", "slug", "logo_url", "affiliate_link", "video_url", "social_links", "icon",
+    "url", "href", "sourceUrl", "image", "src",
+}
+
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+TOOL_PLACEHOLDER = "<tool>"
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64(0xFFFFFFFF)
+_rng = np.random.RandomState(1)
+PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+
+class Document:
+    __slots__ = ("slug", "path", "text", "shingles")
+
+    def __init__(self, slug: str, path: str, text: str, shingles: Set[str]):
+        self.slug = slug
+        self.path = path
+        self.text = text
+        self.shingles = shingles
+
+
+def iter_strings(value: Any, path: str = "") -> Iterable[Tuple[str, str]]:
+    """(path, text) for every string leaf, e.g. ("faqs[2].answer", "...")."""
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from iter_strings(item, f"{path}[{i}]")
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key in SKIP_KEYS:
+                continue
+            yield from iter_strings(item, f"{path}.{key}" if path else key)
+
+
+def name_tokens(tool: Dict[str, Any]) -> Set[str]:
+    names = f"{tool.get('name', '')} {tool.get('slug', '').replace('-', ' ')}".lower()
+    return set(WORD_RE.findall(names)) - {"ai", "io"}
+
+
+def shingle(text: str, masked: Set[str]) -> Tuple[List[str], Set[str]]:
+    words = [TOOL_PLACEHOLDER if w in masked else w for w in WORD_RE.findall(HTML_TAG_RE.sub(" ", text).lower())]
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return words, shingles
+
+
+def build_documents(tools: List[Dict[str, Any]], min_words: int = MIN_WORDS) -> List[Document]:
+    # Fewer than SHINGLE_SIZE words gives no shingles, and an empty set has no MinHash.
+    min_words = max(min_words, SHINGLE_SIZE)
+    documents = []
+    for tool in tools:
+        masked = name_tokens(tool)
+        for path, text in iter_strings(tool):
+            words, shingles = shingle(text, masked)
+            if len(words) >= min_words:
+                documents.append(Document(tool["slug"], path, text, shingles))
+    return documents
+
+
+def minhash(shingles: Set[str]) -> np.ndarray:
+    """NUM_PERM-value MinHash signature of a shingle set."""
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )
+    # (a·x + b) mod p for every permutation × shingle; uint64 wraparound is part of the hash family.
+    permuted = (hashes[None, :] * PERM_A[:, None] + PERM_B[:, None]) % MERSENNE_PRIME & MAX_HASH
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_clusters(documents: List[Document], threshold: float = DEFAULT_THRESHOLD,
+                  cross_tool: bool = False) -> List[Dict[str, Any]]:
+    """Clusters of documents whose shingle sets are at least `threshold` Jaccard-similar."""
+    if not documents:
+        return []
+    signatures = np.stack([minhash(doc.shingles) for doc in documents])
+    rows = NUM_PERM // BANDS
+    uf = UnionFind(len(documents))
+    verified: Dict[Tuple[int, int], float] = {}
+
+    for band in range(BANDS):
+        buckets: Dict[bytes, List[int]] = {}
+        band_slice = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for i in range(len(documents)):
+            buckets.setdefault(band_slice[i].tobytes(), []).append(i)
+        for members in buckets.values():
+            # Compare each member with the bucket's first entry only, so a bucket of k is k-1 checks.
+            head = members[0]
+            for other in members[1:]:
+                if cross_tool and documents[head].slug == documents[other].slug:
+                    continue
+                key = (head, other)
+                if key not in verified:
+                    verified[key] = jaccard(documents[head].shingles, documents[other].shingles)
+                if verified[key] >= threshold:
+                    uf.union(head, other)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(documents)):
+        groups.setdefault(uf.find(i), []).append(i)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        head = documents[members[0]]
+        similarity = min(jaccard(head.shingles, documents[m].shingles) for m in members[1:])
+        slugs = sorted({documents[m].slug for m in members})
+        clusters.append({
+            "size": len(members),
+            "tools": slugs,
+            "crossTool": len(slugs) > 1,
+            "minSimilarity": round(similarity, 3),
+            "sample": head.text[:160],
+            "members": [{"slug": documents[m].slug, "path": documents[m].path} for m in members],
+        })
+    clusters.sort(key=lambda c: (-c["size"], -c["minSimilarity"]))
+    return clusters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect near-duplicate text across tools")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Minimum Jaccard similarity")
+    parser.add_argument("--min-words", type=int, default=MIN_WORDS, help="Ignore strings shorter than this")
+    parser.add_argument("--cross-tool", action="store_true", help="Only report duplicates spanning different tools")
+    parser.add_argument("--out", help="Write the full JSON report to this path")
+    args = parser.parse_args()
+
+    tools = ToolStore().load_tools()
+    documents = build_documents(tools, args.min_words)
+    clusters = find_clusters(documents, args.threshold, args.cross_tool)
+    if args.cross_tool:
+        clusters = [c for c in clusters if c["crossTool"]]
+
+    print(f"🔍 Scanned {len(documents)} text fields across {len(tools)} tools")
+    for cluster in clusters[:20]:
+        where = ", ".join(f"{m['slug']}:{m['path']}" for m in cluster["members"][:4])
+        more = f" (+{cluster['size'] - 4} more)" if cluster["size"] > 4 else ""
+        print(f"  ✗ {cluster['size']}× ≥{cluster['minSimilarity']:.2f}  {where}{more}")
+        print(f"     \"{cluster['sample']}\"")
+    if len(clusters) > 20:
+        print(f"  ... {len(clusters) - 20} more clusters")
+    print(f"\n📊 Clusters: {len(clusters)} ({sum(1 for c in clusters if c['crossTool'])} cross-tool)")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "threshold": args.threshold,
+            "documentCount": len(documents),
+            "clusterCount": len(clusters),
+            "clusters": clusters,
+        }
+        out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"📁 Report written to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
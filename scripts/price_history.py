@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Price observation history in a local SQLite database.
+
+sync_starting_price.py and update_pricing.py overwrite prices in place; every
+run of either now also appends what it saw to .cache/price-history.sqlite:
+one row per (tool, tier, period) with the parsed amount, the raw label, the
+writing script and a timestamp. A run is written as one batched transaction,
+the database uses WAL mode so queries never block a writer, and the
+(tool, tier, period, observed_at) index lets the change and trend queries walk
+each price series in order without sorting.
+
+Usage:
+  python scripts/price_history.py record                 # snapshot the current catalog
+  python scripts/price_history.py changes --days 30
+  python scripts/price_history.py trend --slug heygen
+  python scripts/price_history.py stats
+"""
+
+import argparse
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from slug_registry import resolve_slug
+from tool_store import PROJECT_ROOT, ToolStore
+
+DB_PATH = PROJECT_ROOT / ".cache" / "price-history.sqlite"
+
+AMOUNT_RE = re.compile(r"\$\s?(\d[\d,]*(?:\.\d+)?)")
+PERIOD_SUFFIXES = (("/mo", "monthly"), ("/month", "monthly"), ("/yr", "annual"), ("/year", "annual"))
+FREE_LABELS = {"free", "$0", "0"}
+
+# Which parts of a tool to observe; the pricing scripts each pass the one they write.
+FIELDS = ("starting_price", "pricing_plans", "pricing")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    observed_at TEXT NOT NULL,
+    observation_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    tool TEXT NOT NULL,
+    tier TEXT NOT NULL,
+    period TEXT NOT NULL,
+    amount REAL,
+    currency TEXT,
+    raw TEXT,
+    source TEXT NOT NULL,
+    observed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_observations_series ON observations (tool, tier, period, observed_at);
+CREATE INDEX IF NOT EXISTS idx_observations_time ON observations (observed_at);
+"""
+
+# Each row next to the previous observation of the same series.
+SERIES_SQL = """
+SELECT tool, tier, period, amount, currency, raw, observed_at,
+       LAG(amount) OVER w AS prev_amount,
+       LAG(raw) OVER w AS prev_raw,
+       LAG(observed_at) OVER w AS prev_at
+FROM observations
+{where}
+WINDOW w AS (PARTITION BY tool, tier, period ORDER BY observed_at, id)
+"""
+
+Observation = Tuple[str, str, str, Optional[float], Optional[str], str]
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def parse_amount(label: Any) -> Optional[float]:
+    """'$28/mo' → 28.0, 'Free' → 0.0, 'Custom' → None."""
+    if isinstance(label, (int, float)) and not isinstance(label, bool):
+        return float(label)
+    if not isinstance(label, str):
+        return None
+    if label.strip().lower() in FREE_LABELS:
+        return 0.0
+    match = AMOUNT_RE.search(label)
+    return float(match.group(1).replace(",", "")) if match else None
+
+
+def label_period(label: str, default: str = "monthly") -> str:
+    lowered = label.lower()
+    for suffix, period in PERIOD_SUFFIXES:
+        if suffix in lowered:
+            return period
+    return default
+
+
+def tool_observations(tool: Dict[str, Any], fields: Iterable[str] = FIELDS) -> Iterator[Observation]:
+    """(tier, period, amount, currency, raw) rows for one tool, prefixed with its slug."""
+    slug = tool["slug"]
+    fields = set(fields)
+
+    starting_price = tool.get("starting_price")
+    if "starting_price" in fields and isinstance(starting_price, str) and starting_price.strip():
+        yield slug, "starting_price", label_period(starting_price), parse_amount(starting_price), "USD", starting_price
+
+    if "pricing_plans" in fields:
+        for plan in tool.get("pricing_plans") or []:
+            name = plan.get("name") or "?"
+            price = plan.get("price")
+            if isinstance(price, dict):
+                # {"monthly": {"amount": 35, ...}, "yearly": {"amount": 28, "period": "month"}}
+                for billing, value in price.items():
+                    if isinstance(value, dict):
+                        amount = parse_amount(value.get("amount"))
+                        raw = f"{value.get('amount')}/{value.get('period', '')}"
+                        yield slug, name, billing, amount, value.get("currency"), raw
+            elif isinstance(price, str) and price.strip():
+                raw = f"{price}{plan.get('period') or ''}"
+                yield slug, name, label_period(raw), parse_amount(price), "USD", raw
+
+    pricing = tool.get("pricing")
+    if "pricing" in fields and isinstance(pricing, dict):
+        for tier in pricing.get("tiers") or []:
+            for period in ("monthly", "annual"):
+                label = tier.get(period)
+                if isinstance(label, str) and label.strip():
+                    yield slug, tier.get("name") or "?", f"tiers.{period}", parse_amount(label), "USD", label
+
+
+class PriceHistory:
+    def __init__(self, path: Path = DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "PriceHistory":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # Writes -----------------------------------------------------------
+
+    def record_tools(self, tools: Iterable[Dict[str, Any]], source: str, fields: Iterable[str] = FIELDS,
+                     observed_at: Optional[str] = None) -> int:
+        """Append one run's observations in a single transaction. Returns the row count."""
+        observed_at = observed_at or utc_now()
+        fields = tuple(fields)
+        rows = [obs for tool in tools for obs in tool_observations(tool, fields)]
+        with self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO runs (source, observed_at, observation_count) VALUES (?, ?, ?)",
+                (source, observed_at, len(rows)),
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO observations (run_id, tool, tier, period, amount, currency, raw, source, observed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, *row, source, observed_at) for row in rows],
+            )
+        return len(rows)
+
+    # Queries ----------------------------------------------------------
+
+    def changes(self, since: str, slug: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Observations since `since` whose amount or label differs from the series' previous one."""
+        where = "WHERE tool = ?" if slug else ""
+        params: Tuple[Any, ...] = (slug,) if slug else ()
+        sql = (
+            f"SELECT * FROM ({SERIES_SQL.format(where=where)}) "
+            "WHERE observed_at >= ? AND prev_at IS NOT NULL "
+            "AND (amount IS NOT prev_amount OR raw IS NOT prev_raw) "
+            "ORDER BY observed_at DESC, tool, tier, period"
+        )
+        return [dict(row) for row in self.conn.execute(sql, (*params, since))]
+
+    def trend(self, slug: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per series: first and latest amount in the window, number of changes, percent change."""
+        conditions = []
+        params: List[Any] = []
+        if slug:
+            conditions.append("tool = ?")
+            params.append(slug)
+        if since:
+            conditions.append("observed_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"""
+            SELECT tool, tier, period,
+                   COUNT(*) AS observations,
+                   SUM(CASE WHEN prev_at IS NOT NULL AND amount IS NOT prev_amount THEN 1 ELSE 0 END) AS changes,
+                   MIN(observed_at) AS first_at,
+                   MAX(observed_at) AS last_at,
+                   MIN(amount) AS min_amount,
+                   MAX(amount) AS max_amount
+            FROM ({SERIES_SQL.format(where=where)})
+            GROUP BY tool, tier, period
+            ORDER BY tool, tier, period
+        """
+        series = [dict(row) for row in self.conn.execute(sql, params)]
+        # First/last amounts come from the covering index in one ordered pass.
+        ends = {}
+        for row in self.conn.execute(
+            f"SELECT tool, tier, period, amount FROM observations {where} ORDER BY tool, tier, period, observed_at, id",
+            params,
+        ):
+            key = (row["tool"], row["tier"], row["period"])
+            ends.setdefault(key, [row["amount"], row["amount"]])[1] = row["amount"]
+        for item in series:
+            first, last = ends[(item["tool"], item["tier"], item["period"])]
+            item["first_amount"], item["last_amount"] = first, last
+            item["change_pct"] = round((last - first) / first * 100, 1) if first and last is not None else None
+        return series
+
+    def stats(self) -> Dict[str, Any]:
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS observations, COUNT(DISTINCT tool) AS tools,"
+            " MIN(observed_at) AS first_at, MAX(observed_at) AS last_at FROM observations"
+        ).fetchone()
+        result = dict(row)
+        result["runs"] = self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        return result
+
+
+def record_observations(tools: Iterable[Dict[str, Any]], source: str, fields: Iterable[str] = FIELDS) -> int:
+    """Called by the pricing scripts after each run."""
+    with PriceHistory() as history:
+        return history.record_tools(tools, source, fields)
+
+
+def _format_amount(amount: Optional[float]) -> str:
+    return "n/a" if amount is None else f"${amount:g}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the price observation history")
+    parser.add_argument("--db", default=str(DB_PATH))
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("record", help="Record the current catalog prices")
+    changes = sub.add_parser("changes", help="Price changes in the last N days")
+    changes.add_argument("--days", type=int, default=30)
+    changes.add_argument("--slug")
+    trend = sub.add_parser("trend", help="Per-series price trend")
+    trend.add_argument("--slug")
+    trend.add_argument("--days", type=int, help="Only consider the last N days")
+    sub.add_parser("stats", help="Database summary")
+    args = parser.parse_args()
+    if getattr(args, "slug", None):
+        args.slug = resolve_slug(args.slug, fuzzy=True)
+
+    with PriceHistory(Path(args.db)) as history:
+        if args.command == "record":
+            tools = ToolStore().load_tools()
+            count = history.record_tools(tools, "price_history")
+            print(f"✅ Recorded {count} observations for {len(tools)} tools")
+        elif args.command == "changes":
+            since = (datetime.now(timezone.utc) - timedelta(days=args.days)).isoformat(timespec="seconds")
+            rows = history.changes(since, args.slug)
+            print(f"🔍 {len(rows)} price changes in the last {args.days} days")
+            for row in rows:
+                print(f"  {row['observed_at'][:10]}  {row['tool']:<16} {row['tier']:<16} {row['period']:<14} "
+                      f"{row['prev_raw']} → {row['raw']}")
+        elif args.command == "trend":
+            since = None
+            if args.days:
+                since = (datetime.now(timezone.utc) - timedelta(days=args.days)).isoformat(timespec="seconds")
+            for row in history.trend(args.slug, since):
+                pct = "" if row["change_pct"] is None else f" ({row['change_pct']:+g}%)"
+                print(f"  {row['tool']:<16} {row['tier']:<16} {row['period']:<14} "
+                      f"{_format_amount(row['first_amount'])} → {_format_amount(row['last_amount'])}{pct}"
+                      f"  {row['changes']} changes / {row['observations']} obs")
+        else:
+            stats = history.stats()
+            print(f"📊 {stats['observations']} observations of {stats['tools']} tools over {stats['runs']} runs")
+            print(f"   {stats['first_at']} → {stats['last_at']}")
+            print(f"📁 {history.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Rank alternatives for every tool in one vectorized pass.
+
+Each tool becomes a set of vectors built from tools.json:
+  - tags, categories and feature keywords (one-hot, L2-normalized)
+  - log starting price
+  - a quality score from rating and the *_score fields
+
+Cosine similarities for all pairs come from one matrix product per block, the
+blocks are blended with WEIGHTS, and the top-k candidates per tool are picked
+with argpartition. Every pick keeps its per-component contribution, so the
+ordering can be explained (and audited) instead of curated by hand.
+
+Usage:
+  python scripts/rank_alternatives.py
+  python scripts/rank_alternatives.py --slug heygen --k 8
+  python scripts/rank_alternatives.py --out _audit/alternatives-rank/ranking.json
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from reconcile_tools import parse_amount
+from slug_registry import resolve_slug
+from tool_store import ToolStore
+
+DEFAULT_K = 5
+
+# Contribution of each component to the final score (sums to 1).
+WEIGHTS = {
+    "tags": 0.30,
+    "categories": 0.20,
+    "features": 0.20,
+    "price": 0.15,
+    "quality": 0.15,
+}
+
+# Price similarity halves for roughly every 2x difference in starting price.
+PRICE_SCALE = np.log(2.0)
+SCORE_FIELDS = ("output_quality_score", "ease_of_use_score", "speed_score", "price_score")
+EXCLUDED_PRICING_MODELS = {"Discontinued"}
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = {"a", "an", "and", "ai", "for", "in", "of", "on", "the", "to", "with", "video", "videos"}
+
+
+def feature_keywords(tool: Dict[str, Any]) -> List[str]:
+    words = set()
+    for feature in tool.get("features") or []:
+        words.update(w for w in WORD_RE.findall(str(feature).lower()) if w not in STOPWORDS and len(w) > 2)
+    return sorted(words)
+
+
+def one_hot(rows: List[List[str]]) -> Tuple[np.ndarray, List[str]]:
+    """Row-normalized indicator matrix (tools × vocabulary) plus the vocabulary."""
+    vocabulary = sorted({term for row in rows for term in row})
+    position = {term: i for i, term in enumerate(vocabulary)}
+    matrix = np.zeros((len(rows), len(vocabulary)), dtype=np.float32)
+    for i, row in enumerate(rows):
+        matrix[i, [position[term] for term in row]] = 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix, vocabulary
+
+
+def quality_vector(tools: List[Dict[str, Any]]) -> np.ndarray:
+    """0..1 quality per tool: mean of rating/5 and the available *_score/10 fields."""
+    values = np.full((len(tools), len(SCORE_FIELDS) + 1), np.nan, dtype=np.float32)
+    for i, tool in enumerate(tools):
+        if isinstance(tool.get("rating"), (int, float)):
+            values[i, 0] = tool["rating"] / 5.0
+        for j, field in enumerate(SCORE_FIELDS, start=1):
+            if isinstance(tool.get(field), (int, float)):
+                values[i, j] = tool[field] / 10.0
+    counts = np.sum(~np.isnan(values), axis=1)
+    totals = np.nansum(values, axis=1)
+    return np.divide(totals, counts, out=np.zeros(len(tools), dtype=np.float32), where=counts > 0)
+
+
+def price_vector(tools: List[Dict[str, Any]]) -> np.ndarray:
+    """log(1 + starting price); NaN where the price can't be parsed."""
+    prices = [parse_amount(tool.get("starting_price")) for tool in tools]
+    return np.array([np.log1p(p) if p is not None else np.nan for p in prices], dtype=np.float32)
+
+
+class AlternativesRanker:
+    """Similarity matrices for a catalog, computed once; rankings read from them."""
+
+    def __init__(self, tools: List[Dict[str, Any]], weights: Optional[Dict[str, float]] = None):
+        self.tools = tools
+        self.slugs = [tool["slug"] for tool in tools]
+        self.weights = dict(WEIGHTS if weights is None else weights)
+
+        self.tag_sets = [sorted(set(tool.get("tags") or [])) for tool in tools]
+        self.category_sets = [sorted(set(tool.get("categories") or [])) for tool in tools]
+        tags, _ = one_hot(self.tag_sets)
+        categories, _ = one_hot(self.category_sets)
+        features, _ = one_hot([feature_keywords(tool) for tool in tools])
+
+        log_price = price_vector(tools)
+        price_gap = np.abs(log_price[:, None] - log_price[None, :])
+        # Unknown prices count as neither similar nor dissimilar.
+        price = np.where(np.isnan(price_gap), 0.5, np.exp(-price_gap / PRICE_SCALE)).astype(np.float32)
+
+        self.quality = quality_vector(tools)
+        n = len(tools)
+        self.components = {
+            "tags": tags @ tags.T,
+            "categories": categories @ categories.T,
+            "features": features @ features.T,
+            "price": price,
+            # Candidate quality: same column value for every row.
+            "quality": np.broadcast_to(self.quality[None, :], (n, n)),
+        }
+
+        total = np.zeros((n, n), dtype=np.float32)
+        for name, matrix in self.components.items():
+            total += self.weights.get(name, 0.0) * matrix
+        np.fill_diagonal(total, -np.inf)
+        excluded = np.array([tool.get("pricing_model") in EXCLUDED_PRICING_MODELS for tool in tools])
+        total[:, excluded] = -np.inf
+        self.scores = total
+
+    def top_k_indices(self, k: int = DEFAULT_K) -> np.ndarray:
+        """(tools × k) candidate indices, best first, for every tool at once."""
+        n = len(self.slugs)
+        k = min(k, n - 1)
+        if k <= 0:
+            return np.empty((n, 0), dtype=np.intp)
+        part = np.argpartition(-self.scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(self.scores, part, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(part, order, axis=1)
+
+    def explain(self, i: int, j: int) -> Dict[str, Any]:
+        breakdown = {
+            name: round(float(self.weights.get(name, 0.0) * matrix[i, j]), 4)
+            for name, matrix in self.components.items()
+        }
+        return {
+            "slug": self.slugs[j],
+            "score": round(float(self.scores[i, j]), 4),
+            "breakdown": breakdown,
+            "sharedTags": sorted(set(self.tag_sets[i]) & set(self.tag_sets[j])),
+            "sharedCategories": sorted(set(self.category_sets[i]) & set(self.category_sets[j])),
+        }
+
+    def rank_all(self, k: int = DEFAULT_K) -> Dict[str, List[Dict[str, Any]]]:
+        top = self.top_k_indices(k)
+        return {
+            slug: [self.explain(i, int(j)) for j in top[i] if np.isfinite(self.scores[i, j])]
+            for i, slug in enumerate(self.slugs)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank alternatives for every tool")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="Alternatives per tool")
+    parser.add_argument("--slug", help="Only print this tool's ranking")
+    parser.add_argument("--out", help="Write the full ranking JSON to this path")
+    args = parser.parse_args()
+
+    tools = ToolStore().load_tools()
+    ranker = AlternativesRanker(tools)
+    ranking = ranker.rank_all(args.k)
+
+    if args.slug:
+        args.slug = resolve_slug(args.slug, fuzzy=True)
+        if args.slug not in ranking:
+            print(f"❌ Unknown tool slug: {args.slug}")
+            raise SystemExit(1)
+        print(f"🏆 Alternatives for {args.slug}")
+        for rank, pick in enumerate(ranking[args.slug], start=1):
+            parts = ", ".join(f"{name} {value:.2f}" for name, value in pick["breakdown"].items())
+            print(f"  {rank}. {pick['slug']:<14} {pick['score']:.3f}  ({parts})")
+    else:
+        print(f"🏆 Ranked top {args.k} alternatives for {len(ranking)} tools")
+        for slug, picks in ranking.items():
+            print(f"  {slug:<14} → {', '.join(pick['slug'] for pick in picks)}")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        report = {"k": args.k, "weights": ranker.weights, "alternatives": ranking}
+        out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"📁 Ranking written to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
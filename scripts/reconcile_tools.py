@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Cross-store consistency checker for tool data.
+
+The same tool is described in four places, under slugs that don't always line up:
+  - src/data/tools.json (via the tool shards)          → store "catalog"
+  - content/tools/<slug>.json                          → store "content"
+  - data/evidence/<slug>.json                          → store "evidence"
+  - data/non-price-evidence-import/tools/<slug>.json   → store "import"
+
+Every store is read once into a dict keyed by canonical slug, then the dicts are
+hash-joined on that key. Cost is linear in the number of files, so the check can
+run on every commit.
+
+Usage:
+  python scripts/reconcile_tools.py
+  python scripts/reconcile_tools.py --out _audit/consistency/report.json --strict
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from slug_registry import SlugRegistry, load_slug_map
+from tool_store import PROJECT_ROOT, ToolStore
+
+CONTENT_DIR = PROJECT_ROOT / "content" / "tools"
+EVIDENCE_DIR = PROJECT_ROOT / "data" / "evidence"
+IMPORT_DIR = PROJECT_ROOT / "data" / "non-price-evidence-import" / "tools"
+
+STORES = ("catalog", "content", "evidence", "import")
+
+PRICE_RE = re.compile(r"\$\s?(\d+(?:\.\d+)?)")
+FREE_PLAN_RE = re.compile(r"\bfree (?:plan|tier)\b", re.IGNORECASE)
+NO_FREE_PLAN_RE = re.compile(r"\bno free (?:plan|tier)\b", re.IGNORECASE)
+FREE_PRICE_LABELS = {"free", "$0", "0"}
+
+# A fact is (value, where it came from).
+Fact = Tuple[Any, str]
+Facts = Dict[str, Fact]
+
+
+# ----------------------------------------------------------------------
+# Per-store fact extraction
+# ----------------------------------------------------------------------
+
+def parse_amount(value: Any) -> Optional[float]:
+    """'$28/mo' → 28.0, 28 → 28.0, 'Custom' → None."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        match = PRICE_RE.search(value)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def plan_amounts(plan: Dict[str, Any]) -> List[float]:
+    """All amounts a pricing plan lists (string prices or per-period objects)."""
+    price = plan.get("price")
+    if isinstance(price, dict):
+        amounts = [parse_amount(period.get("amount")) for period in price.values() if isinstance(period, dict)]
+        return [amount for amount in amounts if amount is not None]
+    amount = parse_amount(price)
+    if amount is None and isinstance(price, str) and price.strip().lower() in FREE_PRICE_LABELS:
+        return [0.0]
+    return [] if amount is None else [amount]
+
+
+def host_of(url: str) -> Optional[str]:
+    host = urlparse(url.strip()).hostname if url else None
+    if not host:
+        return None
+    return host[4:] if host.startswith("www.") else host
+
+
+def root_domain(host: str) -> str:
+    return ".".join(host.split(".")[-2:])
+
+
+def iter_urls(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_urls(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_urls(item)
+
+
+def catalog_facts(tool: Dict[str, Any]) -> Facts:
+    facts: Facts = {}
+    starting_price = tool.get("starting_price")
+    amount = parse_amount(starting_price)
+    if amount is not None:
+        facts["starting_price"] = (amount, f"starting_price={starting_price!r}")
+
+    plans = tool.get("pricing_plans") or []
+    paid = sorted({a for plan in plans for a in plan_amounts(plan) if a > 0})
+    if paid:
+        facts["plan_prices"] = (paid, "pricing_plans")
+    if plans:
+        has_free = any(0.0 in plan_amounts(plan) for plan in plans)
+        facts["free_plan"] = (has_free, "pricing_plans")
+
+    model = tool.get("pricing_model")
+    if model in ("Freemium", "Subscription"):
+        facts["free_plan_model"] = (model == "Freemium", f"pricing_model={model!r}")
+    return facts
+
+
+def evidence_facts(evidence: Dict[str, Any]) -> Facts:
+    facts: Facts = {}
+    nuggets = evidence.get("nuggets") or evidence.get("finalEvidence", {}).get("nuggets") or []
+
+    prices: Set[float] = set()
+    free_plan: Optional[bool] = None
+    for nugget in nuggets:
+        text = nugget.get("text", "")
+        if nugget.get("theme") == "pricing":
+            prices.update(float(m) for m in PRICE_RE.findall(text))
+        if NO_FREE_PLAN_RE.search(text):
+            free_plan = False
+        elif free_plan is None and FREE_PLAN_RE.search(text):
+            free_plan = True
+    if prices:
+        facts["price_mentions"] = (sorted(prices), "nuggets[theme=pricing]")
+    if free_plan is not None:
+        facts["free_plan"] = (free_plan, "nuggets")
+
+    sources = evidence.get("sources") or evidence.get("finalEvidence", {}).get("sources") or {}
+    hosts = {host_of(url) for url in iter_urls(sources)}
+    hosts.discard(None)
+    if hosts:
+        facts["source_hosts"] = (sorted(hosts), "sources")
+    return facts
+
+
+def import_facts(bundle: Dict[str, Any]) -> Facts:
+    facts: Facts = {}
+    host = (bundle.get("officialHost") or "").strip()
+    if host:
+        facts["official_host"] = (host[4:] if host.startswith("www.") else host, "officialHost")
+    return facts
+
+
+# ----------------------------------------------------------------------
+# Load + join
+# ----------------------------------------------------------------------
+
+# canonical slug → store → [(path, facts)]
+Joined = Dict[str, Dict[str, List[Tuple[str, Facts]]]]
+
+
+def _add(joined: Joined, canonical: str, store: str, path: str, facts: Facts) -> None:
+    joined.setdefault(canonical, {}).setdefault(store, []).append((path, facts))
+
+
+def _read_json(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_joined(store: Optional[ToolStore] = None) -> Tuple[Joined, SlugRegistry]:
+    """Read every store once and bucket its records by canonical slug."""
+    store = store or ToolStore()
+    tools = store.load_tools()
+    resolver = SlugRegistry(tools, load_slug_map())
+    joined: Joined = {}
+
+    for tool in tools:
+        _add(joined, tool["slug"], "catalog", f"src/data/tool-shards/{tool['slug']}.json", catalog_facts(tool))
+
+    for path in sorted(CONTENT_DIR.glob("*.json")):
+        # Editorial overlays carry no comparable pricing fields; they only count towards coverage.
+        _add(joined, resolver.resolve(path.stem), "content", str(path.relative_to(PROJECT_ROOT)), {})
+
+    for path in sorted(EVIDENCE_DIR.glob("*.json")):
+        if path.name.endswith(".evidence.json"):
+            continue
+        evidence = _read_json(path)
+        raw_slug = evidence.get("slug") or evidence.get("tool") or path.stem
+        _add(joined, resolver.resolve(raw_slug), "evidence", str(path.relative_to(PROJECT_ROOT)), evidence_facts(evidence))
+
+    for path in sorted(IMPORT_DIR.glob("*.json")):
+        bundle = _read_json(path)
+        _add(joined, resolver.resolve(bundle.get("slug") or path.stem), "import", str(path.relative_to(PROJECT_ROOT)), import_facts(bundle))
+
+    return joined, resolver
+
+
+def _fact(records: Dict[str, List[Tuple[str, Facts]]], store: str, field: str) -> Optional[Tuple[Any, str, str]]:
+    for path, facts in records.get(store, []):
+        if field in facts:
+            value, origin = facts[field]
+            return value, origin, path
+    return None
+
+
+def check_tool(slug: str, records: Dict[str, List[Tuple[str, Facts]]]) -> List[Dict[str, Any]]:
+    """Run the field checks for one joined tool. Each issue names both sides of the conflict."""
+    issues: List[Dict[str, Any]] = []
+
+    def issue(kind: str, message: str, *sides: Optional[Tuple[Any, str, str]]) -> None:
+        issues.append({
+            "slug": slug,
+            "kind": kind,
+            "message": message,
+            "sides": [{"value": s[0], "origin": s[1], "file": s[2]} for s in sides if s],
+        })
+
+    for store, entries in records.items():
+        if len(entries) > 1:
+            issue("duplicate_files", f"{len(entries)} {store} files resolve to '{slug}': "
+                  + ", ".join(path for path, _ in entries))
+
+    if "catalog" not in records:
+        issue("missing_in_catalog", f"present in {', '.join(sorted(records))} but not in tools.json")
+        return issues
+
+    starting = _fact(records, "catalog", "starting_price")
+    plan_prices = _fact(records, "catalog", "plan_prices")
+    if starting and plan_prices and starting[0] not in plan_prices[0]:
+        issue("starting_price", f"starting_price {starting[0]:g} matches no paid plan amount {plan_prices[0]}",
+              starting, plan_prices)
+
+    mentions = _fact(records, "evidence", "price_mentions")
+    if starting and mentions and starting[0] not in mentions[0]:
+        issue("starting_price", f"starting_price {starting[0]:g} never appears in pricing evidence {mentions[0]}",
+              starting, mentions)
+
+    free_sides = [
+        _fact(records, "catalog", "free_plan"),
+        _fact(records, "catalog", "free_plan_model"),
+        _fact(records, "evidence", "free_plan"),
+    ]
+    known = [side for side in free_sides if side]
+    if len({side[0] for side in known}) > 1:
+        issue("free_plan", "free-plan flags disagree: "
+              + ", ".join(f"{side[1]} → {side[0]}" for side in known), *known)
+
+    official = _fact(records, "import", "official_host")
+    hosts = _fact(records, "evidence", "source_hosts")
+    if official and hosts and root_domain(official[0]) not in {root_domain(h) for h in hosts[0]}:
+        issue("official_host", f"import officialHost {official[0]} not among evidence source hosts",
+              official, hosts)
+
+    return issues
+
+
+def reconcile(store: Optional[ToolStore] = None) -> Dict[str, Any]:
+    joined, _ = load_joined(store)
+    issues: List[Dict[str, Any]] = []
+    for slug in sorted(joined):
+        issues.extend(check_tool(slug, joined[slug]))
+
+    coverage = {
+        slug: [name for name in STORES if name in records]
+        for slug, records in sorted(joined.items())
+    }
+    counts: Dict[str, int] = {}
+    for item in issues:
+        counts[item["kind"]] = counts.get(item["kind"], 0) + 1
+
+    return {
+        "toolCount": len(joined),
+        "issueCount": len(issues),
+        "issueCounts": counts,
+        "coverage": coverage,
+        "issues": issues,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check tool data consistency across stores")
+    parser.add_argument("--out", help="Write the full JSON report to this path")
+    parser.add_argument("--strict", action="store_true", help="Exit non-zero when any issue is found")
+    args = parser.parse_args()
+
+    report = reconcile()
+
+    print(f"🔍 Reconciled {report['toolCount']} tools across {', '.join(STORES)}")
+    for item in report["issues"]:
+        print(f"  ✗ [{item['kind']}] {item['slug']}: {item['message']}")
+    if not report["issues"]:
+        print("  ✓ No conflicts found")
+    print(f"\n📊 Issues: {report['issueCount']} {report['issueCounts']}")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"📁 Report written to {out_path}")
+
+    if args.strict and report["issues"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Plan and run refetch rounds from the import bundle's gap reports.
+
+Jobs come from data/non-price-evidence-import/next-fetch-targets.json. Each is
+scored by the weight of the tool's unresolved fields (missing-fields-summary.json),
+boosted when the URL looks like the page that answers one of those fields
+(/terms for usage rights, /faq for watermarks, ...), plus how stale the
+tool's newest cached page is. Jobs sit in a heapq priority queue; a bounded
+thread pool pops the best job whose domain is not rate limited right now.
+
+URLs already cached in scripts/cache (any tool directory, matched by the
+cache.ts URL hash) are skipped unless --force. Fetched pages are written in the
+cache.ts layout: scripts/cache/<slug>/<type>-<hash>.html plus .snapshot.json.
+
+Usage:
+  python scripts/refetch_scheduler.py --dry-run
+  python scripts/refetch_scheduler.py --limit 10 --workers 4 --domain-interval 2
+  python scripts/refetch_scheduler.py --host-override http://127.0.0.1:8765   # local stub server
+"""
+
+import argparse
+import heapq
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from extract_cache_text import html_to_text
+from slug_registry import normalize_slug, resolve_slug
+from tool_store import PROJECT_ROOT, write_text_atomic
+from verify_quotes import CACHE_DIR, build_page_index, url_hash
+
+IMPORT_DIR = PROJECT_ROOT / "data" / "non-price-evidence-import"
+TARGETS_PATH = IMPORT_DIR / "next-fetch-targets.json"
+MISSING_PATH = IMPORT_DIR / "missing-fields-summary.json"
+
+FETCH_WORKERS = 4
+FETCH_TIMEOUT = 20  # seconds
+DOMAIN_INTERVAL = 2.0  # seconds between requests to one host
+USER_AGENT = "best-ai-video-refetch/1.0"
+
+# How much an unresolved field is worth; unknown fields count 1.
+FIELD_WEIGHTS = {
+    "policy.commercialUse": 3.0,
+    "policy.usageRights": 3.0,
+    "policy.watermark": 2.5,
+    "policy.exportLimits": 2.0,
+    "policy.refundCancellation": 1.5,
+    "mainLimitations": 1.5,
+}
+# URL path words that suggest a page answers a field.
+FIELD_HINTS = {
+    "policy.commercialUse": ("terms", "license", "licensing", "commercial", "legal", "faq", "pricing"),
+    "policy.usageRights": ("terms", "license", "licensing", "rights", "legal"),
+    "policy.watermark": ("watermark", "faq", "pricing", "help"),
+    "policy.exportLimits": ("export", "pricing", "faq", "limits", "help"),
+    "policy.refundCancellation": ("refund", "cancel", "billing", "terms"),
+    "mainLimitations": ("faq", "help", "limits", "docs"),
+}
+HINT_BOOST = 0.5        # per matched field, relative to the field's weight
+STALENESS_PER_DAY = 1 / 30
+MAX_STALENESS = 3.0     # a tool with nothing cached scores this much
+
+
+# ----------------------------------------------------------------------
+# Planning
+# ----------------------------------------------------------------------
+
+def _read_json(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def missing_fields_by_tool(summary: Dict[str, Any]) -> Dict[str, List[str]]:
+    """missing-fields-summary.json is field → tools; invert it."""
+    by_tool: Dict[str, List[str]] = {}
+    for field, info in summary.get("fields", {}).items():
+        for slug in info.get("tools", []):
+            by_tool.setdefault(slug, []).append(field)
+    return by_tool
+
+
+def page_type(url: str) -> str:
+    """cache.ts-style page type from the URL path: /features/ai-avatars → features-ai-avatars."""
+    path = urlsplit(url).path.strip("/")
+    return (normalize_slug(path.replace("/", "-")) or "home")[:60].rstrip("-")
+
+
+def cache_ages(cache_dir: Path) -> Dict[str, float]:
+    """slug → days since its newest cached page (snapshot fetchedAt, else file mtime)."""
+    now = time.time()
+    newest: Dict[str, float] = {}
+    for path in cache_dir.glob("*/*.html"):
+        stamp = path.stat().st_mtime
+        snapshot = path.with_name(path.name[:-len(".html")] + ".snapshot.json")
+        if snapshot.exists():
+            try:
+                fetched_at = _read_json(snapshot).get("fetchedAt")
+                stamp = datetime.fromisoformat(fetched_at.replace("Z", "+00:00")).timestamp()
+            except (ValueError, AttributeError, json.JSONDecodeError):
+                pass
+        slug = path.parent.name
+        newest[slug] = max(newest.get(slug, 0.0), stamp)
+    return {slug: (now - stamp) / 86400 for slug, stamp in newest.items()}
+
+
+def score_job(url: str, fields: List[str], age_days: Optional[float]) -> Tuple[float, List[str]]:
+    """Priority of one URL and the missing fields it is likely to answer."""
+    words = set(normalize_slug(urlsplit(url).path.replace("/", "-")).split("-"))
+    hinted = [field for field in fields if words & set(FIELD_HINTS.get(field, ()))]
+    weight = sum(FIELD_WEIGHTS.get(field, 1.0) for field in fields)
+    weight += HINT_BOOST * sum(FIELD_WEIGHTS.get(field, 1.0) for field in hinted)
+    staleness = MAX_STALENESS if age_days is None else min(MAX_STALENESS, age_days * STALENESS_PER_DAY)
+    return round(weight + staleness, 4), hinted
+
+
+def plan_jobs(targets: Dict[str, Any], summary: Dict[str, Any], cache_dir: Path = CACHE_DIR,
+              force: bool = False) -> Tuple[List[Tuple[float, int, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Build the priority heap. Returns (heap, skipped jobs)."""
+    missing = missing_fields_by_tool(summary)
+    cached = set() if force else set(build_page_index(cache_dir))
+    ages = cache_ages(cache_dir)
+    heap: List[Tuple[float, int, Dict[str, Any]]] = []
+    skipped: List[Dict[str, Any]] = []
+    seen = set()
+
+    for entry in targets.get("tools", []):
+        import_slug = entry["slug"]
+        slug = resolve_slug(import_slug)
+        fields = missing.get(import_slug, [])
+        for target in entry.get("targets", []):
+            url = target["url"]
+            if url in seen:
+                continue
+            seen.add(url)
+            priority, hinted = score_job(url, fields, ages.get(slug))
+            job = {
+                "slug": slug,
+                "importSlug": import_slug,
+                "url": url,
+                "type": page_type(url),
+                "hash": url_hash(url),
+                "priority": priority,
+                "fields": hinted,
+                "domain": urlsplit(url).hostname or "",
+            }
+            if job["hash"] in cached:
+                skipped.append({**job, "status": "cached"})
+                continue
+            heapq.heappush(heap, (-priority, len(seen), job))
+    return heap, skipped
+
+
+# ----------------------------------------------------------------------
+# Running
+# ----------------------------------------------------------------------
+
+class Scheduler:
+    """Workers pop the highest-priority job whose domain is free; per-domain spacing is enforced here."""
+
+    def __init__(self, heap: List[Tuple[float, int, Dict[str, Any]]], domain_interval: float = DOMAIN_INTERVAL):
+        self.heap = heap
+        self.domain_interval = domain_interval
+        self.next_allowed: Dict[str, float] = {}
+        self.cond = threading.Condition()
+
+    def next_job(self) -> Optional[Dict[str, Any]]:
+        with self.cond:
+            while self.heap:
+                now = time.monotonic()
+                deferred = []
+                job = None
+                while self.heap:
+                    item = heapq.heappop(self.heap)
+                    if self.next_allowed.get(item[2]["domain"], 0.0) <= now:
+                        job = item[2]
+                        break
+                    deferred.append(item)
+                for item in deferred:
+                    heapq.heappush(self.heap, item)
+                if job is not None:
+                    self.next_allowed[job["domain"]] = now + self.domain_interval
+                    return job
+                wake = min(self.next_allowed[item[2]["domain"]] for item in deferred)
+                self.cond.wait(timeout=max(0.0, wake - now))
+            return None
+
+
+def rewrite_host(url: str, host_override: Optional[str]) -> str:
+    """Send the request to host_override (scheme://host:port) but keep the original path and query."""
+    if not host_override:
+        return url
+    parts = urlsplit(url)
+    return host_override.rstrip("/") + (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+
+def fetch_job(job: Dict[str, Any], cache_dir: Path, host_override: Optional[str]) -> Dict[str, Any]:
+    """Fetch one page and store it the way cache.ts saveHtml()/saveSnapshot() do."""
+    request_url = rewrite_host(job["url"], host_override)
+    started = time.perf_counter()
+    try:
+        response = requests.get(request_url, headers={"User-Agent": USER_AGENT}, timeout=FETCH_TIMEOUT)
+    except requests.RequestException as e:
+        return {**job, "status": "failed", "error": str(e)}
+    elapsed = round(time.perf_counter() - started, 3)
+    if response.status_code != 200:
+        return {**job, "status": "failed", "error": f"HTTP {response.status_code}", "seconds": elapsed}
+
+    html = response.text
+    text = html_to_text(html)
+    tool_dir = cache_dir / job["slug"]
+    stem = f"{job['type']}-{job['hash']}"
+    write_text_atomic(tool_dir / f"{stem}.html", html)
+    snapshot = {
+        "rawHtml": html,
+        "text": text,
+        "sourceUrl": job["url"],
+        "fetchedAt": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        "extractedTextLen": len(text),
+        "renderMode": "fetch",
+    }
+    write_text_atomic(tool_dir / f"{stem}.snapshot.json", json.dumps(snapshot, indent=2, ensure_ascii=False))
+    return {**job, "status": "fetched", "bytes": len(html), "seconds": elapsed}
+
+
+def run_round(heap: List[Tuple[float, int, Dict[str, Any]]], cache_dir: Path = CACHE_DIR,
+              workers: int = FETCH_WORKERS, domain_interval: float = DOMAIN_INTERVAL,
+              host_override: Optional[str] = None) -> List[Dict[str, Any]]:
+    scheduler = Scheduler(heap, domain_interval)
+    results: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            job = scheduler.next_job()
+            if job is None:
+                return
+            result = fetch_job(job, cache_dir, host_override)
+            mark = "✓" if result["status"] == "fetched" else "✗"
+            detail = f"{result.get('bytes', 0)} bytes" if result["status"] == "fetched" else result["error"]
+            print(f"  {mark} [{job['priority']:.2f}] {job['slug']}: {job['url']} ({detail})")
+            with lock:
+                results.append(result)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(worker) for _ in range(workers)]:
+            future.result()
+    return results
+
+
+def round_log(results: List[Dict[str, Any]], skipped: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Same overall shape as remote-fetch-round-*.json, keyed by import slug."""
+    now = datetime.now(timezone.utc)
+    tools: Dict[str, Any] = {}
+    for item in results + skipped:
+        entry = tools.setdefault(item["importSlug"], {"cacheSlug": item["slug"], "pages": []})
+        page = {key: item[key] for key in ("url", "status", "priority", "fields", "type", "hash")}
+        if "error" in item:
+            page["error"] = item["error"]
+        entry["pages"].append(page)
+    return {
+        "roundId": f"{now:%Y-%m-%d}-scheduled",
+        "generatedAt": now.isoformat(),
+        "counts": {status: sum(1 for item in results + skipped if item["status"] == status)
+                   for status in ("fetched", "failed", "cached")},
+        "tools": tools,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Priority refetch of missing-field source pages")
+    parser.add_argument("--targets", default=str(TARGETS_PATH))
+    parser.add_argument("--missing", default=str(MISSING_PATH))
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR))
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS)
+    parser.add_argument("--domain-interval", type=float, default=DOMAIN_INTERVAL,
+                        help="Minimum seconds between requests to the same host")
+    parser.add_argument("--limit", type=int, help="Only run the N highest-priority jobs")
+    parser.add_argument("--host-override", help="Send every request to this base URL (offline stub server)")
+    parser.add_argument("--force", action="store_true", help="Refetch URLs that are already cached")
+    parser.add_argument("--dry-run", action="store_true", help="Print the queue without fetching")
+    parser.add_argument("--out", help="Write the round log JSON to this path")
+    args = parser.parse_args()
+
+    cache_dir = Path(args.cache_dir)
+    heap, skipped = plan_jobs(_read_json(Path(args.targets)), _read_json(Path(args.missing)), cache_dir, args.force)
+    if args.limit is not None:
+        heap = heapq.nsmallest(args.limit, heap)
+        heapq.heapify(heap)
+
+    print(f"📋 {len(heap)} jobs queued, {len(skipped)} already cached")
+    if args.dry_run:
+        for _, _, job in sorted(heap):
+            hint = f"  ← {', '.join(job['fields'])}" if job["fields"] else ""
+            print(f"  [{job['priority']:.2f}] {job['slug']:<14} {job['url']}{hint}")
+        return
+
+    results = run_round(heap, cache_dir, args.workers, args.domain_interval, args.host_override)
+    log = round_log(results, skipped)
+    print(f"\n✅ Fetched: {log['counts']['fetched']}  Failed: {log['counts']['failed']}  Cached: {log['counts']['cached']}")
+    if args.out:
+        write_text_atomic(Path(args.out), json.dumps(log, indent=2, ensure_ascii=False) + "\n")
+        print(f"📁 Round log written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
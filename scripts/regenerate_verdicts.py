@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Incrementally regenerate stored comparison verdicts.
+
+data/comparisons/verdicts.json keeps every A-vs-B comparison together with a
+fingerprint of exactly the tool fields it read (see ToolFragments.reads). On
+each run only tools whose fingerprint changed are re-rendered, against every
+other tool, so editing one tool costs O(N) comparisons instead of O(N²).
+
+Usage:
+  python scripts/regenerate_verdicts.py              # update stale pairs
+  python scripts/regenerate_verdicts.py --dry-run    # list what would change
+  python scripts/regenerate_verdicts.py --full       # rebuild everything
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from generate_comparison_verdict import TEMPLATE_FINGERPRINT, VerdictEngine, pair_fingerprint, render_comparison_content
+from tool_store import PROJECT_ROOT, ToolStore, dump_json, write_text_atomic
+
+VERDICTS_PATH = PROJECT_ROOT / "data" / "comparisons" / "verdicts.json"
+STORE_VERSION = 1
+
+
+def pair_key(slug_a: str, slug_b: str) -> str:
+    return f"{slug_a}-vs-{slug_b}"
+
+
+def load_previous(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        previous = json.load(f)
+    if previous.get("version") != STORE_VERSION or previous.get("templates") != TEMPLATE_FINGERPRINT:
+        print("⚠️  Stored verdicts were rendered with different templates, rebuilding all pairs")
+        return None
+    return previous
+
+
+def stale_tools(engine: VerdictEngine, slugs: List[str], previous: Optional[Dict[str, Any]]) -> Tuple[Set[str], Set[str]]:
+    """(tools whose fingerprint changed or are new, tools that disappeared)."""
+    known = previous["tools"] if previous else {}
+    changed = {slug for slug in slugs if known.get(slug, {}).get("fingerprint") != engine.fragments(slug).fingerprint}
+    removed = set(known) - set(slugs)
+    return changed, removed
+
+
+def regenerate(tools: List[Dict[str, Any]], previous: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """Return the new verdict store and counts of kept / recomputed / dropped pairs."""
+    engine = VerdictEngine(tools)
+    slugs = [tool["slug"] for tool in tools]
+    changed, removed = stale_tools(engine, slugs, previous)
+
+    pairs: Dict[str, Any] = {}
+    stats = {"kept": 0, "recomputed": 0, "dropped": 0}
+    if previous:
+        for key, entry in previous["pairs"].items():
+            slug_a, slug_b = entry["tools"]
+            if slug_a in changed or slug_b in changed or slug_a in removed or slug_b in removed:
+                stats["dropped"] += slug_a in removed or slug_b in removed
+                continue
+            pairs[key] = entry
+            stats["kept"] += 1
+
+    # Every ordered pair touching a changed tool; PairComparison is shared by both orientations.
+    for slug_a in sorted(changed):
+        for slug_b in slugs:
+            if slug_b == slug_a:
+                continue
+            for first, second in ((slug_a, slug_b), (slug_b, slug_a)):
+                key = pair_key(first, second)
+                if key in pairs:
+                    continue
+                comparison, a_first = engine.pair(first, second)
+                entry: Dict[str, Any] = {
+                    "tools": [first, second],
+                    "fingerprint": pair_fingerprint(engine.fragments(first), engine.fragments(second)),
+                }
+                try:
+                    entry["content"] = render_comparison_content(comparison, a_first)
+                except ValueError as e:
+                    # Stored too, so the pair is not retried until one of its tools changes.
+                    entry["error"] = str(e)
+                pairs[key] = entry
+                stats["recomputed"] += 1
+
+    store = {
+        "version": STORE_VERSION,
+        "templates": TEMPLATE_FINGERPRINT,
+        "tools": {
+            slug: {"fingerprint": engine.fragments(slug).fingerprint, "fields": sorted(engine.fragments(slug).reads)}
+            for slug in slugs
+        },
+        "pairs": dict(sorted(pairs.items())),
+    }
+    return store, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate only the comparison verdicts whose inputs changed")
+    parser.add_argument("--out", default=str(VERDICTS_PATH), help="Verdict store path")
+    parser.add_argument("--full", action="store_true", help="Ignore stored fingerprints and rebuild every pair")
+    parser.add_argument("--dry-run", action="store_true", help="Report stale tools without writing")
+    args = parser.parse_args()
+
+    out_path = Path(args.out)
+    tools = ToolStore().load_tools()
+    previous = None if args.full else load_previous(out_path)
+
+    if args.dry_run:
+        changed, removed = stale_tools(VerdictEngine(tools), [tool["slug"] for tool in tools], previous)
+        print(f"🔍 Stale tools: {', '.join(sorted(changed)) or 'none'}")
+        if removed:
+            print(f"🗑️  Removed tools: {', '.join(sorted(removed))}")
+        print(f"   Pairs to recompute: ≤ {2 * len(changed) * max(len(tools) - 1, 0)}")
+        return
+
+    store, stats = regenerate(tools, previous)
+    errors = sum(1 for entry in store["pairs"].values() if "error" in entry)
+    if stats["recomputed"] or stats["dropped"] or previous is None or previous.get("tools") != store["tools"]:
+        write_text_atomic(out_path, dump_json(store))
+        print(f"✅ Wrote {len(store['pairs'])} comparisons to {out_path}")
+    else:
+        print(f"✓ {out_path.name} already up to date")
+    print(f"   Recomputed: {stats['recomputed']}  Kept: {stats['kept']}  Dropped: {stats['dropped']}  Unrenderable: {errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+One place to turn tool names, file stems, import slugs and domains into catalog slugs.
+
+The registry is built once per process from:
+  - the catalog (each tool's slug and name)
+  - data/non-price-evidence-import/slug-map.json (canonicalByImportSlug, and
+    manualReview.duplicateEvidenceTargets such as elai → elai-io)
+  - DOMAIN_MAP (runwayml.com → runway, ...)
+
+Every alias is stored normalized in a dict, plus a hyphen-free form ("opusclip",
+"veedio"), so resolving is one normalize + one or two lookups. Names that match
+no alias can fall back to difflib fuzzy matching; those results are cached.
+
+Usage:
+  python scripts/slug_registry.py "Opus Clip" runwayml-com elai "Hey Gen"
+  python scripts/slug_registry.py --dump
+"""
+
+import argparse
+from difflib import get_close_matches
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from catalog_cache import load_json
+from tool_store import PROJECT_ROOT, ToolStore
+
+SLUG_MAP_PATH = PROJECT_ROOT / "data" / "non-price-evidence-import" / "slug-map.json"
+FUZZY_CUTOFF = 0.85
+
+# Domain mapping for Clearbit Logo API
+# Maps tool names to their actual domains
+DOMAIN_MAP = {
+    'InVideo': 'invideo.io',
+    'HeyGen': 'heygen.com',
+    'Synthesia': 'synthesia.io',
+    'Descript': 'descript.com',
+    'Opus Clip': 'opusclip.com',
+    'Runway': 'runwayml.com',
+    'Pika': 'pika.art',
+    'Sora': 'openai.com',  # Sora is by OpenAI
+    'Fliki': 'fliki.ai',
+    'Pictory': 'pictory.ai',
+    'Veed.io': 'veed.io',
+    'Colossyan': 'colossyan.com',
+    'Elai.io': 'elai.io',
+    'D-ID': 'd-id.com',
+    'Hour One': 'hourone.ai',
+    'DeepBrain AI': 'deepbrain.ai',
+    'Synthesys': 'synthesys.io',
+    'FlexClip': 'flexclip.com',
+    'Lumen5': 'lumen5.com',
+    'Steve AI': 'steve.ai'
+}
+# Shared hosts would alias a whole company onto one tool.
+SHARED_DOMAINS = {'openai.com'}
+
+
+class _SlugTable(dict):
+    """str.translate table equivalent to the old regex chain: '.' and whitespace → '-',
+    anything outside [a-z0-9-] dropped. Entries are computed on first sight of a character."""
+
+    def __missing__(self, codepoint: int) -> Optional[str]:
+        char = chr(codepoint)
+        if char == "." or char.isspace():
+            value: Optional[str] = "-"
+        elif char == "-" or ("a" <= char <= "z") or ("0" <= char <= "9"):
+            value = char
+        else:
+            value = None
+        self[codepoint] = value
+        return value
+
+
+_SLUG_TABLE = _SlugTable()
+
+
+@lru_cache(maxsize=4096)
+def normalize_slug(name: str) -> str:
+    """Convert tool name to URL-friendly slug."""
+    return "-".join(part for part in name.lower().translate(_SLUG_TABLE).split("-") if part)
+
+
+def _compact(slug: str) -> str:
+    return slug.replace("-", "")
+
+
+class SlugRegistry:
+    """alias → canonical slug tables, built once."""
+
+    def __init__(self, tools: Iterable[Dict[str, Any]], slug_map: Optional[Dict[str, Any]] = None,
+                 domain_map: Optional[Dict[str, str]] = None):
+        self.canonical_slugs: List[str] = []
+        self.names: Dict[str, str] = {}
+        self.aliases: Dict[str, str] = {}
+        self.compact: Dict[str, str] = {}
+        self._fuzzy: Dict[str, Optional[str]] = {}
+        # Weakest first: later (more authoritative) sources overwrite earlier ones.
+        name_to_slug: Dict[str, str] = {}
+        for tool in tools:
+            slug = tool["slug"]
+            self.canonical_slugs.append(slug)
+            self.names[slug] = tool.get("name") or slug
+            name_to_slug[self.names[slug]] = slug
+
+        for name, domain in (domain_map if domain_map is not None else DOMAIN_MAP).items():
+            slug = name_to_slug.get(name) or normalize_slug(name)
+            self.add(name, slug)
+            if domain not in SHARED_DOMAINS:
+                self.add(domain, slug)                      # runwayml.com → runwayml-com
+                self.add(domain.rsplit(".", 1)[0], slug)    # runwayml
+
+        slug_map = slug_map or {}
+        for alias, slug in slug_map.get("canonicalByImportSlug", {}).items():
+            self.add(alias, slug)
+        for slug, variants in slug_map.get("manualReview", {}).get("duplicateEvidenceTargets", {}).items():
+            for variant in variants:
+                self.add(variant, slug)
+
+        for slug, name in self.names.items():
+            self.add(name, slug)
+            self.add(slug, slug)
+
+    def add(self, alias: str, slug: str) -> None:
+        key = normalize_slug(alias)
+        if not key:
+            return
+        self.aliases[key] = slug
+        self.compact[_compact(key)] = slug
+        self._fuzzy.clear()
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Exact alias match (after normalizing), else None."""
+        key = normalize_slug(name)
+        return self.aliases.get(key) or self.compact.get(_compact(key))
+
+    def fuzzy(self, name: str, cutoff: float = FUZZY_CUTOFF) -> Optional[str]:
+        """Closest alias by difflib ratio, for names that match nothing exactly."""
+        key = normalize_slug(name)
+        if key not in self._fuzzy:
+            match = get_close_matches(key, self.aliases, n=1, cutoff=cutoff)
+            self._fuzzy[key] = self.aliases[match[0]] if match else None
+        return self._fuzzy[key]
+
+    def resolve(self, name: str, fuzzy: bool = False) -> str:
+        """Canonical slug for `name`; unknown names come back normalized (and fuzzy-matched if asked)."""
+        slug = self.lookup(name)
+        if slug is None and fuzzy:
+            slug = self.fuzzy(name)
+        return slug or normalize_slug(name)
+
+    def resolve_all(self, names: Iterable[str], fuzzy: bool = False) -> List[str]:
+        return [self.resolve(name, fuzzy) for name in names]
+
+    def is_known(self, slug: str) -> bool:
+        return slug in self.names
+
+
+def load_slug_map() -> Dict[str, Any]:
+    if not SLUG_MAP_PATH.exists():
+        return {}
+    return load_json(SLUG_MAP_PATH)
+
+
+_registry: Optional[SlugRegistry] = None
+
+
+def get_registry(store: Optional[ToolStore] = None) -> SlugRegistry:
+    """The process-wide registry (built on first use)."""
+    global _registry
+    if _registry is None:
+        _registry = SlugRegistry((store or ToolStore()).load_tools(), load_slug_map())
+    return _registry
+
+
+def resolve_slug(name: str, fuzzy: bool = False) -> str:
+    return get_registry().resolve(name, fuzzy)
+
+
+def resolve_slug_list(value: Optional[str], fuzzy: bool = True) -> Optional[List[str]]:
+    """Parse a --slugs style comma-separated argument into canonical slugs."""
+    if not value:
+        return None
+    return get_registry().resolve_all((part.strip() for part in value.split(",") if part.strip()), fuzzy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve tool names and aliases to catalog slugs")
+    parser.add_argument("names", nargs="*")
+    parser.add_argument("--no-fuzzy", action="store_true", help="Only exact alias matches")
+    parser.add_argument("--dump", action="store_true", help="Print the alias table")
+    args = parser.parse_args()
+
+    registry = get_registry()
+    if args.dump:
+        by_slug: Dict[str, List[str]] = {}
+        for alias, slug in sorted(registry.aliases.items()):
+            by_slug.setdefault(slug, []).append(alias)
+        for slug in sorted(by_slug):
+            print(f"  {slug:<14} ← {', '.join(by_slug[slug])}")
+        print(f"📊 {len(registry.aliases)} aliases for {len(registry.canonical_slugs)} tools")
+
+    for name in args.names:
+        exact = registry.lookup(name)
+        slug = exact or (None if args.no_fuzzy else registry.fuzzy(name))
+        how: Tuple[str, str] = ("✓", "exact") if exact else (("~", "fuzzy") if slug else ("✗", "unknown"))
+        print(f"  {how[0]} {name!r} → {slug or normalize_slug(name)} ({how[1]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,10 @@ Logic:
 Goal: Ensure homepage card shows the same price as the detail page "Starter" card
 """
 
-import json
-import os
+import sys
+
+from price_history import record_observations
+from tool_store import ConflictError, ToolStore
 
 def is_paid_plan(price_str):
     """Check if a plan is a paid plan (not Free, Custom, or Contact)."""
@@ -71,15 +73,12 @@ def sync_starting_prices(tools_data):
     return updated_count, skipped_count
 
 def main():
-    # Get the script directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    tools_json_path = os.path.join(project_root, 'src', 'data', 'tools.json')
+    store = ToolStore()
     
-    # Read tools.json
-    print(f"📖 Reading {tools_json_path}...")
-    with open(tools_json_path, 'r', encoding='utf-8') as f:
-        tools_data = json.load(f)
+    # Read tool shards
+    print(f"📖 Reading {store.shard_dir}...")
+    checkout = store.checkout()
+    tools_data = checkout.tools
     
     print(f"Found {len(tools_data)} tools\n")
     print("=" * 60)
@@ -90,11 +89,18 @@ def main():
     # Sync prices
     updated_count, skipped_count = sync_starting_prices(tools_data)
     
-    # Write back to file
+    # Commit only the changed fields (rebased onto concurrent edits), then rebuild tools.json
     print("=" * 60)
-    print(f"📝 Writing updated data to {tools_json_path}...")
-    with open(tools_json_path, 'w', encoding='utf-8') as f:
-        json.dump(tools_data, f, indent=2, ensure_ascii=False)
+    try:
+        result = store.commit(checkout)
+    except ConflictError as e:
+        print(f"❌ {e} (another run changed the same fields, re-run to retry)")
+        sys.exit(1)
+    print(f"📝 Wrote {len(result['written'])} changed shard(s)")
+    if store.assemble():
+        print(f"📝 Assembled {store.monolith_path}")
+    observed = record_observations(tools_data, "sync_starting_price", fields=("starting_price", "pricing_plans"))
+    print(f"📈 Recorded {observed} price observations")
     
     print()
     print("=" * 60)
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Sharded storage for the tools catalog.
+
+Each tool lives in its own file under src/data/tool-shards/<slug>.json, with a
+small index.json recording catalog order and a content hash per shard.
+src/data/tools.json is still produced for the Next.js app and the TS scripts,
+but it is assembled from the shards instead of being rewritten by every script.
+
+Parallel writers use checkout() / commit(): a checkout remembers the hash of
+every shard it read, and commit() applies only the top-level fields the caller
+changed. Under the store lock, a shard that no longer matches its stamp is
+re-read and the patch is rebased onto it; only an edit to a field someone
+else also changed raises ConflictError.
+
+Usage:
+  python scripts/tool_store.py shard      # split tools.json into shards
+  python scripts/tool_store.py assemble   # rebuild tools.json from shards
+  python scripts/tool_store.py status     # show shard / monolith state
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from catalog_cache import cache_key, default_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, commits still detect conflicts
+    fcntl = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MONOLITH_PATH = PROJECT_ROOT / "src" / "data" / "tools.json"
+SHARD_DIR = PROJECT_ROOT / "src" / "data" / "tool-shards"
+HISTORY_DIR = PROJECT_ROOT / "data" / "history"
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+LOCK_FILENAME = ".lock"
+REMOVED_FIELD = "*"
+_MISSING = object()
+
+
+def dump_json(data: Any) -> str:
+    """Serialize the way every tools.json writer in the repo does (2-space indent, trailing newline)."""
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of a serialized document."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write a file via a temp file + rename so readers never see a partial write."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ConflictError(Exception):
+    """A commit changed a field that another writer changed since the checkout.
+    The field is REMOVED_FIELD when the tool's shard was deleted in the meantime."""
+
+    def __init__(self, conflicts: List[Tuple[str, str]]):
+        super().__init__("conflicting edits: " + ", ".join(f"{slug}.{field}" for slug, field in conflicts))
+        self.conflicts = conflicts
+
+
+class Checkout:
+    """Tools loaded for a read-modify-write, with the shard hashes (version stamp) they were read at."""
+
+    __slots__ = ("tools", "base", "stamp")
+
+    def __init__(self):
+        self.tools: List[Dict[str, Any]] = []
+        self.base: Dict[str, Dict[str, Any]] = {}
+        self.stamp: Dict[str, str] = {}
+
+
+def field_patch(base: Dict[str, Any], tool: Dict[str, Any]) -> Dict[str, Any]:
+    """Top-level fields of `tool` that differ from `base` (_MISSING marks a deleted field)."""
+    patch = {key: value for key, value in tool.items() if key not in base or base[key] != value}
+    patch.update({key: _MISSING for key in base if key not in tool})
+    return patch
+
+
+class ToolStore:
+    """Read and write individual tool shards; assemble the monolith on demand."""
+
+    def __init__(self, shard_dir: Path = SHARD_DIR, monolith_path: Path = MONOLITH_PATH, history: bool = True,
+                 cache: bool = True, history_dir: Optional[Path] = None):
+        self.shard_dir = Path(shard_dir)
+        self.monolith_path = Path(monolith_path)
+        self.history = history
+        # Only the repo's own catalog records into data/history; other stores keep history beside their shards.
+        if history_dir is None:
+            history_dir = HISTORY_DIR if self.monolith_path.resolve() == MONOLITH_PATH.resolve() \
+                else self.shard_dir.parent / "history"
+        self.history_dir = Path(history_dir)
+        # Parsed index/catalog survive across invocations in .cache/catalog (see catalog_cache.py).
+        self._cache = default_cache() if cache else None
+        self._cache_prefix = cache_key(self.shard_dir.resolve(), self.monolith_path.resolve())
+        self.index_path = self.shard_dir / INDEX_FILENAME
+        self._index: Optional[Dict[str, Any]] = None
+        self._by_slug: Dict[str, Dict[str, str]] = {}
+        self._lock_depth = 0
+        self._lock_file = None
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    @property
+    def index(self) -> Dict[str, Any]:
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+    def _load_index(self) -> Dict[str, Any]:
+        if not self.index_path.exists():
+            with self.lock():
+                # Re-check under the lock: another process may have bootstrapped meanwhile.
+                if not self.index_path.exists():
+                    # First run: bootstrap shards from the existing monolith.
+                    self._index = {"version": INDEX_VERSION, "monolith_sha256": None, "tools": []}
+                    self._by_slug = {}
+                    if self.monolith_path.exists():
+                        print(f"📦 No shard index yet, bootstrapping from {self.monolith_path.name}")
+                        self.shard_from_monolith()
+                    return self._index
+
+        index = self._read_index()
+        # tools.json is still written directly by some TS scripts; pick those edits up.
+        if self.monolith_path.exists() and self._monolith_hash() != index.get("monolith_sha256"):
+            # Re-sharding writes shards and the index, so it must not race a commit() or assemble().
+            with self.lock():
+                index = self._read_index()
+                if self.monolith_path.exists() and self._monolith_hash() != index.get("monolith_sha256"):
+                    print(f"⚠️  {self.monolith_path.name} changed outside the shard store, re-sharding")
+                    self.shard_from_monolith()
+        return self._index
+
+    def _read_index(self) -> Dict[str, Any]:
+        index = self._cached("index", [self.index_path], lambda: json.loads(self.index_path.read_text(encoding="utf-8")))
+        self._index = index
+        self._by_slug = {entry["slug"]: entry for entry in index["tools"]}
+        return index
+
+    def _monolith_hash(self) -> str:
+        return self._cached("monolith", [self.monolith_path],
+                            lambda: content_hash(self.monolith_path.read_text(encoding="utf-8")))
+
+    def _cached(self, name: str, paths: List[Path], build: Any) -> Any:
+        if self._cache is None:
+            return build()
+        return self._cache.get(f"{name}-{self._cache_prefix}", paths, build)
+
+    def _write_index(self) -> None:
+        write_text_atomic(self.index_path, dump_json(self.index))
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Exclusive store lock across processes (re-entrant within one ToolStore).
+        The index is re-read on entry, so decisions made under the lock see other writers' commits."""
+        if self._lock_depth == 0:
+            self.shard_dir.mkdir(parents=True, exist_ok=True)
+            self._lock_file = open(self.shard_dir / LOCK_FILENAME, "a")
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._index = None
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+                self._lock_file.close()
+                self._lock_file = None
+
+    def _entry(self, slug: str) -> Optional[Dict[str, str]]:
+        if self._index is None:
+            self._index = self._load_index()
+        return self._by_slug.get(slug)
+
+    def shard_path(self, slug: str) -> Path:
+        return self.shard_dir / f"{slug}.json"
+
+    def slugs(self) -> List[str]:
+        """Slugs in catalog order."""
+        return [entry["slug"] for entry in self.index["tools"]]
+
+    def shard_hashes(self) -> Dict[str, str]:
+        """slug → content hash of its shard, straight from the index."""
+        return {entry["slug"]: entry["sha256"] for entry in self.index["tools"]}
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def load_tool(self, slug: str) -> Dict[str, Any]:
+        """Load a single tool without touching any other shard."""
+        if self._entry(slug) is None:
+            raise KeyError(f"Unknown tool slug: {slug}")
+        with open(self.shard_path(slug), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_tools(self, slugs: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Load the given tools (default: the whole catalog) in catalog order."""
+        if slugs is None:
+            wanted = self.slugs()
+            # Keyed on the index and every shard, so an edit to any of them rebuilds the entry.
+            paths = [self.index_path] + [self.shard_path(slug) for slug in wanted]
+            return self._cached("tools", paths, lambda: [self.load_tool(slug) for slug in wanted])
+        return [self.load_tool(slug) for slug in slugs]
+
+    def checkout(self, slugs: Optional[Iterable[str]] = None) -> Checkout:
+        """Load tools for editing. Mutate checkout.tools, then pass the checkout to commit()."""
+        checkout = Checkout()
+        for slug in (self.slugs() if slugs is None else list(slugs)):
+            if self._entry(slug) is None:
+                raise KeyError(f"Unknown tool slug: {slug}")
+            text = self.shard_path(slug).read_text(encoding="utf-8")
+            tool = json.loads(text)
+            checkout.tools.append(tool)
+            checkout.base[slug] = copy.deepcopy(tool)
+            # Stamp what was actually read, not the index: the file is the source of truth.
+            checkout.stamp[slug] = content_hash(text)
+        return checkout
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def save_tool(self, tool: Dict[str, Any]) -> bool:
+        """Write one tool shard if its content changed. Returns True when written."""
+        changed = self._write_shard(tool)
+        if changed:
+            self._write_index()
+        return changed
+
+    def save_tools(self, tools: Iterable[Dict[str, Any]]) -> List[str]:
+        """Write the shards whose content changed. Returns the changed slugs."""
+        changed = [tool["slug"] for tool in tools if self._write_shard(tool)]
+        if changed:
+            self._write_index()
+        return changed
+
+    def commit(self, checkout: Checkout) -> Dict[str, List[str]]:
+        """
+        Compare-and-swap the checkout's edits into the store.
+        Shards still at their stamp are written as-is; moved shards get the field patch rebased onto
+        their current content. Raises ConflictError (writing nothing) if a patched field moved too,
+        or if a checked-out shard was removed.
+        Returns {"written": [...], "rebased": [...]}. The checkout is updated to the committed state.
+        """
+        with self.lock():
+            plan: List[Tuple[Dict[str, Any], Dict[str, Any], str]] = []
+            conflicts: List[Tuple[str, str]] = []
+            rebased: List[str] = []
+            for tool in checkout.tools:
+                slug = tool.get("slug")
+                base = checkout.base.get(slug, {})
+                patch = field_patch(base, tool)
+                if not patch:
+                    continue
+                path = self.shard_path(slug)
+                current_text = path.read_text(encoding="utf-8") if self._entry(slug) is not None and path.exists() else None
+                if (content_hash(current_text) if current_text is not None else None) == checkout.stamp.get(slug):
+                    plan.append((tool, tool, slug))
+                    continue
+
+                if current_text is None:
+                    # Removed since the checkout: rebasing onto nothing would write a partial record.
+                    conflicts.append((slug, REMOVED_FIELD))
+                    continue
+                merged = json.loads(current_text)
+                for key, value in patch.items():
+                    current = merged.get(key, _MISSING)
+                    if current != base.get(key, _MISSING) and current != value:
+                        conflicts.append((slug, key))
+                    elif value is _MISSING:
+                        merged.pop(key, None)
+                    else:
+                        merged[key] = value
+                plan.append((tool, merged, slug))
+                rebased.append(slug)
+
+            if conflicts:
+                raise ConflictError(conflicts)
+
+            written = [slug for _, merged, slug in plan if self._write_shard(merged)]
+            if written:
+                self._write_index()
+            for tool, merged, slug in plan:
+                if merged is not tool:
+                    tool.clear()
+                    tool.update(merged)
+                checkout.base[slug] = copy.deepcopy(tool)
+                checkout.stamp[slug] = self._by_slug[slug]["sha256"]
+            return {"written": written, "rebased": rebased}
+
+    def replace_all(self, tools: List[Dict[str, Any]]) -> List[str]:
+        """Make the catalog exactly `tools` (in that order), dropping shards for removed tools."""
+        keep = {tool["slug"] for tool in tools}
+        removed = [slug for slug in self.slugs() if slug not in keep]
+        for slug in removed:
+            self.shard_path(slug).unlink(missing_ok=True)
+            del self._by_slug[slug]
+
+        changed = [tool["slug"] for tool in tools if self._write_shard(tool)]
+        self.index["tools"] = [self._by_slug[tool["slug"]] for tool in tools]
+        self._write_index()
+        return changed + removed
+
+    def _write_shard(self, tool: Dict[str, Any]) -> bool:
+        slug = tool.get("slug")
+        if not slug:
+            raise ValueError(f"Tool has no slug: {tool.get('name', 'Unknown')}")
+
+        text = dump_json(tool)
+        digest = content_hash(text)
+        entry = self._entry(slug)
+        if entry is not None and entry["sha256"] == digest and self.shard_path(slug).exists():
+            return False
+
+        write_text_atomic(self.shard_path(slug), text)
+        if entry is None:
+            entry = {"slug": slug, "sha256": digest}
+            self.index["tools"].append(entry)
+            self._by_slug[slug] = entry
+        else:
+            entry["sha256"] = digest
+        return True
+
+    # ------------------------------------------------------------------
+    # Monolith <-> shards
+    # ------------------------------------------------------------------
+
+    def assemble(self) -> bool:
+        """
+        Rebuild tools.json from the shards. Returns True when the file changed.
+        Shards are spliced as text (re-indented by two spaces), so no JSON is parsed.
+        """
+        with self.lock():
+            return self._assemble()
+
+    def _assemble(self) -> bool:
+        parts = []
+        for slug in self.slugs():
+            text = self.shard_path(slug).read_text(encoding="utf-8").rstrip("\n")
+            parts.append("  " + text.replace("\n", "\n  "))
+        monolith_text = "[\n" + ",\n".join(parts) + "\n]\n" if parts else "[]\n"
+
+        digest = content_hash(monolith_text)
+        if digest == self.index.get("monolith_sha256") and self.monolith_path.exists():
+            return False
+
+        if self.history:
+            self._record_history(monolith_text)
+        write_text_atomic(self.monolith_path, monolith_text)
+        self.index["monolith_sha256"] = digest
+        self._write_index()
+        return True
+
+    def _record_history(self, monolith_text: str) -> None:
+        """Keep every assembled tools.json as a delta in history_dir (replaces tools.backup.json)."""
+        from history_store import HistoryStore
+
+        history = HistoryStore(self.history_dir)
+        if not history.versions(self.monolith_path) and self.monolith_path.exists():
+            history.record(self.monolith_path, message="baseline before first recorded assemble")
+        history.record(self.monolith_path, json.loads(monolith_text), "assemble")
+
+    def shard_from_monolith(self, monolith_text: Optional[str] = None) -> List[str]:
+        """Split tools.json into shards, rewriting only shards whose content differs."""
+        if monolith_text is None:
+            monolith_text = self.monolith_path.read_text(encoding="utf-8")
+        tools = json.loads(monolith_text)
+        changed = self.replace_all(tools)
+        self.index["monolith_sha256"] = content_hash(monolith_text)
+        self._write_index()
+        return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded tools catalog storage")
+    parser.add_argument("command", choices=["shard", "assemble", "status"])
+    args = parser.parse_args()
+
+    store = ToolStore()
+
+    if args.command == "shard":
+        changed = store.shard_from_monolith()
+        print(f"✅ Sharded {len(store.slugs())} tools into {store.shard_dir.relative_to(PROJECT_ROOT)}")
+        print(f"   Changed shards: {', '.join(changed) if changed else 'none'}")
+    elif args.command == "assemble":
+        if store.assemble():
+            print(f"✅ Assembled {len(store.slugs())} tools into {store.monolith_path.relative_to(PROJECT_ROOT)}")
+        else:
+            print(f"✓ {store.monolith_path.name} already up to date")
+    else:
+        print(f"📁 Shards: {store.shard_dir.relative_to(PROJECT_ROOT)} ({len(store.slugs())} tools)")
+        print(f"📄 Monolith: {store.monolith_path.relative_to(PROJECT_ROOT)}")
+        for slug, digest in store.shard_hashes().items():
+            print(f"   {slug:<16} {digest[:12]}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
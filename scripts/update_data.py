@@ -2,24 +2,22 @@
 """
 Script to generate AI video tool data using AI API.
 Uses OpenAI/DeepSeek API to generate detailed, unique content for each tool.
-Automatically generates logos using Clearbit Logo API.
+Uses optimized local logos from fetch_logos.py when available, otherwise Clearbit Logo API URLs.
 """
 
+import argparse
 import json
-import re
 import os
-from typing import Dict, Any, Optional
-
-# Configure your AI provider here
-# Option 1: OpenAI
-try:
-    from openai import OpenAI
-    USE_OPENAI = True
-except ImportError:
-    USE_OPENAI = False
-
-# Option 2: DeepSeek (if you prefer)
-# Set your API key as environment variable: DEEPSEEK_API_KEY
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from ai_router import ProviderError, Stream, get_router
+from ai_telemetry import failure_reason, format_summary, get_telemetry
+from incremental_json import IncrementalJSONParser, JSONStreamError, parse_json_object
+from slug_registry import DOMAIN_MAP, normalize_slug
+from tool_store import PROJECT_ROOT, ToolStore
+
+# Configure your AI provider here: set OPENAI_API_KEY and/or DEEPSEEK_API_KEY (see ai_router.py)
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -31,100 +29,47 @@ TOOLS_LIST = [
     'DeepBrain AI', 'Synthesys', 'FlexClip', 'Lumen5', 'Steve AI'
 ]
 
-# Domain mapping for Clearbit Logo API
-# Maps tool names to their actual domains
-DOMAIN_MAP = {
-    'InVideo': 'invideo.io',
-    'HeyGen': 'heygen.com',
-    'Synthesia': 'synthesia.io',
-    'Descript': 'descript.com',
-    'Opus Clip': 'opusclip.com',
-    'Runway': 'runwayml.com',
-    'Pika': 'pika.art',
-    'Sora': 'openai.com',  # Sora is by OpenAI
-    'Fliki': 'fliki.ai',
-    'Pictory': 'pictory.ai',
-    'Veed.io': 'veed.io',
-    'Colossyan': 'colossyan.com',
-    'Elai.io': 'elai.io',
-    'D-ID': 'd-id.com',
-    'Hour One': 'hourone.ai',
-    'DeepBrain AI': 'deepbrain.ai',
-    'Synthesys': 'synthesys.io',
-    'FlexClip': 'flexclip.com',
-    'Lumen5': 'lumen5.com',
-    'Steve AI': 'steve.ai'
-}
-
-def normalize_slug(name: str) -> str:
-    """Convert tool name to URL-friendly slug."""
-    slug = name.lower()
-    slug = re.sub(r'[.\s]+', '-', slug)
-    slug = re.sub(r'[^a-z0-9-]', '', slug)
-    slug = re.sub(r'-+', '-', slug)
-    slug = slug.strip('-')
-    return slug
+CLEARBIT_LOGO_BASE = os.getenv("CLEARBIT_LOGO_BASE", "https://logo.clearbit.com")
+
+# Written by scripts/fetch_logos.py; local variants are preferred over Clearbit when present
+OPTIMIZED_LOGO_DIR = PROJECT_ROOT / "public" / "logos" / "optimized"
+OPTIMIZED_LOGO_MANIFEST = "manifest.json"
+OPTIMIZED_LOGO_SIZE = 256
 
 def get_domain(tool_name: str) -> str:
     """Get domain name for a tool, used for Clearbit Logo API."""
     return DOMAIN_MAP.get(tool_name, normalize_slug(tool_name).replace('-', '') + '.com')
 
-def get_clearbit_logo_url(tool_name: str) -> str:
+def get_clearbit_logo_url(tool_name: str, base_url: str = CLEARBIT_LOGO_BASE) -> str:
     """Generate Clearbit Logo API URL for a tool."""
     domain = get_domain(tool_name)
-    return f"https://logo.clearbit.com/{domain}"
+    return f"{base_url.rstrip('/')}/{domain}"
 
-def call_ai_api(prompt: str, model: str = "gpt-4o-mini") -> str:
-    """Call AI API to generate content."""
-    if USE_OPENAI and OPENAI_API_KEY:
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are an expert at reviewing AI video creation tools. Generate detailed, accurate, and unique content for each tool. Always return valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-        )
-        return response.choices[0].message.content
-    elif DEEPSEEK_API_KEY:
-        # DeepSeek API (similar structure)
-        import requests
-        response = requests.post(
-            "https://api.deepseek.com/v1/chat/completions",
-            headers={"Authorization": f"Bearer {DEEPSEEK_API_KEY}"},
-            json={
-                "model": "deepseek-chat",
-                "messages": [
-                    {"role": "system", "content": "You are an expert at reviewing AI video creation tools. Generate detailed, accurate, and unique content for each tool. Always return valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.7,
-            }
-        )
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"]
-    else:
-        raise Exception("No AI API configured. Set OPENAI_API_KEY or DEEPSEEK_API_KEY environment variable.")
+def get_logo_url(tool_name: str) -> str:
+    """Local optimized logo if fetch_logos.py has produced one, otherwise the Clearbit URL."""
+    manifest_path = OPTIMIZED_LOGO_DIR / OPTIMIZED_LOGO_MANIFEST
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            logos = json.load(f).get('logos', {})
+        entry = logos.get(normalize_slug(tool_name))
+        if entry:
+            for variant in entry.get('variants', []):
+                if variant['format'] == 'webp' and variant['file'].endswith(f"-{OPTIMIZED_LOGO_SIZE}.webp"):
+                    return f"/logos/optimized/{variant['file']}"
+    return get_clearbit_logo_url(tool_name)
 
-def generate_tool_data(tool_name: str, tool_id: str) -> Dict[str, Any]:
-    """Generate comprehensive tool data using AI."""
-    slug = normalize_slug(tool_name)
-    logo_url = get_clearbit_logo_url(tool_name)
-    domain = get_domain(tool_name)
-    
-    prompt = f"""Generate a detailed JSON entry for the AI video tool "{tool_name}".
+SYSTEM_PROMPT = "You are an expert at reviewing AI video creation tools. Generate detailed, accurate, and unique content for each tool. Always return valid JSON only."
 
-Return ONLY a valid JSON object with this exact structure (no markdown, no code blocks):
-{{
+# Shared by single-tool and batched prompts, so a batch pays for it once
+TOOL_SCHEMA = """{
   "tagline": "A compelling one-line tagline",
   "short_description": "One sentence description starting with 'Best for...' or similar",
   "best_for": "Specific user type (e.g., 'YouTube Creators', 'Marketing Teams', 'Enterprise & Large Teams')",
-  "pricing": {{
+  "pricing": {
     "free_plan": true/false,
     "starting_price": "number as string (e.g., '29')",
     "currency": "$"
-  }},
+  },
   "has_free_trial": true/false,
   "pricing_model": "Freemium" or "Subscription",
   "starting_price": "$XX/mo format",
@@ -136,69 +81,251 @@ Return ONLY a valid JSON object with this exact structure (no markdown, no code
   "review_content": "2-3 sentence summary",
   "long_review": "<p>First paragraph with <strong>key features</strong>.</p><p>Second paragraph about use cases and benefits.</p>",
   "faqs": [
-    {{"question": "Question 1", "answer": "Answer 1"}},
-    {{"question": "Question 2", "answer": "Answer 2"}}
+    {"question": "Question 1", "answer": "Answer 1"},
+    {"question": "Question 2", "answer": "Answer 2"}
   ]
-}}
+}"""
 
-IMPORTANT:
-- Tags must be from this list: "Avatar", "Text-to-Video", "Editor", "Repurposing", "Cheap", "Professional"
+TOOL_RULES = """- Tags must be from this list: "Avatar", "Text-to-Video", "Editor", "Repurposing", "Cheap", "Professional"
 - Select 1-3 tags that best match the tool's primary features
-- Make the content unique, accurate, and specific to {tool_name}
 - Research real features and pricing if possible
 - long_review should be exactly 2 paragraphs in HTML format
 - rating should be between 4.4 and 4.9"""
 
+# How long a finished stream is read past the closing brace to pick up its token usage
+STREAM_USAGE_WAIT_S = 2.0
+
+# Keys a generated entry must have before it is accepted
+REQUIRED_FIELDS = (
+    "tagline", "short_description", "best_for", "pricing", "has_free_trial", "pricing_model",
+    "starting_price", "rating", "features", "tags", "pros", "cons", "review_content",
+    "long_review", "faqs",
+)
+
+def call_ai_api(prompt: str, model: str = "gpt-4o-mini") -> str:
+    """Call AI API to generate content, hedged across the configured providers (see ai_router.py)."""
+    try:
+        result = get_router().complete(
+            [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            models={"openai": model},
+        )
+    except ProviderError as e:
+        get_telemetry().record_failure(failure_reason(str(e)))
+        raise
+    get_telemetry().record_call(result)
+    return result["text"]
+
+def stream_ai_api(prompt: str, model: str = "gpt-4o-mini") -> Stream:
+    """Start a streamed completion through the router (hedged until the first token). Close it to drop the connection."""
+    return get_router().stream(
+        [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        models={"openai": model},
+    )
+
+def call_ai_api_streaming(prompt: str, model: str = "gpt-4o-mini") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Stream a completion into the incremental JSON parser.
+    Stops reading as soon as the object is complete, and aborts (raising JSONStreamError)
+    as soon as the output can no longer be valid JSON. Returns (data, timing stats);
+    stats["call"] is the router's result for the telemetry.
+    """
+    parser = IncrementalJSONParser()
+    stats: Dict[str, Any] = {"first_token_s": None, "first_field_s": None, "total_s": None, "chars": 0}
+    tokens = stream_ai_api(prompt, model)
+    stats["call"] = tokens.result
+    drain_s = 0.0
     try:
+        for token in tokens:
+            if stats["first_token_s"] is None:
+                stats["first_token_s"] = time.perf_counter() - parser.started_at
+            stats["chars"] += len(token)
+            if parser.feed(token):
+                # The usage chunk follows right after the last token; wait briefly for it.
+                drain_s = STREAM_USAGE_WAIT_S
+                break
+    finally:
+        stats["first_field_s"] = parser.first_field_at
+        stats["total_s"] = time.perf_counter() - parser.started_at
+        tokens.close(drain_s)
+    return parser.close(), stats
+
+def format_stream_stats(stats: Dict[str, Any]) -> str:
+    def seconds(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.2f}s"
+    return (f"first token {seconds(stats['first_token_s'])}, first field {seconds(stats['first_field_s'])}, "
+            f"total {seconds(stats['total_s'])}, {stats['chars']} chars")
+
+def build_tool_prompt(tool_name: str) -> str:
+    """Prompt for a single tool."""
+    return f"""Generate a detailed JSON entry for the AI video tool "{tool_name}".
+
+Return ONLY a valid JSON object with this exact structure (no markdown, no code blocks):
+{TOOL_SCHEMA}
+
+IMPORTANT:
+{TOOL_RULES}
+- Make the content unique, accurate, and specific to {tool_name}"""
+
+def build_batch_prompt(tool_names: List[str]) -> str:
+    """Prompt for several tools at once; the schema and rules are sent a single time."""
+    names = "\n".join(f"- {name}" for name in tool_names)
+    return f"""Generate a detailed JSON entry for each of these AI video tools:
+{names}
+
+Return ONLY a valid JSON object (no markdown, no code blocks) that maps each tool name, spelled exactly as listed, to an entry with this exact structure:
+{TOOL_SCHEMA}
+
+For example: {{"{tool_names[0]}": {{...}}, ...}}
+
+IMPORTANT:
+{TOOL_RULES}
+- Make each entry unique, accurate, and specific to that tool; do not reuse wording between tools"""
+
+def parse_ai_json(ai_response: str) -> Dict[str, Any]:
+    """Extract the JSON object from an AI response (in case the AI adds extra text), in one linear pass."""
+    return parse_json_object(ai_response)
+
+def request_ai_json(prompt: str, stream: bool = False) -> Dict[str, Any]:
+    """Run a prompt and return the decoded JSON object, streaming if requested."""
+    telemetry = get_telemetry()
+    if not stream:
         ai_response = call_ai_api(prompt)
-        # Extract JSON from response (in case AI adds extra text)
-        json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
-        if json_match:
-            ai_data = json.loads(json_match.group())
-        else:
-            raise ValueError("No JSON found in AI response")
+        try:
+            return parse_ai_json(ai_response)
+        except JSONStreamError as e:
+            telemetry.record_parse_failure(e.reason)
+            raise
+    try:
+        data, stats = call_ai_api_streaming(prompt)
+    except JSONStreamError as e:
+        telemetry.record_parse_failure(e.reason)
+        raise
     except Exception as e:
-        print(f"  ⚠️  AI generation failed: {e}")
-        print(f"  → Using fallback template")
-        # Fallback template
-        ai_data = {
-            "tagline": f"AI-powered video creation with {tool_name}",
-            "short_description": f"Best for professional video creation for content creators.",
-            "best_for": "Content Creators & Marketers",
-            "pricing": {"free_plan": True, "starting_price": "20", "currency": "$"},
-            "has_free_trial": True,
-            "pricing_model": "Freemium",
-            "starting_price": "$20/mo",
-            "rating": 4.5,
-            "features": ["AI Video Generation", "Text to Video", "Video Editing", "Auto Captions"],
-            "tags": ["Text-to-Video", "Editor"],
-            "pros": ["Easy to use", "Fast rendering", "Good quality"],
-            "cons": ["Limited free plan", "Learning curve"],
-            "review_content": f"{tool_name} is a powerful AI video creation platform.",
-            "long_review": f"<p><strong>{tool_name}</strong> offers comprehensive video creation capabilities.</p><p>The platform excels at AI-powered content generation.</p>",
-            "faqs": [
-                {"question": f"Is {tool_name} free?", "answer": f"Yes, {tool_name} offers a free plan."},
-                {"question": f"What makes {tool_name} different?", "answer": f"{tool_name} stands out for its ease of use."}
-            ]
-        }
-    
-    # Construct full tool object
-    tool_data = {
+        telemetry.record_failure(failure_reason(str(e)))
+        raise
+    telemetry.record_call(stats["call"])
+    print(f"  ⏱  {format_stream_stats(stats)}")
+    return data
+
+def validate_tool_entry(entry: Any) -> Optional[str]:
+    """Return why a generated entry is unusable, or None if it is fine."""
+    if not isinstance(entry, dict):
+        return "entry is not a JSON object"
+    missing = [field for field in REQUIRED_FIELDS if field not in entry]
+    if missing:
+        return f"missing fields: {', '.join(missing)}"
+    return None
+
+def fallback_tool_data(tool_name: str) -> Dict[str, Any]:
+    """Template content used when AI generation fails."""
+    return {
+        "tagline": f"AI-powered video creation with {tool_name}",
+        "short_description": f"Best for professional video creation for content creators.",
+        "best_for": "Content Creators & Marketers",
+        "pricing": {"free_plan": True, "starting_price": "20", "currency": "$"},
+        "has_free_trial": True,
+        "pricing_model": "Freemium",
+        "starting_price": "$20/mo",
+        "rating": 4.5,
+        "features": ["AI Video Generation", "Text to Video", "Video Editing", "Auto Captions"],
+        "tags": ["Text-to-Video", "Editor"],
+        "pros": ["Easy to use", "Fast rendering", "Good quality"],
+        "cons": ["Limited free plan", "Learning curve"],
+        "review_content": f"{tool_name} is a powerful AI video creation platform.",
+        "long_review": f"<p><strong>{tool_name}</strong> offers comprehensive video creation capabilities.</p><p>The platform excels at AI-powered content generation.</p>",
+        "faqs": [
+            {"question": f"Is {tool_name} free?", "answer": f"Yes, {tool_name} offers a free plan."},
+            {"question": f"What makes {tool_name} different?", "answer": f"{tool_name} stands out for its ease of use."}
+        ]
+    }
+
+def build_tool_record(tool_name: str, tool_id: str, ai_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Construct the full tool object around the generated content."""
+    return {
         "id": tool_id,
-        "slug": slug,
+        "slug": normalize_slug(tool_name),
         "name": tool_name,
-        "logo_url": logo_url,  # Use Clearbit Logo API
-        "affiliate_link": f"https://{domain}?ref=demo",
+        "logo_url": get_logo_url(tool_name),  # Local optimized logo, or Clearbit Logo API
+        "affiliate_link": f"https://{get_domain(tool_name)}?ref=demo",
         **ai_data
     }
+
+def generate_tool_data(tool_name: str, tool_id: str, stream: bool = False) -> Dict[str, Any]:
+    """Generate comprehensive tool data using AI."""
+    try:
+        ai_data = request_ai_json(build_tool_prompt(tool_name), stream=stream)
+    except Exception as e:
+        print(f"  ⚠️  AI generation failed: {e}")
+        print(f"  → Using fallback template")
+        get_telemetry().record_fallback()
+        ai_data = fallback_tool_data(tool_name)
     
-    return tool_data
+    return build_tool_record(tool_name, tool_id, ai_data)
+
+def generate_tools_batch(tool_names: List[str], tool_ids: List[str], stream: bool = False) -> List[Dict[str, Any]]:
+    """
+    Generate several tools with one request and split the response per tool.
+    Tools whose entry is missing or malformed are retried with a single-tool call.
+    """
+    entries: Dict[str, Any] = {}
+    decoded = False
+    try:
+        entries = request_ai_json(build_batch_prompt(tool_names), stream=stream)
+        decoded = isinstance(entries, dict)
+    except Exception as e:
+        # Already counted as a request or parse failure; the missing entries below are not parse failures
+        print(f"  ⚠️  Batch generation failed: {e}")
+    if not decoded:
+        entries = {}
+    
+    # Match names case-insensitively; models sometimes normalise capitalisation
+    by_lower = {str(name).lower(): entry for name, entry in entries.items()}
+    
+    results = []
+    for tool_name, tool_id in zip(tool_names, tool_ids):
+        entry = entries.get(tool_name, by_lower.get(tool_name.lower()))
+        if entry is None:
+            problem = "missing from batch response" if decoded else "no batch response"
+            reason = "missing_entry"
+        else:
+            problem = validate_tool_entry(entry)
+            reason = problem.split(':')[0] if problem else None
+        if problem is None:
+            print(f"  ✓ {tool_name}: taken from batch response")
+            results.append(build_tool_record(tool_name, tool_id, entry))
+        else:
+            print(f"  ⚠️  {tool_name}: {problem} → single-tool fallback")
+            if decoded:
+                get_telemetry().record_parse_failure(reason)
+            get_telemetry().record_retry("single_tool")
+            results.append(generate_tool_data(tool_name, tool_id, stream=stream))
+    return results
 
 def main():
     """Main function to generate and save tool data."""
+    parser = argparse.ArgumentParser(description="Generate tool data with an AI API")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Tools per AI request (default 1 = one request per tool)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream completions and abort as soon as the output can't be valid JSON")
+    parser.add_argument("--telemetry-out", help="JSON telemetry report path (default _audit/ai-telemetry/<start>.json)")
+    parser.add_argument("--prometheus-out", help="Also write the telemetry in Prometheus text format")
+    args = parser.parse_args()
+    batch_size = max(1, args.batch_size)
+    
     print("🚀 Starting AI-powered tool data generation...")
     print(f"📋 Generating data for {len(TOOLS_LIST)} tools")
-    print("🎨 Using Clearbit Logo API for automatic logos\n")
+    if batch_size > 1:
+        print(f"📦 Batching {batch_size} tools per request")
+    print("🎨 Using local optimized logos (fetch_logos.py) with Clearbit Logo API fallback\n")
     
     if not OPENAI_API_KEY and not DEEPSEEK_API_KEY:
         print("⚠️  WARNING: No API key found!")
@@ -208,32 +335,38 @@ def main():
     
     tools_data = []
     
-    for idx, tool_name in enumerate(TOOLS_LIST, start=1):
-        print(f"[{idx}/{len(TOOLS_LIST)}] Processing {tool_name}...")
-        slug = normalize_slug(tool_name)
-        logo_url = get_clearbit_logo_url(tool_name)
-        print(f"  → Slug: {slug}")
-        print(f"  → Logo: {logo_url}")
+    for start in range(0, len(TOOLS_LIST), batch_size):
+        batch = TOOLS_LIST[start:start + batch_size]
+        ids = [str(idx) for idx in range(start + 1, start + 1 + len(batch))]
+        print(f"[{ids[0]}-{ids[-1]}/{len(TOOLS_LIST)}] Processing {', '.join(batch)}...")
+        for tool_name in batch:
+            print(f"  → {tool_name}: slug {normalize_slug(tool_name)}, logo {get_logo_url(tool_name)}")
         
         try:
-            tool_data = generate_tool_data(tool_name, str(idx))
-            tools_data.append(tool_data)
-            print(f"  ✓ Generated data for {tool_name}\n")
+            if len(batch) == 1:
+                generated = [generate_tool_data(batch[0], ids[0], stream=args.stream)]
+            else:
+                generated = generate_tools_batch(batch, ids, stream=args.stream)
+            tools_data.extend(generated)
+            print(f"  ✓ Generated data for {', '.join(batch)}\n")
         except Exception as e:
             print(f"  ✗ Error: {e}\n")
             continue
     
-    # Write to file
-    output_path = "src/data/tools.json"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(tools_data, f, indent=2, ensure_ascii=False)
+    # Write one shard per tool, then rebuild tools.json
+    store = ToolStore()
+    changed_slugs = store.replace_all(tools_data)
+    store.assemble()
     
     print(f"✅ Successfully generated {len(tools_data)} tools")
-    print(f"📁 Saved to: {output_path}")
-    print(f"\n🎨 All logos are automatically generated via Clearbit Logo API")
-    print(f"   No manual image downloads needed!")
+    print(f"📁 Saved {len(changed_slugs)} changed shard(s) to: {store.shard_dir}")
+    print(f"📁 Assembled: {store.monolith_path}")
+    telemetry = get_telemetry()
+    report_path = telemetry.write(args.telemetry_out, args.prometheus_out)
+    print(f"📊 AI telemetry: {format_summary(telemetry.report())}")
+    print(f"📁 Telemetry report: {report_path}")
+    print(f"\n🎨 Logos without a local optimized copy point at Clearbit Logo API")
+    print(f"   Run scripts/fetch_logos.py to fetch and optimize them locally")
 
 if __name__ == "__main__":
     main()
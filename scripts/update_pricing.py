@@ -4,9 +4,10 @@ Update pricing information for all tools in tools.json
 Adds detailed pricing structure with tiers
 """
 
-import json
 import sys
-from pathlib import Path
+
+from price_history import record_observations
+from tool_store import ConflictError, ToolStore
 
 # Define pricing data for all 20 tools
 PRICING_DATA = {
@@ -511,14 +512,12 @@ PRICING_DATA = {
 }
 
 def update_pricing():
-    """Update pricing information in tools.json"""
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    tools_file = project_root / "src" / "data" / "tools.json"
+    """Update pricing information in the tool shards and tools.json"""
+    store = ToolStore()
     
-    # Read current tools.json
-    with open(tools_file, 'r', encoding='utf-8') as f:
-        tools = json.load(f)
+    # Read current tool shards
+    checkout = store.checkout()
+    tools = checkout.tools
     
     # Update pricing for each tool
     updated_count = 0
@@ -532,11 +531,17 @@ def update_pricing():
         else:
             print(f"⚠ No pricing data found for {slug}")
     
-    # Write updated tools.json
-    with open(tools_file, 'w', encoding='utf-8') as f:
-        json.dump(tools, f, indent=2, ensure_ascii=False)
+    # Commit changed fields (rebased onto concurrent edits), then rebuild tools.json
+    try:
+        result = store.commit(checkout)
+    except ConflictError as e:
+        print(f"❌ {e} (another run changed the same fields, re-run to retry)", file=sys.stderr)
+        sys.exit(1)
+    store.assemble()
+    observed = record_observations([t for t in tools if t.get('slug') in PRICING_DATA], "update_pricing", fields=("pricing",))
     
-    print(f"\n✅ Successfully updated pricing for {updated_count} tools")
+    print(f"\n✅ Successfully updated pricing for {updated_count} tools ({len(result['written'])} shard(s) changed)")
+    print(f"📈 Recorded {observed} price observations")
     return updated_count
 
 if __name__ == "__main__":
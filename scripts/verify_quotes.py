@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Verify evidence quotes against the cached source pages.
+
+Every data/evidence/<slug>.json hardFacts[].sources[] entry pairs a url with a
+verbatim quote. Quotes are grouped by page (the scrape cache names pages
+`<type>-<sha256(url)[:12]>.*`, see scripts/cache.ts) and each page is checked
+once: its text is normalized to a word sequence and scanned a single time by an
+Aho-Corasick automaton holding all of that page's quotes. Pages are checked in
+a process pool.
+
+Quote status:
+  found     the normalized quote appears verbatim
+  drifted   not verbatim, but most of its 5-word windows are on the page
+  missing   not on the page
+  no_cache  the page was never cached
+
+Usage:
+  python scripts/verify_quotes.py
+  python scripts/verify_quotes.py --strict --out _audit/quotes/report.json
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from extract_cache_text import html_to_text
+from slug_registry import resolve_slug
+from tool_store import PROJECT_ROOT
+
+EVIDENCE_DIR = PROJECT_ROOT / "data" / "evidence"
+CACHE_DIR = PROJECT_ROOT / "scripts" / "cache"
+
+DRIFT_WINDOW = 5
+DRIFT_MIN_COVERAGE = 0.5
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+# Curly quotes, dashes and the like only matter as word separators, so they simply drop out.
+
+
+def url_hash(url: str) -> str:
+    """Same 12-char key as hashUrl() in scripts/cache.ts."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+
+
+def normalize_words(text: str) -> List[str]:
+    return WORD_RE.findall(html.unescape(text).lower())
+
+
+# ----------------------------------------------------------------------
+# Aho-Corasick over word sequences
+# ----------------------------------------------------------------------
+
+class AhoCorasick:
+    """Multi-pattern matcher; patterns and text are sequences of words."""
+
+    def __init__(self, patterns: Sequence[Sequence[str]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for word in pattern:
+                nxt = self.goto[state].get(word)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][word] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = nxt
+            self.output[state].append(pattern_id)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(word, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def matches(self, words: Sequence[str]) -> set:
+        """Ids of every pattern that occurs in `words`, in one pass."""
+        found = set()
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for word in words:
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+# ----------------------------------------------------------------------
+# Pages
+# ----------------------------------------------------------------------
+
+def build_page_index(cache_dir: Path) -> Dict[str, List[Path]]:
+    """url hash → cached files for that page (any tool directory)."""
+    index: Dict[str, List[Path]] = {}
+    for path in cache_dir.glob("*/*"):
+        match = re.match(r"^.+-([a-f0-9]{12})\.(html|txt|snapshot\.json)$", path.name)
+        if match:
+            index.setdefault(match.group(1), []).append(path)
+    return index
+
+
+def page_text(files: List[Path]) -> Optional[str]:
+    """All text we have for a cached page: .txt, snapshot text and the stripped HTML."""
+    texts = []
+    for path in sorted(files):
+        if path.name.endswith(".snapshot.json"):
+            with open(path, "r", encoding="utf-8") as f:
+                texts.append(json.load(f).get("text") or "")
+        elif path.suffix == ".txt":
+            texts.append(path.read_text(encoding="utf-8", errors="replace"))
+        elif path.suffix == ".html":
+            # Snapshot/.txt extractions are often truncated; the raw HTML has the full page.
+            texts.append(html_to_text(path.read_text(encoding="utf-8", errors="replace")))
+    return "\n".join(texts) if texts else None
+
+
+def verify_page(files: List[str], quotes: List[str]) -> List[Tuple[str, Optional[float]]]:
+    """(status, drift coverage) per quote for one page. Runs in a worker process."""
+    text = page_text([Path(p) for p in files])
+    if text is None:
+        return [("no_cache", None)] * len(quotes)
+    words = normalize_words(text)
+    patterns = [normalize_words(quote) for quote in quotes]
+    found = AhoCorasick([p for p in patterns if p]).matches(words) if any(patterns) else set()
+
+    # Map matcher ids back to quote positions (empty patterns were skipped).
+    ids = [i for i, p in enumerate(patterns) if p]
+    matched = {ids[pattern_id] for pattern_id in found}
+
+    results: List[Tuple[str, Optional[float]]] = []
+    page_windows = None
+    for i, pattern in enumerate(patterns):
+        if i in matched:
+            results.append(("found", 1.0))
+            continue
+        if page_windows is None:
+            page_windows = {tuple(words[j:j + DRIFT_WINDOW]) for j in range(len(words) - DRIFT_WINDOW + 1)}
+        windows = [tuple(pattern[j:j + DRIFT_WINDOW]) for j in range(len(pattern) - DRIFT_WINDOW + 1)]
+        coverage = sum(w in page_windows for w in windows) / len(windows) if windows else 0.0
+        results.append(("drifted" if coverage >= DRIFT_MIN_COVERAGE else "missing", round(coverage, 3)))
+    return results
+
+
+# ----------------------------------------------------------------------
+# Driver
+# ----------------------------------------------------------------------
+
+def collect_quotes(evidence_dir: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """url → quote records across every evidence file."""
+    by_url: Dict[str, List[Dict[str, Any]]] = {}
+    for path in sorted(evidence_dir.glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            evidence = json.load(f)
+        slug = resolve_slug(evidence.get("slug") or evidence.get("tool") or path.stem)
+        for fact_index, fact in enumerate(evidence.get("hardFacts") or []):
+            for source_index, source in enumerate(fact.get("sources") or []):
+                if source.get("url") and source.get("quote"):
+                    by_url.setdefault(source["url"], []).append({
+                        "slug": slug,
+                        "field": fact.get("field"),
+                        "location": f"{path.name}#hardFacts[{fact_index}].sources[{source_index}]",
+                        "quote": source["quote"],
+                    })
+    return by_url
+
+
+def verify_all(evidence_dir: Path = EVIDENCE_DIR, cache_dir: Path = CACHE_DIR,
+               workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    by_url = collect_quotes(evidence_dir)
+    pages = build_page_index(cache_dir)
+    results: List[Dict[str, Any]] = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for url, records in by_url.items():
+            files = pages.get(url_hash(url))
+            if not files:
+                results.extend({**r, "url": url, "status": "no_cache", "coverage": None} for r in records)
+                continue
+            future = pool.submit(verify_page, [str(p) for p in files], [r["quote"] for r in records])
+            futures[future] = (url, records)
+        for future, (url, records) in futures.items():
+            for record, (status, coverage) in zip(records, future.result()):
+                results.append({**record, "url": url, "status": status, "coverage": coverage})
+
+    results.sort(key=lambda r: r["location"])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check evidence quotes against cached source pages")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--out", help="Write the full JSON report to this path")
+    parser.add_argument("--strict", action="store_true", help="Exit non-zero on missing or drifted quotes")
+    args = parser.parse_args()
+
+    results = verify_all(workers=args.workers)
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    print(f"🔍 Checked {len(results)} quotes on {len({r['url'] for r in results})} pages")
+    for result in results:
+        if result["status"] in ("missing", "drifted"):
+            coverage = f" ({result['coverage']:.0%} of windows)" if result["coverage"] else ""
+            print(f"  ✗ {result['status']}{coverage}: {result['location']}")
+            print(f"     {result['url']}")
+            print(f"     \"{result['quote'][:140]}\"")
+    print(f"\n📊 {', '.join(f'{k}: {v}' for k, v in sorted(counts.items()))}")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps({"counts": counts, "quotes": results}, indent=2, ensure_ascii=False) + "\n",
+                            encoding="utf-8")
+        print(f"📁 Report written to {out_path}")
+
+    if args.strict and (counts.get("missing") or counts.get("drifted")):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()